@@ -1,3 +1,5 @@
+from typing import Optional
+
 from mercury_ocip.client import BaseClient
 from mercury_ocip.automate.alias_finder import AliasFinder, AliasRequest, AliasResult
 from mercury_ocip.automate.group_auditor import (
@@ -38,6 +40,8 @@ class AutomationTasks:
         )
         return self._group_auditor.execute(request=request)
 
-    def user_digest(self, user_id: str) -> AutomationResult[UserDigestResult]:
+    def user_digest(
+        self, user_id: str, budget: Optional[float] = None
+    ) -> AutomationResult[UserDigestResult]:
         request = UserDigestRequest(user_id=user_id)
-        return self._user_digest.execute(request=request)
+        return self._user_digest.execute(request=request, budget=budget)
@@ -7,6 +7,7 @@ from mercury_ocip.utils.shared_operations import SharedOperations
 from mercury_ocip.libs.types import OCIResponse
 from mercury_ocip.commands.base_command import OCICommand, ErrorResponse
 from mercury_ocip.exceptions import MErrorUnknown, MErrorResponse, MError
+from mercury_ocip.timeouts import deadline
 
 RequestT = TypeVar("RequestT")
 PayloadT = TypeVar("PayloadT")
@@ -31,9 +32,17 @@ class BaseAutomation(ABC, Generic[RequestT, PayloadT]):
         self.client = client
         self.shared_ops = SharedOperations(client)
 
-    def execute(self, request: RequestT) -> AutomationResult[PayloadT]:
+    def execute(
+        self, request: RequestT, budget: Optional[float] = None
+    ) -> AutomationResult[PayloadT]:
+        """Run the automation, within ``budget`` seconds overall when given.
+
+        Every command it sends has its timeout cut to the budget left, once the
+        budget is spent the next command raises MErrorDeadlineExceeded.
+        """
         self._validate(request)
-        raw = self._run(request)
+        with deadline(budget):
+            raw = self._run(request)
         return self._wrap(raw)
 
     def _validate(self, request: RequestT) -> None:
@@ -34,5 +34,6 @@ class AutoAttendantBulkOperations(BaseBulkOperations):
                     "is_active": True,
                 },
                 "integer_fields": ["first_digit_timeout_seconds"],
+                "checks": ["new_id", "free_dn", "free_extension"],
             },
         }
@@ -1,19 +1,60 @@
+import asyncio
+import os
+import time
 from abc import ABC
-from typing import List, Dict, Any, cast
-import re
+from typing import (
+    List,
+    Dict,
+    Any,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Protocol,
+    Sized,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
 
+from mercury_ocip.bulk.engine import entity_key, run_ordered
+from mercury_ocip.bulk.journal import BulkJournal, row_digest
+from mercury_ocip.bulk.preflight import Preflight
+from mercury_ocip.bulk.progress import ProgressCallback, ProgressTracker
+from mercury_ocip.bulk.retry import RetryPolicy
+from mercury_ocip.bulk.row_plan import RowPlan, clean_arrays, parse_key_path, set_path
+from mercury_ocip.bulk.streaming import BulkSummary, ResultSink
+from mercury_ocip.bulk.upsert import UpsertState
 from mercury_ocip.client import BaseClient
 from mercury_ocip.commands.base_command import OCICommand, ErrorResponse
 from mercury_ocip.utils.file_handler import FileHandler
-from mercury_ocip.utils.defines import (
-    to_snake_case,
-    is_boolean,
-    str_to_bool,
-    is_none,
-    normalise_phone_number,
-)
+from mercury_ocip.lanes import Lane
 from mercury_ocip.libs.types import OCIResponse
+from mercury_ocip.pool import BasePool, SessionPool
+
+# Compiled headers kept per operations object
+MAX_ROW_PLANS = 64
+
+ReadKey = TypeVar("ReadKey")
+
+
+class PrefetchedReads(Protocol[ReadKey]):
+    """Reads made before a run, UpsertState or Preflight"""
+
+    def requests(
+        self, rows: Iterable[Mapping[str, Any]]
+    ) -> List[Tuple[ReadKey, OCICommand]]: ...
+
+    def load(self, key: ReadKey, response: Any) -> None: ...
+
+
+Reads = TypeVar("Reads", bound=PrefetchedReads[Any])
+
+# Responses of rows that were not sent
+SKIPPED_COMPLETED = "Completed in an earlier run"
+SKIPPED_UNCHANGED = "Already up to date"
 
 
 class BaseBulkOperations(ABC):
@@ -30,9 +71,19 @@ class BaseBulkOperations(ABC):
 
     def __init__(self, client: BaseClient) -> None:
         self.client = client
+        self._row_plans: Dict[tuple[str, ...], RowPlan] = {}
 
     def execute_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        pool: Optional[BasePool] = None,
+        journal: Optional[Union[str, os.PathLike]] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
         """Create users from CSV file
 
@@ -41,72 +92,668 @@ class BaseBulkOperations(ABC):
         Args:
             csv_path (str): Path to the CSV file
             dry_run (bool, optional): If True, the operation will not be executed. Defaults to False.
+            concurrency (int, optional): Rows sent at once. Defaults to 1, one after another.
+            pool (BasePool, optional): Pool to send rows through instead of the client.
+            journal (str | PathLike, optional): Journal file recording each finished row.
+                Rows it shows already succeeded are skipped, see `BulkJournal`.
+            upsert (bool, optional): Fetch the current state first, send only changed
+                fields and turn creates of existing entities into modifies, see `UpsertState`.
+            preflight (bool, optional): Check rows against the sheet and the target groups
+                first, failing conflicting rows without sending them, see `Preflight`.
+            retry (RetryPolicy, optional): Send rows that failed for a passing reason,
+                such as a timeout, again after a backoff, see `RetryPolicy`.
+            progress (Callable[[BulkProgress], None], optional): Called about once a second
+                with counts, throughput, latency and ETA, e.g. a TerminalProgress.
 
         Returns:
             List[Dict[str, Any]]: List of bwks entities created.
         """
         data: list[dict[str, Any]] = FileHandler.read_csv_to_dict(csv_path)
         parsed_data: list[Dict[str, Any]] = self._parse_csv(data)
-        return self.execute_from_data(parsed_data, dry_run)
+        return self.execute_from_data(
+            parsed_data,
+            dry_run,
+            concurrency,
+            pool,
+            journal,
+            upsert,
+            preflight,
+            retry,
+            progress,
+        )
 
     def execute_from_data(
-        self, data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        pool: Optional[BasePool] = None,
+        journal: Optional[Union[str, os.PathLike]] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
         """Create users from data
 
         This method is used directly in the package via IDE or CLI.
 
+        With ``concurrency`` above 1, or a ``pool``, rows are sent concurrently
+        over a SessionPool opened with the client's settings, see
+        `execute_from_data_async`. Results are still in input order.
+
         Args:
             data (List[Dict[str, Any]]): List of users to create
             dry_run (bool, optional): If True, the operation will not be executed. Defaults to False.
+            concurrency (int, optional): Rows sent at once. Defaults to 1, one after another.
+            pool (BasePool, optional): Pool to send rows through instead of the client.
+            journal (str | PathLike, optional): Journal file recording each finished row.
+                Rows it shows already succeeded are skipped, see `BulkJournal`.
+            upsert (bool, optional): Fetch the current state first, send only changed
+                fields and turn creates of existing entities into modifies, see `UpsertState`.
+            preflight (bool, optional): Check rows against the sheet and the target groups
+                first, failing conflicting rows without sending them, see `Preflight`.
+            retry (RetryPolicy, optional): Send rows that failed for a passing reason,
+                such as a timeout, again after a backoff, see `RetryPolicy`.
+            progress (Callable[[BulkProgress], None], optional): Called about once a second
+                with counts, throughput, latency and ETA, e.g. a TerminalProgress.
 
         Returns:
             List[Dict[str, Any]]: List of bwks entities created.
         """
+        if not dry_run and (concurrency > 1 or pool is not None):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(
+                    self.execute_from_data_async(
+                        data,
+                        dry_run,
+                        concurrency,
+                        pool,
+                        journal,
+                        upsert,
+                        preflight,
+                        retry,
+                        progress,
+                    )
+                )
+            raise RuntimeError(
+                "execute_from_data cannot run concurrently inside an event loop, "
+                "await execute_from_data_async instead"
+            )
+
         results: list[dict[str, Any]] = []
+        self.stream_from_data(
+            data,
+            results.append,
+            dry_run,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
+        return results
+
+    async def execute_from_data_async(
+        self,
+        data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 8,
+        pool: Optional[BasePool] = None,
+        journal: Optional[Union[str, os.PathLike]] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> List[Dict[str, Any]]:
+        """Create entities from data, sending up to ``concurrency`` rows at once
+
+        Rows go through ``pool`` in its bulk lane, or a SessionPool of
+        ``concurrency`` sessions opened with the client's settings and closed
+        afterwards. Rows for the same user, service instance, device or group run
+        in input order, so a create is always sent before a modify of the same
+        entity. Results are in input order and match `execute_from_data`.
 
-        for i, row in enumerate(data):
+        Args:
+            data (List[Dict[str, Any]]): List of entities to create
+            dry_run (bool, optional): If True, the operation will not be executed. Defaults to False.
+            concurrency (int, optional): Rows sent at once. Defaults to 8.
+            pool (BasePool, optional): Pool to send rows through.
+            journal (str | PathLike, optional): Journal file recording each finished row.
+                Rows it shows already succeeded are skipped, see `BulkJournal`.
+            upsert (bool, optional): Fetch the current state first, send only changed
+                fields and turn creates of existing entities into modifies, see `UpsertState`.
+            preflight (bool, optional): Check rows against the sheet and the target groups
+                first, failing conflicting rows without sending them, see `Preflight`.
+            retry (RetryPolicy, optional): Send rows that failed for a passing reason,
+                such as a timeout, again after a backoff, see `RetryPolicy`.
+            progress (Callable[[BulkProgress], None], optional): Called about once a second
+                with counts, throughput, latency and ETA, e.g. a TerminalProgress.
+
+        Returns:
+            List[Dict[str, Any]]: List of bwks entities created.
+        """
+        if dry_run:
+            return self.execute_from_data(
+                data, dry_run=True, upsert=upsert, preflight=preflight
+            )
+
+        results: list[dict[str, Any]] = []
+        await self.stream_from_data_async(
+            data,
+            results.append,
+            concurrency=concurrency,
+            pool=pool,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
+        results.sort(key=lambda result: result["index"])
+        return results
+
+    def validate_from_csv(
+        self, csv_path: str, upsert: bool = False
+    ) -> Dict[int, List[str]]:
+        """Run the pre-flight checks on a CSV file without sending any writes
+
+        Args:
+            csv_path (str): Path to the CSV file
+            upsert (bool, optional): Check as an upsert run would, existing IDs are fine.
+
+        Returns:
+            Dict[int, List[str]]: Problems by row index, rows without any are left out.
+        """
+        data = self._parse_csv(FileHandler.read_csv_to_dict(csv_path))
+        return self.validate_from_data(data, upsert)
+
+    def validate_from_data(
+        self, data: List[Dict[str, Any]], upsert: bool = False
+    ) -> Dict[int, List[str]]:
+        """Run the pre-flight checks on rows without sending any writes
+
+        Reads each target group's users, DNs and devices once and checks every
+        row against them and the rest of the sheet, see `Preflight`.
+
+        Args:
+            data (List[Dict[str, Any]]): Rows of entities to create
+            upsert (bool, optional): Check as an upsert run would, existing IDs are fine.
+
+        Returns:
+            Dict[int, List[str]]: Problems by row index, rows without any are left out.
+        """
+        return self._prefetch(self._preflight(upsert), data).check(data)
+
+    def stream_from_csv(
+        self,
+        csv_path: str,
+        sink: ResultSink,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        pool: Optional[BasePool] = None,
+        journal: Optional[Union[str, os.PathLike]] = None,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> BulkSummary:
+        """Run a CSV file of any size without holding it in memory
+
+        Rows are read one at a time, sent, and handed to ``sink`` as soon as they
+        finish, so memory stays flat however long the sheet is. Nothing is
+        returned but the counts, keep what you need in the sink.
+
+        Args:
+            csv_path (str): Path to the CSV file
+            sink (Callable[[Dict[str, Any]], None]): Called with each result, e.g. a JsonLinesSink.
+            dry_run (bool, optional): If True, the operation will not be executed. Defaults to False.
+            concurrency (int, optional): Rows sent at once. Defaults to 1, one after another.
+            pool (BasePool, optional): Pool to send rows through instead of the client.
+            journal (str | PathLike, optional): Journal file recording each finished row.
+                Rows it shows already succeeded are skipped, see `BulkJournal`.
+            retry (RetryPolicy, optional): Send rows that failed for a passing reason,
+                such as a timeout, again after a backoff, see `RetryPolicy`.
+            progress (Callable[[BulkProgress], None], optional): Called about once a second
+                with counts, throughput, latency and ETA, e.g. a TerminalProgress.
+
+        Returns:
+            BulkSummary: How many rows ran, succeeded and failed.
+        """
+        rows = map(self._process_row, FileHandler.iter_csv_rows(csv_path))
+        total = FileHandler.count_csv_rows(csv_path) if progress is not None else None
+        return self.stream_from_data(
+            rows,
+            sink,
+            dry_run,
+            concurrency,
+            pool,
+            journal,
+            retry=retry,
+            progress=progress,
+            total=total,
+        )
+
+    def stream_from_data(
+        self,
+        data: Iterable[Dict[str, Any]],
+        sink: ResultSink,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        pool: Optional[BasePool] = None,
+        journal: Optional[Union[str, os.PathLike]] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
+        total: Optional[int] = None,
+    ) -> BulkSummary:
+        """Run rows from any iterable, handing each result to ``sink``
+
+        ``data`` is read lazily, a generator is never read further ahead than the
+        rows in flight. Results reach the sink in input order when rows run one
+        after another, and in the order they finish otherwise.
+
+        Args:
+            data (Iterable[Dict[str, Any]]): Rows of entities to create
+            sink (Callable[[Dict[str, Any]], None]): Called with each result.
+            dry_run (bool, optional): If True, the operation will not be executed. Defaults to False.
+            concurrency (int, optional): Rows sent at once. Defaults to 1, one after another.
+            pool (BasePool, optional): Pool to send rows through instead of the client.
+            journal (str | PathLike, optional): Journal file recording each finished row.
+                Rows it shows already succeeded are skipped, see `BulkJournal`.
+            upsert (bool, optional): Fetch the current state first, send only changed
+                fields and turn creates of existing entities into modifies, see `UpsertState`.
+            preflight (bool, optional): Check rows against the sheet and the target groups
+                first, failing conflicting rows without sending them, see `Preflight`.
+            retry (RetryPolicy, optional): Send rows that failed for a passing reason,
+                such as a timeout, again after a backoff, see `RetryPolicy`.
+            progress (Callable[[BulkProgress], None], optional): Called about once a second
+                with counts, throughput, latency and ETA, e.g. a TerminalProgress.
+            total (int, optional): Rows in ``data`` for the progress ETA, when it has no length.
+
+        Returns:
+            BulkSummary: How many rows ran, succeeded and failed.
+        """
+        if not dry_run and (concurrency > 1 or pool is not None):
             try:
-                operation = row.pop("operation")
-                # Create command from data
-                command: OCICommand = self._create_command(row, operation)
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(
+                    self.stream_from_data_async(
+                        data,
+                        sink,
+                        concurrency,
+                        pool,
+                        journal,
+                        upsert,
+                        preflight,
+                        retry,
+                        progress,
+                        total,
+                    )
+                )
+            raise RuntimeError(
+                "stream_from_data cannot run concurrently inside an event loop, "
+                "await stream_from_data_async instead"
+            )
 
-                # Validate data by attempting to create command (pydantic will error if invalid)
-                if not dry_run:
-                    response = self._execute_command(command)
+        summary = BulkSummary()
+        state: Optional[UpsertState] = None
+        issues: Dict[int, List[str]] = {}
+        if upsert or preflight:
+            # The reads are worked out from every row before any is sent
+            data = rows = list(data)
+            if preflight:
+                issues = self._prefetch(self._preflight(upsert), rows).check(rows)
+            if upsert:
+                state = self._prefetch(self._upsert_state(), rows)
+        tracker = self._tracker(progress, summary, data, total)
+        # Dry runs neither skip nor record rows
+        log = BulkJournal(journal) if journal is not None and not dry_run else None
+        try:
+            for i, row in enumerate(data):
+                digest = row_digest(row) if log is not None else ""
+                if log is not None and log.is_complete(i, digest):
+                    result = self._skipped_result(i, row, SKIPPED_COMPLETED)
                 else:
-                    response = None
-
-                return_data = {
-                    "index": i,
-                    "data": row,
-                    "command": command,
-                    "response": response,
-                    "success": True,
-                }
+                    if i in issues:
+                        result = self._rejected_result(i, row, issues[i])
+                    elif state is not None and state.apply(row):
+                        result = self._skipped_result(i, row, SKIPPED_UNCHANGED)
+                    else:
+                        result = self._run_row(i, row, dry_run, retry, summary, tracker)
+                    if log is not None:
+                        log.record(i, digest, result["success"])
+                summary.add(result)
+                sink(result)
+                if tracker is not None:
+                    tracker.update()
+        finally:
+            if log is not None:
+                log.close()
+        if tracker is not None:
+            tracker.finish()
+        return summary
+
+    async def stream_from_data_async(
+        self,
+        data: Iterable[Dict[str, Any]],
+        sink: ResultSink,
+        concurrency: int = 8,
+        pool: Optional[BasePool] = None,
+        journal: Optional[Union[str, os.PathLike]] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
+        total: Optional[int] = None,
+    ) -> BulkSummary:
+        """Send rows concurrently, handing each result to ``sink`` as it finishes
+
+        Sends like `execute_from_data_async`, with at most ``concurrency`` rows
+        built and in flight at a time.
 
-                # If response is an ErrorResponse and not package issue
-                if isinstance(response, ErrorResponse):
-                    return_data["response"] = response.summary  # type: ignore
-                    return_data["detail"] = response.detail  # type: ignore
-                    return_data["success"] = False
+        Args:
+            data (Iterable[Dict[str, Any]]): Rows of entities to create
+            sink (Callable[[Dict[str, Any]], None]): Called with each result.
+            concurrency (int, optional): Rows sent at once. Defaults to 8.
+            pool (BasePool, optional): Pool to send rows through.
+            journal (str | PathLike, optional): Journal file recording each finished row.
+                Rows it shows already succeeded are skipped, see `BulkJournal`.
+            upsert (bool, optional): Fetch the current state first, send only changed
+                fields and turn creates of existing entities into modifies, see `UpsertState`.
+            preflight (bool, optional): Check rows against the sheet and the target groups
+                first, failing conflicting rows without sending them, see `Preflight`.
+            retry (RetryPolicy, optional): Send rows that failed for a passing reason,
+                such as a timeout, again after a backoff, see `RetryPolicy`.
+            progress (Callable[[BulkProgress], None], optional): Called about once a second
+                with counts, throughput, latency and ETA, e.g. a TerminalProgress.
+            total (int, optional): Rows in ``data`` for the progress ETA, when it has no length.
 
-                results.append(return_data)
+        Returns:
+            BulkSummary: How many rows ran, succeeded and failed.
+        """
+        own_pool = pool is None
+        if pool is None:
+            pool = SessionPool.from_client(self.client, size=concurrency)
+        summary = BulkSummary()
+        state: Optional[UpsertState] = None
+        issues: Dict[int, List[str]] = {}
+        if upsert or preflight:
+            # The reads are worked out from every row before any is sent
+            data = rows = list(data)
+            if preflight:
+                checks = await self._prefetch_async(self._preflight(upsert), rows, pool)
+                issues = checks.check(rows)
+            if upsert:
+                state = await self._prefetch_async(self._upsert_state(), rows, pool)
+        tracker = self._tracker(progress, summary, data, total)
+        log = BulkJournal(journal) if journal is not None else None
+        # Hashes of the rows in flight, recorded once they finish
+        digests: Dict[int, str] = {}
+
+        def finish(result: Dict[str, Any]) -> None:
+            if log is not None:
+                log.record(
+                    result["index"], digests.pop(result["index"]), result["success"]
+                )
+            summary.add(result)
+            sink(result)
+            if tracker is not None:
+                tracker.update()
+
+        def prepare() -> Iterator[Dict[str, Any]]:
+            for i, row in enumerate(data):
+                if log is not None:
+                    digest = row_digest(row)
+                    if log.is_complete(i, digest):
+                        result = self._skipped_result(i, row, SKIPPED_COMPLETED)
+                        summary.add(result)
+                        sink(result)
+                        if tracker is not None:
+                            tracker.update()
+                        continue
+                    digests[i] = digest
+                if i in issues:
+                    finish(self._rejected_result(i, row, issues[i]))
+                    continue
+                if state is not None and state.apply(row):
+                    finish(self._skipped_result(i, row, SKIPPED_UNCHANGED))
+                    continue
+                try:
+                    return_data = self._build_result(i, row)
+                except Exception as e:
+                    finish(self._failed_result(i, row, e))
+                    continue
+                yield return_data
 
+        async def send(return_data: Dict[str, Any]) -> Optional[float]:
+            started = time.monotonic()
+            try:
+                response = await pool.command(return_data["command"], Lane.BULK)
             except Exception as e:
-                # Pydantic validation errors or other failures
-                results.append(
-                    {
-                        "index": i,
-                        "data": row,
-                        "command": None,
-                        "response": None,
-                        "success": False,
-                        "error": str(e),
-                    }
+                if tracker is not None:
+                    tracker.latency(time.monotonic() - started)
+                delay = self._retry_delay(retry, summary, return_data, error=e)
+                if delay is not None:
+                    return delay
+                finish(
+                    self._failed_result(
+                        return_data["index"],
+                        return_data["data"],
+                        ValueError(f"Error executing command: {e}"),
+                        return_data.get("attempts"),
+                    )
                 )
+                return None
+            if tracker is not None:
+                tracker.latency(time.monotonic() - started)
+            delay = self._retry_delay(retry, summary, return_data, response)
+            if delay is not None:
+                return delay
+            self._record_response(return_data, response)
+            finish(return_data)
+            return None
 
-        return results
+        try:
+            await run_ordered(
+                prepare(),
+                send,
+                lambda return_data: entity_key(return_data["data"]),
+                concurrency if own_pool else max(concurrency, pool.size),
+            )
+        finally:
+            if own_pool:
+                await pool.close()
+            if log is not None:
+                log.close()
+        if tracker is not None:
+            tracker.finish()
+        return summary
+
+    def _run_row(
+        self,
+        index: int,
+        row: Dict[str, Any],
+        dry_run: bool,
+        retry: Optional[RetryPolicy] = None,
+        summary: Optional[BulkSummary] = None,
+        tracker: Optional[ProgressTracker] = None,
+    ) -> Dict[str, Any]:
+        """Build and, unless ``dry_run``, send one row, returning its result.
+
+        Transient failures are sent again as ``retry`` allows, waiting out the
+        backoff in place so rows still run in input order.
+        """
+        try:
+            # Validate data by attempting to create command (pydantic will error if invalid)
+            return_data = self._build_result(index, row)
+        except Exception as e:
+            # Pydantic validation errors or other failures
+            return self._failed_result(index, row, e)
+        if dry_run:
+            return return_data
+        while True:
+            started = time.monotonic()
+            try:
+                response = self._execute_command(return_data["command"])
+            except Exception as e:
+                if tracker is not None:
+                    tracker.latency(time.monotonic() - started)
+                delay = self._retry_delay(retry, summary, return_data, error=e)
+                if delay is None:
+                    return self._failed_result(
+                        index, row, e, return_data.get("attempts")
+                    )
+            else:
+                if tracker is not None:
+                    tracker.latency(time.monotonic() - started)
+                delay = self._retry_delay(retry, summary, return_data, response)
+                if delay is None:
+                    self._record_response(return_data, response)
+                    return return_data
+            time.sleep(delay)
+
+    def _retry_delay(
+        self,
+        retry: Optional[RetryPolicy],
+        summary: Optional[BulkSummary],
+        return_data: Dict[str, Any],
+        response: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> Optional[float]:
+        """How long to wait before sending a failed row again, None to not retry.
+
+        Counts the retry against the row's attempts and the job's budget.
+        """
+        if retry is None or summary is None:
+            return None
+        attempts = return_data.get("attempts", 1)
+        if attempts > retry.retries or summary.retried >= retry.budget:
+            return None
+        if not retry.transient(response, error):
+            return None
+        return_data["attempts"] = attempts + 1
+        summary.retried += 1
+        return retry.delay(attempts)
+
+    def _build_result(self, index: int, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a row's command and the result dict that will carry its response.
+
+        Args:
+            index (int): Position of the row in the input.
+            row (Dict[str, Any]): A single row of data, its operation is removed.
+
+        Returns:
+            Dict[str, Any]: The result, successful until a response says otherwise.
+        """
+        operation = row.pop("operation")
+        # Create command from data
+        command: OCICommand = self._create_command(row, operation)
+        return {
+            "index": index,
+            "data": row,
+            "command": command,
+            "response": None,
+            "success": True,
+        }
+
+    def _record_response(
+        self, return_data: Dict[str, Any], response: OCIResponse | None
+    ) -> None:
+        """Store a row's response, marking the row failed on an ErrorResponse."""
+        return_data["response"] = response
+        # If response is an ErrorResponse and not package issue
+        if isinstance(response, ErrorResponse):
+            return_data["response"] = response.summary  # type: ignore
+            return_data["detail"] = response.detail  # type: ignore
+            return_data["success"] = False
+
+    def _skipped_result(
+        self, index: int, row: Dict[str, Any], reason: str
+    ) -> Dict[str, Any]:
+        """The result of a row that did not need sending."""
+        return {
+            "index": index,
+            "data": row,
+            "command": None,
+            "response": reason,
+            "success": True,
+            "skipped": True,
+        }
+
+    def _rejected_result(
+        self, index: int, row: Dict[str, Any], problems: List[str]
+    ) -> Dict[str, Any]:
+        """The result of a row pre-flight checks stopped from being sent."""
+        return self._failed_result(
+            index, row, ValueError(f"Pre-flight: {'; '.join(problems)}")
+        )
+
+    def _tracker(
+        self,
+        progress: Optional[ProgressCallback],
+        summary: BulkSummary,
+        data: Iterable[Dict[str, Any]],
+        total: Optional[int],
+    ) -> Optional[ProgressTracker]:
+        """A tracker reporting to ``progress``, None without one."""
+        if progress is None:
+            return None
+        if total is None and isinstance(data, Sized):
+            total = len(data)
+        return ProgressTracker(progress, summary, total)
+
+    def _upsert_state(self) -> UpsertState:
+        return UpsertState(self.operation_mapping, self.client._dispatch_table)
+
+    def _preflight(self, upsert: bool = False) -> Preflight:
+        return Preflight(self.operation_mapping, self.client._dispatch_table, upsert)
+
+    def _prefetch(self, reads: Reads, data: List[Dict[str, Any]]) -> Reads:
+        """Make the reads ``data`` needs and load their responses into ``reads``."""
+        for key, command in reads.requests(data):
+            try:
+                response = self.client.command(command)
+            except Exception:
+                # Unknown, the rows depending on this read are not held back by it
+                response = None
+            reads.load(key, response)
+        return reads
+
+    async def _prefetch_async(
+        self, reads: Reads, data: List[Dict[str, Any]], pool: BasePool
+    ) -> Reads:
+        """Make the reads ``data`` needs through ``pool``, all at once."""
+        requests = reads.requests(data)
+        responses = await asyncio.gather(
+            *(pool.command(command, Lane.BULK) for _, command in requests),
+            return_exceptions=True,
+        )
+        for (key, _), response in zip(requests, responses):
+            reads.load(key, response)
+        return reads
+
+    def _failed_result(
+        self,
+        index: int,
+        row: Dict[str, Any],
+        error: Exception,
+        attempts: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """The result of a row that failed before the server answered."""
+        result = {
+            "index": index,
+            "data": row,
+            "command": None,
+            "response": None,
+            "success": False,
+            "error": str(error),
+        }
+        if attempts is not None:
+            result["attempts"] = attempts
+        return result
 
     def _parse_csv(self, data: list[dict[str, Any]]) -> List[Dict[str, Any]]:
         """Shared CSV parsing logic.
@@ -128,7 +775,9 @@ class BaseBulkOperations(ABC):
         """Process a single row of data.
 
         Uses a dynamic token-based parser to handle arbitrary nesting of
-        objects and arrays at any depth.
+        objects and arrays at any depth. The header is compiled into a
+        `RowPlan` the first time it is seen, so later rows with the same
+        columns skip straight to placing their values.
 
         Args:
             row (dict[str, Any]): A single row of data.
@@ -136,40 +785,14 @@ class BaseBulkOperations(ABC):
         Returns:
             dict[str, Any]: A single row of data with nested structures built.
         """
-        result: Dict[str, Any] = {}
-        operation = row["operation"]
-
-        for key, value in row.items():
-            key = to_snake_case(key)
-
-            # Skip None values and empty strings
-            if value is None or (isinstance(value, str) and is_none(value)):
-                continue
-            value = value.strip()
-
-            # Type conversions
-            if isinstance(value, str) and is_boolean(value):
-                value = str_to_bool(value)
-            elif isinstance(value, str) and key in self.operation_mapping.get(
-                operation, {}
-            ).get("integer_fields", []):
-                value = int(value)
-            elif isinstance(value, str) and value.startswith("+"):
-                # BWKS needs numbers as str and in E.164 formatting
-                value = normalise_phone_number(value)
-
-            # Parse the key path and set the value dynamically
-            # Skip 'operation' as it's metadata
-            if key != "operation":
-                segments = self._parse_key_path(key)
-                self._set_nested_value(result, segments, value)
-            else:
-                result[key] = value
-
-        # Clean up arrays - remove None padding where appropriate
-        self._clean_arrays(result)
-
-        return result
+        header = tuple(row)
+        plan = self._row_plans.get(header)
+        if plan is None:
+            if len(self._row_plans) >= MAX_ROW_PLANS:
+                # Rows given as data can each have their own keys
+                self._row_plans.clear()
+            plan = self._row_plans[header] = RowPlan(header, self.operation_mapping)
+        return plan.build(row)
 
     def _clean_arrays(self, data: Any) -> None:
         """Recursively clean arrays by removing trailing None values.
@@ -177,20 +800,7 @@ class BaseBulkOperations(ABC):
         Args:
             data (Any): The data structure to clean (dict, list, or primitive)
         """
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if isinstance(value, list):
-                    # Remove None values from lists (they were used for padding)
-                    data[key] = [item for item in value if item is not None]
-                    # Recursively clean nested structures
-                    for item in data[key]:
-                        self._clean_arrays(item)
-                else:
-                    # Recursively clean nested objects
-                    self._clean_arrays(value)
-        elif isinstance(data, list):
-            for item in data:
-                self._clean_arrays(item)
+        clean_arrays(data)
 
     def _parse_key_path(self, key: str) -> List[tuple[str, int | None]]:
         """Parse a CSV column key into a list of path segments.
@@ -212,27 +822,7 @@ class BaseBulkOperations(ABC):
         Returns:
             List[tuple[str, int | None]]: List of (field_name, array_index) tuples
         """
-        segments = []
-        # Split by dots first, but we need to handle brackets within each part
-        parts = key.split(".")
-
-        for part in parts:
-            # Check if this part has an array index
-            if "[" in part and "]" in part:
-                # Extract field name and index
-                match = re.match(r"^(\w+)\[(\d+)\]$", part)
-                if match:
-                    field_name = match.group(1)
-                    index = int(match.group(2))
-                    segments.append((field_name, index))
-                else:
-                    # Malformed, treat as regular field
-                    segments.append((part, None))
-            else:
-                # Regular field name
-                segments.append((part, None))
-
-        return segments
+        return parse_key_path(key)
 
     def _set_nested_value(
         self, result: Dict[str, Any], segments: List[tuple[str, int | None]], value: Any
@@ -246,59 +836,7 @@ class BaseBulkOperations(ABC):
             segments (List[tuple[str, int | None]]): Path segments from _parse_key_path
             value (Any): The value to set at the end of the path
         """
-        current = result
-
-        # Navigate through all segments except the last one
-        for i, (field_name, array_index) in enumerate(segments[:-1]):
-            next_segment = segments[i + 1]
-            _, next_is_array = next_segment
-
-            if array_index is not None:
-                # Current segment is an array element
-                if field_name not in current:
-                    current[field_name] = []
-
-                # Ensure the list is large enough
-                while len(current[field_name]) <= array_index:
-                    current[field_name].append(None)
-
-                # Initialize the array element if needed
-                if current[field_name][array_index] is None:
-                    if next_is_array is not None:
-                        # Next segment is also an array, so this should be a dict
-                        current[field_name][array_index] = {}
-                    else:
-                        # Next segment is an object field
-                        current[field_name][array_index] = {}
-
-                current = current[field_name][array_index]
-            else:
-                # Current segment is an object field
-                if field_name not in current:
-                    if next_is_array is not None:
-                        # Next segment is an array
-                        current[field_name] = {}
-                    else:
-                        # Next segment is an object
-                        current[field_name] = {}
-
-                current = current[field_name]
-
-        # Handle the last segment
-        last_field, last_index = segments[-1]
-
-        if last_index is not None:
-            # Last segment is an array element - list of primitives
-            if last_field not in current:
-                current[last_field] = []
-
-            while len(current[last_field]) <= last_index:
-                current[last_field].append(None)
-
-            current[last_field][last_index] = value
-        else:
-            # Last segment is a simple field
-            current[last_field] = value
+        set_path(result, tuple(segments), value)
 
     def _create_command(self, data: Dict[str, Any], operation: str) -> OCICommand:
         """Create a command from the data.
@@ -323,6 +861,9 @@ class BaseBulkOperations(ABC):
                 f"Command {mapping['command']} not found in dispatch table"
             )
 
+        # Fields that only locate the entity for upserts are not sent
+        for name in mapping.get("lookup", ()):
+            processed_data.pop(name, None)
         # Handle defaults needed in command if not given from user
         if mapping.get("defaults"):
             self._handle_defaults(processed_data, mapping["defaults"])
@@ -418,4 +959,4 @@ class BaseBulkOperations(ABC):
         try:
             return cast(OCIResponse | None, self.client.command(command))
         except Exception as e:
-            raise ValueError(f"Error executing command: {e}")
+            raise ValueError(f"Error executing command: {e}") from e
@@ -1,5 +1,9 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Mapping, Optional, Union
 
+from mercury_ocip.bulk.base_operation import BaseBulkOperations
+from mercury_ocip.bulk.progress import ProgressCallback
+from mercury_ocip.bulk.retry import RetryPolicy
+from mercury_ocip.bulk.scheduler import BulkJob
 from mercury_ocip.bulk.call_pickup import CallPickupBulkOperations
 from mercury_ocip.bulk.call_center import CallCenterBulkOperations
 from mercury_ocip.bulk.hunt_group import HuntGroupBulkOperations
@@ -30,122 +34,528 @@ class BulkOperations:
         self.users = UserBulkOperations(client)
         self.administrator = AdminBulkOperations(client)
 
+    def run_job(
+        self,
+        sheets: Mapping[str, Union[str, List[Dict[str, Any]]]],
+        dry_run: bool = False,
+        concurrency: int = 8,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Run several sheets as one job, in dependency order.
+
+        Devices are created before the users whose endpoints name them, and
+        users before the hunt groups, call centers and call pickup groups that
+        list them. See `BulkJob`.
+
+        Args:
+            sheets (Mapping[str, str | List[Dict[str, Any]]]): CSV path or rows by
+                entity, e.g. "devices", "users", "hunt_group", "call_center".
+            dry_run (bool, optional): If True, nothing is sent. Defaults to False.
+            concurrency (int, optional): Rows sent at once. Defaults to 8.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Results by entity, each in input order.
+        """
+        job = BulkJob()
+        for name, sheet in sheets.items():
+            operations = getattr(self, name, None)
+            if not isinstance(operations, BaseBulkOperations):
+                raise ValueError(f"Unknown bulk entity: {name}")
+            if isinstance(sheet, str):
+                job.add_csv(operations, sheet)
+            else:
+                job.add(operations, sheet)
+        return dict(zip(sheets, job.run(concurrency, dry_run=dry_run)))
+
     # Call Pickup
     def create_call_pickup_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.call_pickup.execute_from_csv(csv_path, dry_run)
+        return self.call_pickup.execute_from_csv(
+            csv_path,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def create_call_pickup_from_data(
-        self, call_pickup_data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        call_pickup_data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.call_pickup.execute_from_data(call_pickup_data, dry_run)
+        return self.call_pickup.execute_from_data(
+            call_pickup_data,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     # Hunt Group
     def create_hunt_group_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.hunt_group.execute_from_csv(csv_path, dry_run)
+        return self.hunt_group.execute_from_csv(
+            csv_path,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def create_hunt_group_from_data(
-        self, hunt_group_data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        hunt_group_data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.hunt_group.execute_from_data(hunt_group_data, dry_run)
+        return self.hunt_group.execute_from_data(
+            hunt_group_data,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     # Call Center
     def create_call_center_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.call_center.execute_from_csv(csv_path, dry_run)
+        return self.call_center.execute_from_csv(
+            csv_path,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def create_call_center_from_data(
-        self, call_center_data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        call_center_data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.call_center.execute_from_data(call_center_data, dry_run)
+        return self.call_center.execute_from_data(
+            call_center_data,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     # Auto Attendant
     def create_auto_attendant_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.auto_attendant.execute_from_csv(csv_path, dry_run)
+        return self.auto_attendant.execute_from_csv(
+            csv_path,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def create_auto_attendant_from_data(
-        self, auto_attendant_data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        auto_attendant_data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.auto_attendant.execute_from_data(auto_attendant_data, dry_run)
+        return self.auto_attendant.execute_from_data(
+            auto_attendant_data,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     # Device
     def create_device_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.devices.execute_from_csv(csv_path, dry_run)
+        return self.devices.execute_from_csv(
+            csv_path,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def create_device_from_data(
-        self, device_data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        device_data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.devices.execute_from_data(device_data, dry_run)
+        return self.devices.execute_from_data(
+            device_data,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     # User
     def create_user_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.users.execute_from_csv(csv_path, dry_run)
+        return self.users.execute_from_csv(
+            csv_path,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def create_users_from_data(
-        self, user_data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        user_data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.users.execute_from_data(user_data, dry_run)
+        return self.users.execute_from_data(
+            user_data,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def modify_user_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.users.execute_from_csv(csv_path, dry_run)
+        return self.users.execute_from_csv(
+            csv_path,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def modify_user_from_data(
-        self, user_data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        user_data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.users.execute_from_data(user_data, dry_run)
+        return self.users.execute_from_data(
+            user_data,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     # Group Admin
     def create_group_admin_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.administrator.execute_from_csv(csv_path, dry_run)
+        return self.administrator.execute_from_csv(
+            csv_path,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def create_group_admin_from_data(
-        self, group_admin_data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        group_admin_data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.administrator.execute_from_data(group_admin_data, dry_run)
+        return self.administrator.execute_from_data(
+            group_admin_data,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     # Group Admin Modify Policy
     def modify_group_admin_policy_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.administrator.execute_from_csv(csv_path, dry_run)
+        return self.administrator.execute_from_csv(
+            csv_path,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def modify_group_admin_policy_from_data(
-        self, group_admin_policy_data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        group_admin_policy_data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.administrator.execute_from_data(group_admin_policy_data, dry_run)
+        return self.administrator.execute_from_data(
+            group_admin_policy_data,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     # Service Provider Admin
     def create_service_provider_admin_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.administrator.execute_from_csv(csv_path, dry_run)
+        return self.administrator.execute_from_csv(
+            csv_path,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def create_service_provider_from_data(
-        self, group_admin_data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        group_admin_data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.administrator.execute_from_data(group_admin_data, dry_run)
+        return self.administrator.execute_from_data(
+            group_admin_data,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     # Service Provider Admin Modify Policy
     def modify_service_provider_admin_policy_from_csv(
-        self, csv_path: str, dry_run: bool = False
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.administrator.execute_from_csv(csv_path, dry_run)
+        return self.administrator.execute_from_csv(
+            csv_path,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
 
     def modify_service_provider_admin_policy_from_data(
-        self, group_admin_policy_data: List[Dict[str, Any]], dry_run: bool = False
+        self,
+        group_admin_policy_data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        concurrency: int = 1,
+        journal: Optional[str] = None,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
-        return self.administrator.execute_from_data(group_admin_policy_data, dry_run)
+        return self.administrator.execute_from_data(
+            group_admin_policy_data,
+            dry_run,
+            concurrency,
+            journal=journal,
+            upsert=upsert,
+            preflight=preflight,
+            retry=retry,
+            progress=progress,
+        )
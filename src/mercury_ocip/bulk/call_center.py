@@ -56,12 +56,21 @@ class CallCenterBulkOperations(BaseBulkOperations):
                     "force_delivery_wait_time_seconds",
                     "queue_length",
                 ],
+                "checks": ["new_id", "free_dn", "free_extension"],
             },
             "call.center.update.agent.list": {
                 "command": "GroupCallCenterModifyAgentListRequest",
                 "nested_types": {
                     "agent_user_id_list": "ReplacementUserIdList",
                 },
+                "upsert": {
+                    "state": {
+                        "command": "GroupCallCenterGetAgentListRequest",
+                        "scope": ["service_user_id"],
+                        "table": "agent_table",
+                        "collect": {"user_id": "agent_user_id_list.user_id"},
+                    },
+                },
                 # "integer_fields": [],
                 # "defaults": {},
             },
@@ -21,5 +21,6 @@ class DeviceBulkOperations(BaseBulkOperations):
                 },
                 # "defaults": {},
                 # "integer_fields": {},
+                "checks": ["new_device"],
             }
         }
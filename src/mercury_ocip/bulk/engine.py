@@ -0,0 +1,142 @@
+"""
+Runs bulk rows concurrently while keeping rows for the same entity in order
+"""
+
+import asyncio
+from collections import deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+# Marks the end of the items
+_DONE: Any = object()
+
+# Checked in order, the first one a row carries is the entity it targets
+ENTITY_FIELDS: Tuple[str, ...] = (
+    "user_id",
+    "service_user_id",
+    "device_name",
+    "group_id",
+    "service_provider_id",
+)
+
+
+def entity_key(row: Mapping[str, Any]) -> Optional[Hashable]:
+    """The entity a row creates or changes, None when it names none.
+
+    Users and service instances are keyed on their ID. Devices and groups are
+    only unique within their service provider, and devices within their group,
+    so the IDs above them are part of the key.
+    """
+    for name in ENTITY_FIELDS:
+        value = row.get(name)
+        if not value or not isinstance(value, str):
+            # A list, e.g. the members of a call pickup group, names no one entity
+            continue
+        if name == "device_name":
+            return (name, row.get("service_provider_id"), row.get("group_id"), value)
+        if name == "group_id":
+            return (name, row.get("service_provider_id"), value)
+        return (name, value)
+    return None
+
+
+async def run_ordered(
+    items: Iterable[T],
+    handle: Callable[[T], Awaitable[Optional[float]]],
+    key: Callable[[T], Optional[Hashable]],
+    concurrency: int,
+) -> None:
+    """Runs ``handle`` over ``items`` with up to ``concurrency`` at once.
+
+    Items with the same key run one after another in input order, the next one
+    starting only once the previous has finished. Items with different keys, or
+    no key, run in parallel. An item whose key is busy is parked rather than
+    holding up a worker, and the worker that finishes its predecessor picks it
+    up. Items are read lazily, a generator is never read far ahead of the work.
+
+    ``handle`` can ask for an item to be run again by returning a delay in
+    seconds. The item keeps its key while it waits, so nothing parked behind it
+    overtakes it, but its worker moves on to other items. Once the delay is up
+    the item is run before any item not yet started.
+
+    Args:
+        items (Iterable): The work, in input order.
+        handle (Callable): Awaited once per item. Must not raise, record failures
+            instead. Returns None when done with the item, or a delay to run it again.
+        key (Callable): The ordering key of an item, None for no ordering.
+        concurrency (int): Items handled at once.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    loop = asyncio.get_running_loop()
+    source: Iterator[T] = iter(items)
+    # Keys with an item running, each mapped to the items parked behind it
+    busy: Dict[Hashable, Deque[T]] = {}
+    # Items whose delay is up, and how many are still waiting on theirs
+    again: Deque[Tuple[T, Optional[Hashable]]] = deque()
+    waiting = 0
+    woken = asyncio.Event()
+
+    def wake(item: T, item_key: Optional[Hashable]) -> None:
+        nonlocal waiting
+        waiting -= 1
+        again.append((item, item_key))
+        woken.set()
+
+    async def run(item: T, item_key: Optional[Hashable]) -> None:
+        nonlocal waiting
+        while True:
+            delay = await handle(item)
+            if delay is not None:
+                waiting += 1
+                loop.call_later(delay, wake, item, item_key)
+                return
+            if item_key is None:
+                return
+            # Work through whatever queued up behind this entity meanwhile
+            parked = busy[item_key]
+            if not parked:
+                del busy[item_key]
+                return
+            item = parked.popleft()
+
+    async def worker() -> None:
+        while True:
+            if again:
+                await run(*again.popleft())
+                continue
+            item = next(source, _DONE)
+            if item is not _DONE:
+                item_key = key(item)
+                if item_key is not None:
+                    if item_key in busy:
+                        busy[item_key].append(item)
+                        continue
+                    busy[item_key] = deque()
+                await run(item, item_key)
+                continue
+            if not waiting:
+                return
+            woken.clear()
+            await woken.wait()
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
@@ -45,5 +45,6 @@ class HuntGroupBulkOperations(BaseBulkOperations):
                     "no_answer_number_of_rings",
                     "forward_timeout_seconds",
                 ],
+                "checks": ["new_id", "free_dn", "free_extension"],
             },
         }
@@ -0,0 +1,91 @@
+"""
+Write-ahead journal that lets an interrupted bulk job pick up where it stopped
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Mapping, Optional, Union
+
+
+def row_digest(row: Mapping[str, Any]) -> str:
+    """A stable hash of a row's content, taken before the row is built."""
+    encoded = json.dumps(row, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class BulkJournal:
+    """Records the outcome of every bulk row as it finishes
+
+    Each finished row appends one JSON line with its index, the hash of its
+    content and whether it succeeded, and is flushed to disk before the next
+    row is recorded. Opening an existing journal reads it back, so a rerun of
+    the same sheet skips every row that already succeeded and sends only the
+    rows that failed or were still in flight. A row whose content changed
+    since it was recorded is sent again.
+
+    Args:
+        path (str | PathLike): The journal file, created if missing.
+        fsync (bool, optional): Sync each line to disk, not just to the OS. Defaults to True.
+
+    Example:
+        >>> agent.bulk.users.execute_from_csv("users.csv", journal="users.journal")
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], fsync: bool = True) -> None:
+        self.path = path
+        self.fsync = fsync
+        # Index to the hash of the row that succeeded there
+        self._completed: Dict[int, str] = {}
+        self._load()
+        self._handle = open(path, "a", encoding="utf-8")
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as handle:
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    # Torn by the crash being recovered from, cut it off so the
+                    # next record starts on a line of its own
+                    handle.truncate(handle.tell() - len(line))
+                    break
+                try:
+                    entry = json.loads(line)
+                    index, digest = entry["index"], entry["hash"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if entry.get("success"):
+                    self._completed[index] = digest
+                else:
+                    self._completed.pop(index, None)
+
+    @property
+    def completed(self) -> int:
+        """How many rows have succeeded so far."""
+        return len(self._completed)
+
+    def is_complete(self, index: int, digest: str) -> bool:
+        """Whether row ``index`` already succeeded with this same content."""
+        return self._completed.get(index) == digest
+
+    def record(self, index: int, digest: str, success: bool) -> None:
+        """Durably append the outcome of row ``index``."""
+        line = json.dumps({"index": index, "hash": digest, "success": success})
+        self._handle.write(line + "\n")
+        self._handle.flush()
+        if self.fsync:
+            os.fsync(self._handle.fileno())
+        if success:
+            self._completed[index] = digest
+        else:
+            self._completed.pop(index, None)
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def __enter__(self) -> "BulkJournal":
+        return self
+
+    def __exit__(self, *exc_info: Optional[Any]) -> None:
+        self.close()
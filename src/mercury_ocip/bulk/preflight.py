@@ -0,0 +1,321 @@
+"""
+Validates a bulk sheet against itself and the target groups before anything is sent
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from mercury_ocip.commands.base_command import ErrorResponse, OCICommand
+
+type GroupKey = Tuple[str, str]
+type ReadKey = Tuple[str, GroupKey]
+
+# Group reads, by name: the command and the table it answers with
+READS: Dict[str, Tuple[str, str]] = {
+    "users": ("UserGetListInGroupRequest", "user_table"),
+    "dns": ("GroupDnGetAssignmentListRequest18", "dn_table"),
+    "devices": ("GroupAccessDeviceGetListRequest", "access_device_table"),
+}
+
+# The reads each check needs
+CHECKS: Dict[str, Tuple[str, ...]] = {
+    "new_id": ("users",),
+    "free_dn": ("dns",),
+    "free_extension": ("users",),
+    "existing_device": ("devices",),
+    "new_device": ("devices",),
+}
+
+# Ranges longer than this are not expanded into single numbers
+MAX_DN_RANGE = 10_000
+
+
+@dataclass(slots=True)
+class GroupIndex:
+    """What a group already holds, None where the read failed or was not needed"""
+
+    users: Optional[Set[str]] = None
+    # Extension to the user holding it
+    extensions: Optional[Dict[str, str]] = None
+    # Number digits to the user it is assigned to, "" when free
+    dns: Optional[Dict[str, str]] = None
+    devices: Optional[Set[str]] = None
+
+
+@dataclass(slots=True)
+class SheetIndex:
+    """What earlier rows of the sheet claim, each mapped to the first row claiming it"""
+
+    ids: Dict[str, int] = field(default_factory=dict)
+    dns: Dict[str, int] = field(default_factory=dict)
+    extensions: Dict[Tuple[GroupKey, str], int] = field(default_factory=dict)
+    devices: Dict[Tuple[GroupKey, str], int] = field(default_factory=dict)
+
+
+class Preflight:
+    """Finds rows that are bound to fail before a single write is sent
+
+    An operation opts in with ``checks`` in its operation mapping, any of:
+
+    - ``new_id``: the user or service user ID is not created twice in the sheet
+      and is not an existing user of the group.
+    - ``free_dn``: the phone number belongs to the group, is not assigned to
+      someone else and is not used twice in the sheet.
+    - ``free_extension``: no other user of the group, or row of the sheet, has it.
+    - ``existing_device``: a group level device named in the access device
+      endpoint exists in the group.
+    - ``new_device``: the device does not exist in the group and is not created
+      twice in the sheet.
+
+    Each group's users, DNs and devices are read once, only when a check needs
+    them, and held in hash indexes, so checking a row is a few lookups.
+
+    Args:
+        operation_mapping (Mapping[str, Dict[str, Any]]): The entity's operation mapping.
+        dispatch_table (Mapping[str, type]): The client's dispatch table.
+        upsert (bool, optional): Existing IDs are not conflicts, the rows become modifies.
+    """
+
+    def __init__(
+        self,
+        operation_mapping: Mapping[str, Dict[str, Any]],
+        dispatch_table: Mapping[str, type],
+        upsert: bool = False,
+    ) -> None:
+        self._mapping = operation_mapping
+        self._dispatch = dispatch_table
+        self.upsert = upsert
+        self._groups: Dict[GroupKey, GroupIndex] = {}
+
+    def requests(
+        self, rows: Iterable[Mapping[str, Any]]
+    ) -> List[Tuple[ReadKey, OCICommand]]:
+        """The group reads the checks on ``rows`` need, each once."""
+        requests: Dict[ReadKey, OCICommand] = {}
+        for row in rows:
+            group = _group(row)
+            if group is None:
+                continue
+            for check in self._checks(row):
+                for read in CHECKS[check]:
+                    if (read, group) in requests:
+                        continue
+                    command_name = READS[read][0]
+                    command_class = self._dispatch.get(command_name)
+                    if command_class is None:
+                        raise ValueError(
+                            f"Command {command_name} not found in dispatch table"
+                        )
+                    requests[(read, group)] = command_class(
+                        service_provider_id=group[0], group_id=group[1]
+                    )
+        return list(requests.items())
+
+    def load(self, key: ReadKey, response: Any) -> None:
+        """Index the response to one of `requests`, ignoring failed reads."""
+        if response is None or isinstance(response, (ErrorResponse, BaseException)):
+            return
+        read, group = key
+        table = getattr(response, READS[read][1], None) or []
+        rows = table.to_dict() if hasattr(table, "to_dict") else list(table)
+        index = self._groups.setdefault(group, GroupIndex())
+
+        if read == "users":
+            index.users = {row["user_id"] for row in rows if row.get("user_id")}
+            index.extensions = {
+                row["extension"]: row.get("user_id") or ""
+                for row in rows
+                if row.get("extension")
+            }
+        elif read == "dns":
+            dns: Dict[str, str] = {}
+            for row in rows:
+                for number in _expand(row.get("phone_numbers") or ""):
+                    for digits in _number_keys(number):
+                        dns[digits] = row.get("user_id") or ""
+            index.dns = dns
+        elif read == "devices":
+            index.devices = {
+                row["device_name"] for row in rows if row.get("device_name")
+            }
+
+    def check(self, rows: Iterable[Mapping[str, Any]]) -> Dict[int, List[str]]:
+        """Check every row, returning the problems of each row that has any.
+
+        Args:
+            rows (Iterable[Mapping[str, Any]]): Processed rows, in sheet order. Not changed.
+
+        Returns:
+            Dict[int, List[str]]: Problems by row index, rows without any are left out.
+        """
+        sheet = SheetIndex()
+        issues: Dict[int, List[str]] = {}
+        for position, row in enumerate(rows):
+            group = _group(row)
+            index = self._groups.get(group, GroupIndex()) if group else GroupIndex()
+            problems: List[str] = []
+            for check in self._checks(row):
+                getattr(self, f"_{check}")(position, row, group, index, sheet, problems)
+            if problems:
+                issues[position] = problems
+        return issues
+
+    def _checks(self, row: Mapping[str, Any]) -> List[str]:
+        operation = row.get("operation")
+        if not isinstance(operation, str):
+            return []
+        return self._mapping.get(operation, {}).get("checks", [])
+
+    def _new_id(
+        self,
+        position: int,
+        row: Mapping[str, Any],
+        group: Optional[GroupKey],
+        index: GroupIndex,
+        sheet: SheetIndex,
+        problems: List[str],
+    ) -> None:
+        entity_id = row.get("user_id") or row.get("service_user_id")
+        if not isinstance(entity_id, str):
+            return
+        first = sheet.ids.setdefault(entity_id, position)
+        if first != position:
+            problems.append(f"ID {entity_id} is also created by row {first}")
+        elif not self.upsert and index.users is not None and entity_id in index.users:
+            problems.append(f"ID {entity_id} already exists")
+
+    def _free_dn(
+        self,
+        position: int,
+        row: Mapping[str, Any],
+        group: Optional[GroupKey],
+        index: GroupIndex,
+        sheet: SheetIndex,
+        problems: List[str],
+    ) -> None:
+        number = _nested(row, "phone_number")
+        if not isinstance(number, str) or not number:
+            return
+        keys = _number_keys(number)
+        first = next((sheet.dns[key] for key in keys if key in sheet.dns), None)
+        if first is not None:
+            problems.append(f"Phone number {number} is also used by row {first}")
+            return
+        for key in keys:
+            sheet.dns[key] = position
+        if index.dns is None or group is None:
+            return
+        owner = next((index.dns[key] for key in keys if key in index.dns), None)
+        entity_id = row.get("user_id") or row.get("service_user_id")
+        if owner is None:
+            problems.append(f"Phone number {number} is not in group {group[1]}")
+        elif owner and owner != entity_id:
+            problems.append(f"Phone number {number} is already assigned to {owner}")
+
+    def _free_extension(
+        self,
+        position: int,
+        row: Mapping[str, Any],
+        group: Optional[GroupKey],
+        index: GroupIndex,
+        sheet: SheetIndex,
+        problems: List[str],
+    ) -> None:
+        extension = _nested(row, "extension")
+        if extension is None or extension == "" or group is None:
+            return
+        extension = str(extension)
+        first = sheet.extensions.setdefault((group, extension), position)
+        if first != position:
+            problems.append(f"Extension {extension} is also used by row {first}")
+            return
+        owner = (index.extensions or {}).get(extension)
+        entity_id = row.get("user_id") or row.get("service_user_id")
+        if owner is not None and owner != entity_id:
+            problems.append(f"Extension {extension} is already used by {owner}")
+
+    def _existing_device(
+        self,
+        position: int,
+        row: Mapping[str, Any],
+        group: Optional[GroupKey],
+        index: GroupIndex,
+        sheet: SheetIndex,
+        problems: List[str],
+    ) -> None:
+        endpoint = row.get("access_device_endpoint")
+        device = endpoint.get("access_device") if isinstance(endpoint, dict) else None
+        if not isinstance(device, dict) or not device.get("device_name"):
+            return
+        if device.get("device_level", "Group") != "Group":
+            return
+        if index.devices is None or group is None:
+            return
+        if device["device_name"] not in index.devices:
+            problems.append(
+                f"Device {device['device_name']} does not exist in group {group[1]}"
+            )
+
+    def _new_device(
+        self,
+        position: int,
+        row: Mapping[str, Any],
+        group: Optional[GroupKey],
+        index: GroupIndex,
+        sheet: SheetIndex,
+        problems: List[str],
+    ) -> None:
+        name = row.get("device_name")
+        if not isinstance(name, str) or not name or group is None:
+            return
+        first = sheet.devices.setdefault((group, name), position)
+        if first != position:
+            problems.append(f"Device {name} is also created by row {first}")
+        elif index.devices is not None and name in index.devices:
+            problems.append(f"Device {name} already exists in group {group[1]}")
+
+
+def _group(row: Mapping[str, Any]) -> Optional[GroupKey]:
+    provider, group = row.get("service_provider_id"), row.get("group_id")
+    if isinstance(provider, str) and provider and isinstance(group, str) and group:
+        return (provider, group)
+    return None
+
+
+def _nested(row: Mapping[str, Any], name: str) -> Any:
+    """``name`` from the row, or from its service instance profile."""
+    if name in row:
+        return row[name]
+    profile = row.get("service_instance_profile")
+    return profile.get(name) if isinstance(profile, dict) else None
+
+
+def _number_keys(number: str) -> Tuple[str, ...]:
+    """The digits of a number, plus its national digits when it has a country code."""
+    digits = re.sub(r"\D", "", number)
+    if "-" in number and number.lstrip().startswith("+"):
+        national = re.sub(r"\D", "", number.split("-", 1)[1])
+        return (digits, national)
+    return (digits,)
+
+
+def _expand(numbers: str) -> List[str]:
+    """The numbers in a DN table cell, a single number or a range "a - b"."""
+    if " - " not in numbers:
+        return [numbers] if numbers else []
+    low, high = (part.strip() for part in numbers.split(" - ", 1))
+    prefix, low_digits = _split_tail(low)
+    _, high_digits = _split_tail(high)
+    if not low_digits or not high_digits:
+        return [low, high]
+    start, end = int(low_digits), int(high_digits)
+    if end < start or end - start >= MAX_DN_RANGE:
+        return [low, high]
+    width = len(low_digits)
+    return [f"{prefix}{value:0{width}d}" for value in range(start, end + 1)]
+
+
+def _split_tail(number: str) -> Tuple[str, str]:
+    match = re.match(r"^(.*?)(\d+)$", number)
+    return (match.group(1), match.group(2)) if match else (number, "")
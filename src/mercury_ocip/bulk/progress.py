@@ -0,0 +1,256 @@
+"""
+Progress, throughput and ETA of a running bulk job
+"""
+
+import json
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import IO, Any, Callable, Deque, Dict, List, Optional, Union
+
+from mercury_ocip.bulk.streaming import BulkSummary
+
+# Seconds between progress reports, the last one is always sent
+PROGRESS_INTERVAL = 1.0
+
+
+@dataclass(slots=True)
+class BulkProgress:
+    """Where a bulk job stands, as handed to progress callbacks
+
+    Attributes:
+        completed: Rows finished, however they ended.
+        succeeded: Rows that succeeded.
+        failed: Rows that failed.
+        skipped: Rows that did not need sending.
+        retried: Times a row was sent again after a transient failure.
+        total: Rows in the job, None when the input's length is unknown.
+        elapsed: Seconds since the job started.
+        rate: Rows per second since the previous report.
+        average_rate: Rows per second, exponentially weighted across reports.
+        latency_p50: Median seconds a command took, None before any was sent.
+        latency_p90: 90th percentile seconds a command took.
+        latency_p99: 99th percentile seconds a command took.
+        eta: Seconds left at ``average_rate``, None without a total or a rate.
+        done: Whether this is the final report.
+    """
+
+    completed: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    retried: int = 0
+    total: Optional[int] = None
+    elapsed: float = 0.0
+    rate: float = 0.0
+    average_rate: float = 0.0
+    latency_p50: Optional[float] = None
+    latency_p90: Optional[float] = None
+    latency_p99: Optional[float] = None
+    eta: Optional[float] = None
+    done: bool = False
+
+    @property
+    def percent(self) -> Optional[float]:
+        if not self.total:
+            return None
+        return 100.0 * self.completed / self.total
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+type ProgressCallback = Callable[[BulkProgress], None]
+
+
+class ProgressTracker:
+    """Turns a job's results and command timings into periodic BulkProgress reports
+
+    Counts come from the job's BulkSummary. ``update`` is called as each row
+    finishes and reports at most every ``interval`` seconds, ``finish``
+    always reports.
+
+    Args:
+        callback (Callable[[BulkProgress], None]): Called with each report.
+        summary (BulkSummary): The job's running counts.
+        total (int, optional): Rows in the job, for the ETA.
+        interval (float, optional): Seconds between reports. Defaults to 1.
+        smoothing (float, optional): Weight of the latest rate in ``average_rate``, 0 to 1.
+        window (int, optional): Recent command latencies kept for percentiles.
+    """
+
+    def __init__(
+        self,
+        callback: ProgressCallback,
+        summary: BulkSummary,
+        total: Optional[int] = None,
+        interval: float = PROGRESS_INTERVAL,
+        smoothing: float = 0.3,
+        window: int = 1024,
+    ) -> None:
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be between 0 and 1")
+        self.callback = callback
+        self.summary = summary
+        self.total = total
+        self.interval = interval
+        self.smoothing = smoothing
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._started = time.monotonic()
+        self._last_time = self._started
+        self._last_completed = 0
+        self._average: Optional[float] = None
+
+    def latency(self, seconds: float) -> None:
+        """Record how long one command took."""
+        self._latencies.append(seconds)
+
+    def update(self) -> None:
+        """Report if ``interval`` has passed since the last report."""
+        if time.monotonic() - self._last_time >= self.interval:
+            self.report()
+
+    def finish(self) -> None:
+        """Send the final report."""
+        self.report(done=True)
+
+    def report(self, done: bool = False) -> BulkProgress:
+        """Send a report now, returning it."""
+        now = time.monotonic()
+        summary = self.summary
+        since = now - self._last_time
+        rate = (summary.total - self._last_completed) / since if since > 0 else 0.0
+        if self._average is None:
+            # The first report has nothing to smooth against
+            self._average = (
+                summary.total / (now - self._started) if now > self._started else rate
+            )
+        else:
+            self._average += self.smoothing * (rate - self._average)
+        self._last_time = now
+        self._last_completed = summary.total
+
+        ordered = sorted(self._latencies)
+        progress = BulkProgress(
+            completed=summary.total,
+            succeeded=summary.succeeded,
+            failed=summary.failed,
+            skipped=summary.skipped,
+            retried=summary.retried,
+            total=self.total,
+            elapsed=now - self._started,
+            rate=rate,
+            average_rate=self._average,
+            latency_p50=_percentile(ordered, 0.50),
+            latency_p90=_percentile(ordered, 0.90),
+            latency_p99=_percentile(ordered, 0.99),
+            eta=self._eta(done),
+            done=done,
+        )
+        self.callback(progress)
+        return progress
+
+    def _eta(self, done: bool) -> Optional[float]:
+        if done:
+            return 0.0
+        if self.total is None or not self._average:
+            return None
+        return max(0, self.total - self.summary.total) / self._average
+
+
+class TerminalProgress:
+    """Draws bulk progress on one terminal line
+
+    Redraws the line in place on a terminal, and writes one line per report
+    when the output is a file or a pipe, e.g. a CI log.
+
+    Args:
+        stream (IO, optional): Where to write. Defaults to stderr.
+        width (int, optional): Characters in the progress bar. Defaults to 30.
+
+    Example:
+        >>> agent.bulk.users.execute_from_csv("users.csv", progress=TerminalProgress())
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None, width: int = 30) -> None:
+        self.stream = stream if stream is not None else sys.stderr
+        self.width = width
+        isatty = getattr(self.stream, "isatty", None)
+        self._redraw = bool(isatty and isatty())
+
+    def __call__(self, progress: BulkProgress) -> None:
+        line = self.format(progress)
+        if self._redraw:
+            self.stream.write("\r\x1b[K" + line + ("\n" if progress.done else ""))
+        else:
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def format(self, progress: BulkProgress) -> str:
+        parts = []
+        percent = progress.percent
+        if percent is not None:
+            filled = min(self.width, int(self.width * percent / 100))
+            parts.append(
+                f"[{'#' * filled}{'.' * (self.width - filled)}] "
+                f"{progress.completed}/{progress.total} {percent:5.1f}%"
+            )
+        else:
+            parts.append(f"{progress.completed} rows")
+        counts = f"ok {progress.succeeded} failed {progress.failed}"
+        if progress.skipped:
+            counts += f" skipped {progress.skipped}"
+        if progress.retried:
+            counts += f" retried {progress.retried}"
+        parts.append(counts)
+        parts.append(f"{progress.average_rate:.1f} rows/s")
+        p50, p99 = progress.latency_p50, progress.latency_p99
+        if p50 is not None and p99 is not None:
+            parts.append(f"p50 {p50 * 1000:.0f}ms p99 {p99 * 1000:.0f}ms")
+        if progress.done:
+            parts.append(f"done in {_duration(progress.elapsed)}")
+        elif progress.eta is not None:
+            parts.append(f"ETA {_duration(progress.eta)}")
+        return " | ".join(parts)
+
+
+class JsonStatusWriter:
+    """Keeps a JSON file holding a bulk job's latest progress
+
+    The file is replaced whole on each report, so a reader never sees half of
+    one. ``updated`` is the Unix time of the report, a stale value means the
+    job has stopped reporting.
+
+    Args:
+        path (str | PathLike): The status file.
+
+    Example:
+        >>> agent.bulk.users.stream_from_csv(
+        ...     "users.csv", sink, progress=JsonStatusWriter("users.status.json")
+        ... )
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path = os.fspath(path)
+
+    def __call__(self, progress: BulkProgress) -> None:
+        status = progress.as_dict()
+        status["updated"] = time.time()
+        partial = f"{self.path}.tmp"
+        with open(partial, "w", encoding="utf-8") as handle:
+            json.dump(status, handle)
+        os.replace(partial, self.path)
+
+
+def _percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
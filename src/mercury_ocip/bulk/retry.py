@@ -0,0 +1,96 @@
+"""
+Retries bulk rows that failed for reasons that pass, such as a timeout
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, FrozenSet, Optional
+
+from mercury_ocip.commands.base_command import ErrorResponse
+from mercury_ocip.exceptions import (
+    MErrorClientInitialisation,
+    MErrorNoHealthyHost,
+    MErrorSendRequestFailed,
+    MErrorSocketInitialisation,
+)
+from mercury_ocip.limiter import OVERLOAD_PATTERN, Outcome, classify
+
+# Failures in transport that are not timeouts, the next attempt may well get through
+CONNECTION_ERRORS = (
+    MErrorSocketInitialisation,
+    MErrorClientInitialisation,
+    MErrorSendRequestFailed,
+    MErrorNoHealthyHost,
+    ConnectionError,
+)
+
+
+@dataclass(slots=True, frozen=True)
+class RetryPolicy:
+    """When and how soon a failed bulk row is sent again
+
+    Timeouts, dropped connections and error responses saying the server is
+    busy are transient, anything else such as a validation or business rule
+    error is permanent and fails the row straight away. A transient row waits
+    ``base_delay`` doubled for each attempt it has had, capped at ``max_delay``,
+    and is sent again while other rows carry on.
+
+    A write that timed out may still have been applied, so a retried create
+    can come back saying the entity already exists.
+
+    Attributes:
+        retries: Most times one row is sent again.
+        budget: Most retries across a whole job, so a server that is down does
+            not have every row sent several times.
+        base_delay: Seconds before the first retry.
+        max_delay: Longest wait before a retry.
+        jitter: Wait a random time between half and all of the delay, so rows
+            that failed together are not retried together.
+        busy_codes: Error codes of ErrorResponses to treat as transient, on top
+            of those whose summary reads as the server being busy.
+    """
+
+    retries: int = 3
+    budget: int = 100
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    jitter: bool = True
+    busy_codes: FrozenSet[int] = frozenset()
+
+    def __post_init__(self) -> None:
+        if self.retries < 0 or self.budget < 0:
+            raise ValueError("retries and budget cannot be negative")
+        if self.base_delay < 0 or self.max_delay < self.base_delay:
+            raise ValueError("delays must satisfy 0 <= base_delay <= max_delay")
+
+    def transient(
+        self, response: Any = None, error: Optional[BaseException] = None
+    ) -> bool:
+        """Whether a row that got ``response``, or raised ``error``, may succeed later."""
+        if error is not None:
+            # Sending wraps the client's error, the cause says what went wrong
+            error = error.__cause__ or error
+            if isinstance(error, CONNECTION_ERRORS):
+                return True
+            return classify(error=error) is Outcome.TIMEOUT
+        if isinstance(response, ErrorResponse):
+            if self.busy_codes and _error_code(response) in self.busy_codes:
+                return True
+            return bool(OVERLOAD_PATTERN.search(response.summary or ""))
+        return False
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retry number ``attempt``, counting from 1."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if self.jitter:
+            return random.uniform(delay / 2, delay)
+        return delay
+
+
+def _error_code(response: ErrorResponse) -> Optional[int]:
+    """The response's error code as an int, decoded XML carries it as text."""
+    code: Any = response.errorCode
+    try:
+        return int(code) if code is not None else None
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,185 @@
+"""
+Compiles a bulk sheet's header once so each row is built in a single pass
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from mercury_ocip.utils.defines import normalise_phone_number, to_snake_case
+
+type Segment = Tuple[str, Optional[int]]
+
+_ARRAY_SEGMENT = re.compile(r"^(\w+)\[(\d+)\]$")
+
+
+def parse_key_path(key: str) -> List[Segment]:
+    """Split a snake_case column key into (field_name, array_index) segments.
+
+    ``array_index`` is None for object fields, e.g. 'alias[0].value' gives
+    [('alias', 0), ('value', None)]. A malformed index is kept as a plain field.
+    """
+    segments: List[Segment] = []
+    for part in key.split("."):
+        match = _ARRAY_SEGMENT.match(part) if "[" in part and "]" in part else None
+        if match:
+            segments.append((match.group(1), int(match.group(2))))
+        else:
+            segments.append((part, None))
+    return segments
+
+
+class RowPlan:
+    """How to place every column of one header, worked out once per sheet
+
+    Each column keeps its snake_case key and, for nested columns, the path
+    segments leading to it. Which columns hold integers depends on a row's
+    operation and is worked out the first time each operation is seen.
+
+    Args:
+        header (Tuple[str, ...]): Column names as they appear in the sheet.
+        operation_mapping (Mapping[str, Dict[str, Any]]): The entity's operation mapping.
+    """
+
+    __slots__ = ("keys", "paths", "array_roots", "_operation_mapping", "_integers")
+
+    def __init__(
+        self,
+        header: Tuple[str, ...],
+        operation_mapping: Mapping[str, Dict[str, Any]],
+    ) -> None:
+        self.keys: Tuple[str, ...] = tuple(to_snake_case(name) for name in header)
+        # None for a top level field, else the segments of a nested one
+        self.paths: Tuple[Optional[Tuple[Segment, ...]], ...] = tuple(
+            self._path(key) for key in self.keys
+        )
+        # Top level fields holding a list somewhere below, the only ones to clean
+        self.array_roots: Tuple[str, ...] = tuple(
+            dict.fromkeys(
+                path[0][0]
+                for path in self.paths
+                if path is not None and any(index is not None for _, index in path)
+            )
+        )
+        self._operation_mapping = operation_mapping
+        self._integers: Dict[Any, FrozenSet[int]] = {}
+
+    @staticmethod
+    def _path(key: str) -> Optional[Tuple[Segment, ...]]:
+        if key == "operation":
+            return None
+        segments = parse_key_path(key)
+        if len(segments) == 1 and segments[0][1] is None:
+            return None
+        return tuple(segments)
+
+    def integer_columns(self, operation: Any) -> FrozenSet[int]:
+        """Positions of the columns ``operation`` wants as integers."""
+        columns = self._integers.get(operation)
+        if columns is None:
+            fields = self._operation_mapping.get(operation, {}).get(
+                "integer_fields", []
+            )
+            columns = frozenset(
+                position for position, key in enumerate(self.keys) if key in fields
+            )
+            self._integers[operation] = columns
+        return columns
+
+    def build(self, row: Mapping[str, Any]) -> Dict[str, Any]:
+        """Build one row into its nested, typed form.
+
+        Args:
+            row (Mapping[str, Any]): Values keyed by this plan's header, in order.
+
+        Returns:
+            Dict[str, Any]: The row with nested structures built.
+        """
+        integers = self.integer_columns(row["operation"])
+        result: Dict[str, Any] = {}
+        paths = self.paths
+
+        for position, (key, value) in enumerate(zip(self.keys, row.values())):
+            # Skip None values, empty strings and "None"
+            if value is None:
+                continue
+            value = value.strip()
+            lowered = value.lower()
+            if not value or lowered == "none":
+                continue
+
+            # Type conversions
+            if lowered == "true":
+                value = True
+            elif lowered == "false":
+                value = False
+            elif position in integers:
+                value = int(value)
+            elif value.startswith("+"):
+                # BWKS needs numbers as str and in E.164 formatting
+                value = normalise_phone_number(value)
+
+            path = paths[position]
+            if path is None:
+                result[key] = value
+            else:
+                set_path(result, path, value)
+
+        for root in self.array_roots:
+            if root in result:
+                result[root] = _without_padding(result[root])
+        return result
+
+
+def set_path(result: Dict[str, Any], path: Tuple[Segment, ...], value: Any) -> None:
+    """Set ``value`` at ``path``, creating the objects and lists on the way."""
+    current: Any = result
+    last = len(path) - 1
+    for depth, (field_name, array_index) in enumerate(path):
+        if array_index is None:
+            if depth == last:
+                current[field_name] = value
+            elif field_name in current:
+                current = current[field_name]
+            else:
+                current[field_name] = {}
+                current = current[field_name]
+            continue
+
+        items = current.get(field_name)
+        if items is None:
+            items = []
+            current[field_name] = items
+        if len(items) <= array_index:
+            # Padding is dropped once the row is built
+            items.extend([None] * (array_index + 1 - len(items)))
+        if depth == last:
+            items[array_index] = value
+        else:
+            if items[array_index] is None:
+                items[array_index] = {}
+            current = items[array_index]
+
+
+def _without_padding(value: Any) -> Any:
+    """``value`` with the None padding dropped from every list inside it."""
+    if isinstance(value, list):
+        return [_without_padding(item) for item in value if item is not None]
+    if isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = _without_padding(item)
+    return value
+
+
+def clean_arrays(data: Any) -> None:
+    """Recursively remove the None padding left in lists by array columns."""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, list):
+                data[key] = [item for item in value if item is not None]
+                for item in data[key]:
+                    clean_arrays(item)
+            else:
+                clean_arrays(value)
+    elif isinstance(data, list):
+        for item in data:
+            clean_arrays(item)
@@ -0,0 +1,326 @@
+"""
+Runs several bulk sheets as one job, ordered by the IDs their rows reference
+"""
+
+import asyncio
+import heapq
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+from mercury_ocip.bulk.base_operation import BaseBulkOperations
+from mercury_ocip.lanes import Lane
+from mercury_ocip.pool import BasePool, SessionPool
+from mercury_ocip.utils.file_handler import FileHandler
+
+# Fields holding the IDs of users, or of service instances, which share the ID space
+USER_REFERENCE_FIELDS: Tuple[str, ...] = ("user_id", "agent_user_id", "service_user_id")
+
+
+def provided_key(row: Dict[str, Any]) -> Optional[Hashable]:
+    """The entity a row creates or changes that other rows can reference."""
+    for name in ("user_id", "service_user_id"):
+        value = row.get(name)
+        if isinstance(value, str) and value:
+            return ("user", value)
+    device = row.get("device_name")
+    if isinstance(device, str) and device:
+        return device_key(row, row, device)
+    return None
+
+
+def device_key(
+    scope: Dict[str, Any], device: Dict[str, Any], name: str
+) -> Tuple[Any, ...]:
+    """Key of a device, which is unique within its group, service provider or system."""
+    level = device.get("device_level", "Group")
+    if level == "System":
+        return ("device", None, None, name)
+    if level == "Service Provider":
+        return ("device", scope.get("service_provider_id"), None, name)
+    return ("device", scope.get("service_provider_id"), scope.get("group_id"), name)
+
+
+def referenced_keys(row: Dict[str, Any]) -> Set[Hashable]:
+    """Users, service instances and devices a row points at.
+
+    The row's own ``user_id`` or ``service_user_id`` names what it creates, so
+    only lists of them, e.g. call pickup members, and nested fields count.
+    """
+    found: Set[Hashable] = set()
+
+    def walk(value: Any, name: Optional[str], top: bool) -> None:
+        if isinstance(value, dict):
+            device = value.get("device_name")
+            if name == "access_device" and isinstance(device, str) and device:
+                found.add(device_key(row, value, device))
+            for key, item in value.items():
+                walk(item, key, False)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, str) and name in USER_REFERENCE_FIELDS:
+                    found.add(("user", item))
+                else:
+                    walk(item, name, False)
+        elif isinstance(value, str) and value and name in USER_REFERENCE_FIELDS:
+            if not top or name == "agent_user_id":
+                found.add(("user", value))
+
+    for key, value in row.items():
+        walk(value, key, True)
+    found.discard(provided_key(row))
+    return found
+
+
+@dataclass(slots=True)
+class _Node:
+    """One row of the job and its place in the dependency graph"""
+
+    sheet: int
+    index: int
+    result: Dict[str, Any] = field(default_factory=dict)
+    dependents: List[int] = field(default_factory=list)
+    waiting_on: int = 0
+    height: int = 0
+
+
+class BulkJob:
+    """Runs rows from several bulk sheets as one job in dependency order.
+
+    Rows are linked by the IDs they reference. A user whose device endpoint
+    names a device waits for the row creating that device, a hunt group, call
+    center or call pickup group waits for the users it lists, and rows for the
+    same entity run in the order they were added. References to entities no
+    row in the job creates are assumed to exist already.
+
+    Every row starts as soon as the rows it depends on have succeeded, so
+    independent work from all sheets runs side by side, longest dependency
+    chains first. When a row fails, the rows depending on it are skipped and
+    reported as failed, everything else still runs.
+
+    Example:
+        job = BulkJob()
+        job.add_csv(agent.bulk.devices, "devices.csv")
+        job.add_csv(agent.bulk.users, "users.csv")
+        job.add_csv(agent.bulk.hunt_group, "hunt_groups.csv")
+        devices, users, hunt_groups = job.run(concurrency=16)
+    """
+
+    def __init__(self) -> None:
+        self._sheets: List[Tuple[BaseBulkOperations, List[Dict[str, Any]]]] = []
+
+    def add(self, operations: BaseBulkOperations, data: List[Dict[str, Any]]) -> int:
+        """Add a sheet of rows in the same format as `execute_from_data`.
+
+        Returns:
+            int: Position of the sheet's results in the list `run` returns.
+        """
+        self._sheets.append((operations, data))
+        return len(self._sheets) - 1
+
+    def add_csv(self, operations: BaseBulkOperations, csv_path: str) -> int:
+        """Add a sheet from a CSV file in the same format as `execute_from_csv`."""
+        data = FileHandler.read_csv_to_dict(csv_path)
+        return self.add(operations, operations._parse_csv(data))
+
+    def levels(self) -> List[List[Tuple[int, int]]]:
+        """The rows grouped by how many rows must run before them, as (sheet, row).
+
+        Each level only depends on earlier ones. Nothing is sent or built.
+
+        Raises:
+            ValueError: If rows depend on each other in a cycle
+        """
+        nodes = self._graph()
+        depth = [0] * len(nodes)
+        for position in self._topological_order(nodes):
+            for dependent in nodes[position].dependents:
+                depth[dependent] = max(depth[dependent], depth[position] + 1)
+        grouped: List[List[Tuple[int, int]]] = [
+            [] for _ in range(max(depth, default=-1) + 1)
+        ]
+        for position, node in enumerate(nodes):
+            grouped[depth[position]].append((node.sheet, node.index))
+        return grouped
+
+    def run(
+        self,
+        concurrency: int = 8,
+        pool: Optional[BasePool] = None,
+        dry_run: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """Run the job to completion, see `run_async`."""
+        return asyncio.run(self.run_async(concurrency, pool, dry_run))
+
+    async def run_async(
+        self,
+        concurrency: int = 8,
+        pool: Optional[BasePool] = None,
+        dry_run: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """Run every row of every sheet with up to ``concurrency`` at once.
+
+        Args:
+            concurrency (int): Rows sent at once.
+            pool (BasePool, optional): Pool to send through, by default a SessionPool
+                of ``concurrency`` sessions built from the first sheet's client.
+            dry_run (bool): Build and check every command and the graph, send nothing.
+
+        Returns:
+            List[List[Dict[str, Any]]]: Results per sheet in the order sheets were
+                added, each in input order and in the `execute_from_data` format.
+
+        Raises:
+            ValueError: If rows depend on each other in a cycle
+        """
+        # The graph comes first, building replaces nested dicts in the rows
+        nodes = self._graph()
+        order = self._topological_order(nodes)
+        results: List[List[Dict[str, Any]]] = [[] for _ in self._sheets]
+        for node in nodes:
+            operations, data = self._sheets[node.sheet]
+            row = data[node.index]
+            try:
+                node.result = operations._build_result(node.index, row)
+            except Exception as e:
+                node.result = operations._failed_result(node.index, row, e)
+            results[node.sheet].append(node.result)
+
+        if dry_run or not nodes:
+            return results
+
+        for position in reversed(order):
+            node = nodes[position]
+            node.height = 1 + max(
+                (nodes[dependent].height for dependent in node.dependents), default=0
+            )
+
+        own_pool = pool is None
+        if pool is None:
+            pool = SessionPool.from_client(self._sheets[0][0].client, size=concurrency)
+        try:
+            await self._execute(
+                nodes, pool, concurrency if own_pool else max(concurrency, pool.size)
+            )
+        finally:
+            if own_pool:
+                await pool.close()
+        return results
+
+    def _graph(self) -> List[_Node]:
+        """Links each row to the rows creating what it references"""
+        nodes: List[_Node] = []
+        references: List[Set[Hashable]] = []
+        latest: Dict[Hashable, int] = {}
+        first: Dict[Hashable, int] = {}
+        for sheet, (_, data) in enumerate(self._sheets):
+            for index, row in enumerate(data):
+                position = len(nodes)
+                nodes.append(_Node(sheet, index))
+                references.append(referenced_keys(row))
+                key = provided_key(row)
+                if key is None:
+                    continue
+                if key in latest:
+                    # Later rows for the same entity follow the earlier ones
+                    self._link(nodes, latest[key], position)
+                latest[key] = position
+                first.setdefault(key, position)
+
+        for position, keys in enumerate(references):
+            for key in keys:
+                provider = first.get(key)
+                if provider is not None and provider != position:
+                    self._link(nodes, provider, position)
+        return nodes
+
+    @staticmethod
+    def _link(nodes: List[_Node], provider: int, dependent: int) -> None:
+        nodes[provider].dependents.append(dependent)
+        nodes[dependent].waiting_on += 1
+
+    @staticmethod
+    def _topological_order(nodes: List[_Node]) -> List[int]:
+        waiting = [node.waiting_on for node in nodes]
+        ready = [position for position, count in enumerate(waiting) if count == 0]
+        order: List[int] = []
+        while ready:
+            position = ready.pop()
+            order.append(position)
+            for dependent in nodes[position].dependents:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(nodes):
+            stuck = [
+                f"sheet {node.sheet} row {node.index}"
+                for node, count in zip(nodes, waiting)
+                if count
+            ]
+            raise ValueError(
+                f"Rows depend on each other in a cycle: {', '.join(stuck[:10])}"
+            )
+        return order
+
+    async def _execute(
+        self, nodes: List[_Node], pool: BasePool, concurrency: int
+    ) -> None:
+        """Sends rows as their prerequisites succeed, tallest dependency chains first"""
+        ready: List[Tuple[int, int]] = []
+        wake = asyncio.Event()
+        remaining = len(nodes)
+
+        def finish(position: int, succeeded: bool) -> None:
+            nonlocal remaining
+            remaining -= 1
+            for dependent in nodes[position].dependents:
+                node = nodes[dependent]
+                if not succeeded and node.result["success"]:
+                    blocker = nodes[position]
+                    node.result["success"] = False
+                    node.result["error"] = (
+                        f"Skipped, sheet {blocker.sheet} row {blocker.index} failed"
+                    )
+                node.waiting_on -= 1
+                if node.waiting_on == 0:
+                    heapq.heappush(ready, (-node.height, dependent))
+            wake.set()
+
+        for position, node in enumerate(nodes):
+            if node.waiting_on == 0:
+                heapq.heappush(ready, (-node.height, position))
+
+        async def worker() -> None:
+            while remaining:
+                if not ready:
+                    wake.clear()
+                    await wake.wait()
+                    continue
+                _, position = heapq.heappop(ready)
+                await self._send(nodes[position], pool)
+                finish(position, nodes[position].result["success"])
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def _send(self, node: _Node, pool: BasePool) -> None:
+        result = node.result
+        if not result["success"] or result["command"] is None:
+            # Failed to build, or a prerequisite failed
+            return
+        operations = self._sheets[node.sheet][0]
+        try:
+            response = await pool.command(result["command"], Lane.BULK)
+        except Exception as e:
+            result.update(
+                operations._failed_result(
+                    node.index,
+                    result["data"],
+                    ValueError(f"Error executing command: {e}"),
+                )
+            )
+            return
+        operations._record_response(result, response)
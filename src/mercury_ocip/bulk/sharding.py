@@ -0,0 +1,409 @@
+"""
+Spreads a bulk sheet over several processes, each running whole groups
+"""
+
+import dataclasses
+import functools
+import heapq
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+from mercury_ocip.bulk.base_operation import BaseBulkOperations
+from mercury_ocip.bulk.progress import ProgressCallback, ProgressTracker
+from mercury_ocip.bulk.retry import RetryPolicy
+from mercury_ocip.bulk.streaming import BulkSummary, ResultSink
+from mercury_ocip.client import BaseClient, Client
+from mercury_ocip.utils.defines import to_snake_case
+from mercury_ocip.utils.file_handler import FileHandler
+
+type ClientFactory = Callable[[], BaseClient]
+type ShardKey = Tuple[Optional[str], Optional[str]]
+
+# Results a worker sends back at once, and the longest it holds a partial batch
+RESULT_BATCH = 64
+RESULT_LINGER = 0.5
+
+# Seconds the parent waits on results before checking its workers are alive
+WORKER_POLL = 1.0
+
+
+@dataclass(slots=True)
+class Shard:
+    """The rows one worker process runs, with what it needs to run them
+
+    Attributes:
+        number: Position of the shard, used to match messages to it.
+        operations: The entity's bulk operations class, built in the worker.
+        client_factory: Opens the worker's own client.
+        indices: Position in the sheet of each row.
+        rows: The rows, in sheet order.
+        raw: Rows are CSV rows still to go through `_process_row`.
+        options: Passed to the worker's `stream_from_data`.
+    """
+
+    number: int
+    operations: type
+    client_factory: ClientFactory
+    indices: List[int] = field(default_factory=list)
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    raw: bool = False
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+class ShardedRunner:
+    """Runs a bulk sheet across several worker processes, a group per process
+
+    Building rows and commands and serialising them takes most of the CPU of a
+    large sheet, so one process tops out at one core however many sessions it
+    has open. The runner splits the rows by service provider and group, gives
+    every group to exactly one of ``workers`` processes, largest groups first
+    to whichever worker has the fewest rows, and runs each share there with
+    `stream_from_data`. Rows of a group are therefore ordered exactly as they
+    would be in a single process, and rows of different groups run side by side.
+
+    Each worker opens its own client, and with ``concurrency`` above 1 its own
+    SessionPool, from the settings of the operations' client. Results are sent
+    back in batches as they finish and handed to the sink, progress callback
+    and summary in the parent. If a worker dies its remaining rows fail with
+    the reason.
+
+    Workers are started with multiprocessing's default start method. Where that
+    is spawn, as on Windows and macOS, the calling script needs the usual
+    ``if __name__ == "__main__":`` guard.
+
+    Pre-flight checks and upserts run inside each worker and only see that
+    worker's rows. Since groups are never split, only checks across groups,
+    such as a user ID reused in two groups, are missed. A retry budget is split
+    evenly between workers. Journals are not supported.
+
+    Args:
+        operations (BaseBulkOperations): The entity's bulk operations, e.g. ``agent.bulk.users``.
+        workers (int, optional): Worker processes. Defaults to the number of CPUs.
+        concurrency (int, optional): Rows each worker sends at once. Defaults to 1.
+        client_factory (Callable[[], BaseClient], optional): Opens a worker's client.
+            Must be picklable, e.g. a module level function. Defaults to a Client
+            with the same host, login and connection settings.
+
+    Example:
+        >>> runner = ShardedRunner(agent.bulk.users, workers=8, concurrency=4)
+        >>> results = runner.execute_from_csv("users.csv")
+    """
+
+    def __init__(
+        self,
+        operations: BaseBulkOperations,
+        workers: Optional[int] = None,
+        concurrency: int = 1,
+        client_factory: Optional[ClientFactory] = None,
+    ) -> None:
+        workers = workers if workers is not None else os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.operations = operations
+        self.workers = workers
+        self.concurrency = concurrency
+        self.client_factory = client_factory or _client_factory(operations.client)
+
+    def execute_from_csv(
+        self,
+        csv_path: str,
+        dry_run: bool = False,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run a CSV file across the workers, as `BaseBulkOperations.execute_from_csv`
+
+        Rows are read here and built in the workers.
+
+        Returns:
+            List[Dict[str, Any]]: The results in input order.
+        """
+        results: List[Dict[str, Any]] = []
+        self.stream_from_csv(
+            csv_path, results.append, dry_run, upsert, preflight, retry, progress
+        )
+        results.sort(key=lambda result: result["index"])
+        return results
+
+    def execute_from_data(
+        self,
+        data: List[Dict[str, Any]],
+        dry_run: bool = False,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run rows across the workers, as `BaseBulkOperations.execute_from_data`
+
+        Returns:
+            List[Dict[str, Any]]: The results in input order.
+        """
+        results: List[Dict[str, Any]] = []
+        self.stream_from_data(
+            data, results.append, dry_run, upsert, preflight, retry, progress
+        )
+        results.sort(key=lambda result: result["index"])
+        return results
+
+    def stream_from_csv(
+        self,
+        csv_path: str,
+        sink: ResultSink,
+        dry_run: bool = False,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> BulkSummary:
+        """Run a CSV file across the workers, handing each result to ``sink``
+
+        Results arrive in the order they finish. See
+        `BaseBulkOperations.stream_from_csv` for the arguments.
+
+        Returns:
+            BulkSummary: How many rows ran, succeeded and failed.
+        """
+        rows = list(FileHandler.iter_csv_rows(csv_path))
+        columns: Dict[str, str] = {}
+        for row in rows[:1]:
+            columns = {to_snake_case(name): name for name in row}
+        provider = columns.get("service_provider_id", "")
+        group = columns.get("group_id", "")
+        return self._run(
+            rows,
+            lambda row: (row.get(provider) or None, row.get(group) or None),
+            True,
+            sink,
+            dry_run,
+            upsert,
+            preflight,
+            retry,
+            progress,
+        )
+
+    def stream_from_data(
+        self,
+        data: List[Dict[str, Any]],
+        sink: ResultSink,
+        dry_run: bool = False,
+        upsert: bool = False,
+        preflight: bool = False,
+        retry: Optional[RetryPolicy] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> BulkSummary:
+        """Run rows across the workers, handing each result to ``sink``
+
+        Results arrive in the order they finish. See
+        `BaseBulkOperations.stream_from_data` for the arguments.
+
+        Returns:
+            BulkSummary: How many rows ran, succeeded and failed.
+        """
+        return self._run(
+            list(data),
+            lambda row: (row.get("service_provider_id"), row.get("group_id")),
+            False,
+            sink,
+            dry_run,
+            upsert,
+            preflight,
+            retry,
+            progress,
+        )
+
+    def shards(
+        self, rows: List[Dict[str, Any]], key: Callable[[Dict[str, Any]], Hashable]
+    ) -> List[List[int]]:
+        """Split row positions into at most ``workers`` shards, never splitting a group.
+
+        Groups are handed out largest first, each to the shard with the fewest
+        rows so far. Shards keep their rows in sheet order.
+        """
+        groups: Dict[Hashable, List[int]] = {}
+        for index, row in enumerate(rows):
+            groups.setdefault(key(row), []).append(index)
+        count = min(self.workers, len(groups))
+        shards: List[List[int]] = [[] for _ in range(count)]
+        # (rows so far, shard) of every shard, smallest first
+        loads = [(0, number) for number in range(count)]
+        for members in sorted(groups.values(), key=len, reverse=True):
+            load, number = heapq.heappop(loads)
+            shards[number].extend(members)
+            heapq.heappush(loads, (load + len(members), number))
+        for members in shards:
+            members.sort()
+        return shards
+
+    def _run(
+        self,
+        rows: List[Dict[str, Any]],
+        key: Callable[[Dict[str, Any]], ShardKey],
+        raw: bool,
+        sink: ResultSink,
+        dry_run: bool,
+        upsert: bool,
+        preflight: bool,
+        retry: Optional[RetryPolicy],
+        progress: Optional[ProgressCallback],
+    ) -> BulkSummary:
+        summary = BulkSummary()
+        tracker = (
+            ProgressTracker(progress, summary, len(rows))
+            if progress is not None
+            else None
+        )
+        plan = self.shards(rows, key)
+        if retry is not None and plan:
+            retry = dataclasses.replace(retry, budget=-(-retry.budget // len(plan)))
+        options = {
+            "dry_run": dry_run,
+            "concurrency": self.concurrency,
+            "upsert": upsert,
+            "preflight": preflight,
+            "retry": retry,
+        }
+        shards = [
+            Shard(
+                number,
+                type(self.operations),
+                self.client_factory,
+                indices,
+                [rows[index] for index in indices],
+                raw,
+                options,
+            )
+            for number, indices in enumerate(plan)
+        ]
+
+        def emit(result: Dict[str, Any]) -> None:
+            summary.add(result)
+            # Retries were counted in the workers, each shows on its row
+            summary.retried += result.get("attempts", 1) - 1
+            sink(result)
+            if tracker is not None:
+                tracker.update()
+
+        context = multiprocessing.get_context()
+        results: Any = context.Queue()
+        processes = {
+            shard.number: context.Process(
+                target=_run_shard, args=(shard, results), daemon=True
+            )
+            for shard in shards
+        }
+        # Rows of each shard not back yet
+        pending = {shard.number: set(shard.indices) for shard in shards}
+        running = set(processes)
+        try:
+            for process in processes.values():
+                process.start()
+            while running:
+                try:
+                    kind, number, payload = results.get(timeout=WORKER_POLL)
+                except queue.Empty:
+                    for number in list(running):
+                        if not processes[number].is_alive():
+                            reason = f"exit code {processes[number].exitcode}"
+                            self._fail_rest(rows, pending[number], reason, emit)
+                            running.discard(number)
+                    continue
+                if kind == "results":
+                    for result in payload:
+                        pending[number].discard(result["index"])
+                        emit(result)
+                    continue
+                if kind == "failed":
+                    self._fail_rest(rows, pending[number], payload, emit)
+                running.discard(number)
+        finally:
+            for process in processes.values():
+                if process.is_alive() and running:
+                    process.terminate()
+                process.join()
+            results.close()
+        if tracker is not None:
+            tracker.finish()
+        return summary
+
+    def _fail_rest(
+        self,
+        rows: List[Dict[str, Any]],
+        pending: Set[int],
+        reason: str,
+        emit: ResultSink,
+    ) -> None:
+        """Fail the rows a worker never sent back."""
+        for index in sorted(pending):
+            emit(
+                self.operations._failed_result(
+                    index, rows[index], RuntimeError(f"Worker failed: {reason}")
+                )
+            )
+        pending.clear()
+
+
+def _client_factory(client: BaseClient) -> ClientFactory:
+    """Opens a Client to the same server, with the same login, as ``client``."""
+    return functools.partial(
+        Client,
+        hosts=list(client.hosts),
+        username=client.username,
+        password=client.password,
+        port=client.port,
+        conn_type=client.conn_type,
+        user_agent=client.user_agent,
+        timeout=client.timeout,
+        tls=client.tls,
+    )
+
+
+def _run_shard(shard: Shard, results: Any) -> None:
+    """Worker process body: run one shard, sending results back in batches."""
+    batch: List[Dict[str, Any]] = []
+    flushed = time.monotonic()
+    # Sheet position of each row handed to stream_from_data, in order
+    sent: List[int] = []
+
+    def flush() -> None:
+        nonlocal batch, flushed
+        if batch:
+            results.put(("results", shard.number, batch))
+            batch = []
+        flushed = time.monotonic()
+
+    def send(result: Dict[str, Any]) -> None:
+        result["index"] = sent[result["index"]]
+        batch.append(result)
+        if len(batch) >= RESULT_BATCH or time.monotonic() - flushed >= RESULT_LINGER:
+            flush()
+
+    try:
+        operations: BaseBulkOperations = shard.operations(shard.client_factory())
+
+        def prepare() -> Iterator[Dict[str, Any]]:
+            for index, row in zip(shard.indices, shard.rows):
+                if shard.raw:
+                    try:
+                        row = operations._process_row(row)
+                    except Exception as e:
+                        batch.append(operations._failed_result(index, row, e))
+                        continue
+                sent.append(index)
+                yield row
+
+        operations.stream_from_data(prepare(), send, **shard.options)
+        flush()
+    except Exception as e:
+        flush()
+        results.put(("failed", shard.number, str(e)))
+        return
+    results.put(("done", shard.number, None))
@@ -0,0 +1,90 @@
+"""
+Result sinks for streamed bulk jobs, results are written as rows finish
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import IO, Any, Callable, Dict, Optional, Union
+
+type ResultSink = Callable[[Dict[str, Any]], None]
+
+
+@dataclass(slots=True)
+class BulkSummary:
+    """Counts of a streamed bulk job, the results themselves went to the sink"""
+
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    # Rows a journal showed had already succeeded, not counted as succeeded
+    skipped: int = 0
+    # Times a row was sent again after a transient failure
+    retried: int = 0
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.total += 1
+        if result.get("skipped"):
+            self.skipped += 1
+        elif result.get("success"):
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "retried": self.retried,
+        }
+
+
+class JsonLinesSink:
+    """Writes each bulk result as one JSON line
+
+    The command object is left out, everything else is written as is with
+    anything that is not JSON written as its string form. Lines are in the
+    order rows finish, use ``index`` to match them to the sheet.
+
+    Args:
+        target (str | PathLike | IO): Path to write to, or an open text file.
+        flush_every (int, optional): Flush after this many lines. Defaults to 1000.
+
+    Example:
+        >>> with JsonLinesSink("results.jsonl") as sink:
+        ...     agent.bulk.users.stream_from_csv("users.csv", sink, concurrency=16)
+    """
+
+    def __init__(
+        self, target: Union[str, os.PathLike, IO[str]], flush_every: int = 1000
+    ) -> None:
+        self._owned = not hasattr(target, "write")
+        self._handle: IO[str] = (
+            open(target, "w", encoding="utf-8") if self._owned else target  # type: ignore[arg-type]
+        )
+        self.flush_every = flush_every
+        self.written = 0
+
+    def __call__(self, result: Dict[str, Any]) -> None:
+        record = {key: value for key, value in result.items() if key != "command"}
+        self._handle.write(
+            json.dumps(record, default=str, ensure_ascii=False, separators=(",", ":"))
+            + "\n"
+        )
+        self.written += 1
+        if self.written % self.flush_every == 0:
+            self._handle.flush()
+
+    def close(self) -> None:
+        if self._owned:
+            self._handle.close()
+        else:
+            self._handle.flush()
+
+    def __enter__(self) -> "JsonLinesSink":
+        return self
+
+    def __exit__(self, *exc_info: Optional[Any]) -> None:
+        self.close()
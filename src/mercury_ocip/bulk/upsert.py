@@ -0,0 +1,183 @@
+"""
+Diffs bulk rows against the current state of the entities they touch
+"""
+
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+from typing import get_type_hints
+
+from mercury_ocip.commands.base_command import ErrorResponse, OCICommand
+
+type StateKey = Tuple[str, Tuple[str, ...]]
+
+
+class UpsertState:
+    """Current state of the entities a sheet touches, fetched up front
+
+    An operation opts in with an ``upsert`` entry in its operation mapping:
+
+    - ``state``: the read that fetches current state. ``command`` is built from
+      the row fields named in ``scope``. With ``table`` and ``key`` each table row
+      is one entity, matched to rows on ``key``. With ``table`` and ``collect``
+      the table is one entity, each listed column gathered into a list at a
+      dotted row path. With neither the response itself is the entity.
+      ``state`` may also be a list of reads, a row uses the first whose scope
+      fields it has and, when the read lists ``fields``, whose other fields are
+      all among them.
+    - ``modify``: for creates, the operation to send instead when the entity
+      already exists.
+
+    One read is made per distinct scope, so a sheet of users in one group costs
+    a single ``UserGetListInGroupRequest``.
+
+    Args:
+        operation_mapping (Mapping[str, Dict[str, Any]]): The entity's operation mapping.
+        dispatch_table (Mapping[str, type]): The client's dispatch table.
+    """
+
+    def __init__(
+        self,
+        operation_mapping: Mapping[str, Dict[str, Any]],
+        dispatch_table: Mapping[str, type],
+    ) -> None:
+        self._mapping = operation_mapping
+        self._dispatch = dispatch_table
+        self._sources: Dict[StateKey, Dict[str, Any]] = {}
+        # Entity ID to its fields, None as the ID when the scope is the entity.
+        # Scopes whose read failed are missing, their rows are sent as they are.
+        self._state: Dict[StateKey, Dict[Optional[Hashable], Dict[str, Any]]] = {}
+
+    def requests(
+        self, rows: Iterable[Mapping[str, Any]]
+    ) -> List[Tuple[StateKey, OCICommand]]:
+        """The reads needed for ``rows``, one per distinct scope."""
+        requests: Dict[StateKey, OCICommand] = {}
+        for row in rows:
+            key = self._key(row)
+            if key is None or key in requests:
+                continue
+            source = self._sources[key]
+            command_class = self._dispatch.get(source["command"])
+            if command_class is None:
+                raise ValueError(
+                    f"Command {source['command']} not found in dispatch table"
+                )
+            requests[key] = command_class(**dict(zip(source["scope"], key[1])))
+        return list(requests.items())
+
+    def load(self, key: StateKey, response: Any) -> None:
+        """Store the response to one of `requests`, ignoring failed reads."""
+        if response is None or isinstance(response, (ErrorResponse, BaseException)):
+            return
+        source = self._sources[key]
+        if "table" not in source:
+            self._state[key] = {None: response.to_dict()}
+            return
+
+        table = getattr(response, source["table"], None) or []
+        rows = table.to_dict() if hasattr(table, "to_dict") else list(table)
+        if "key" in source:
+            self._state[key] = {row.get(source["key"]): row for row in rows}
+            return
+
+        entity: Dict[str, Any] = {}
+        for column, path in source["collect"].items():
+            *parents, last = path.split(".")
+            current = entity
+            for name in parents:
+                current = current.setdefault(name, {})
+            current[last] = [row.get(column) for row in rows]
+        self._state[key] = {None: entity}
+
+    def apply(self, row: Dict[str, Any]) -> bool:
+        """Cut ``row`` down to what still needs sending.
+
+        Creates of entities that already exist become modifies, keeping only the
+        fields the modify command has. Fields that match the current state are
+        removed. Rows whose state is unknown are left as they are.
+
+        Args:
+            row (Dict[str, Any]): A processed row, changed in place.
+
+        Returns:
+            bool: True when nothing has changed and the row can be skipped.
+        """
+        key = self._key(row)
+        if key is None:
+            return False
+        entities = self._state.get(key)
+        if entities is None:
+            return False
+        upsert = self._mapping[row["operation"]]["upsert"]
+        source = self._sources[key]
+        entity = entities.get(row.get(source["key"]) if "key" in source else None)
+        if entity is None:
+            # Not there yet, a create stays a create
+            return False
+        if "modify" in upsert and not self._to_modify(row, upsert["modify"]):
+            return False
+
+        identity = {"operation", source.get("key"), *source["scope"]}
+        changed = False
+        for name in list(row):
+            if name in identity:
+                continue
+            if name in entity and _normalise(row[name]) == _normalise(entity[name]):
+                del row[name]
+            else:
+                changed = True
+        return not changed
+
+    def _key(self, row: Mapping[str, Any]) -> Optional[StateKey]:
+        operation = row.get("operation")
+        if not isinstance(operation, str):
+            return None
+        upsert = self._mapping.get(operation, {}).get("upsert")
+        if not upsert:
+            return None
+        state = upsert["state"]
+        sources: List[Dict[str, Any]] = state if isinstance(state, list) else [state]
+        for source in sources:
+            key = _source_key(row, source)
+            if key is not None:
+                self._sources.setdefault(key, source)
+                return key
+        return None
+
+    def _to_modify(self, row: Dict[str, Any], operation: str) -> bool:
+        command_class = self._dispatch.get(self._mapping[operation]["command"])
+        if command_class is None:
+            return False
+        fields = get_type_hints(command_class)
+        for name in list(row):
+            if name != "operation" and name not in fields:
+                del row[name]
+        row["operation"] = operation
+        return True
+
+
+def _source_key(row: Mapping[str, Any], source: Dict[str, Any]) -> Optional[StateKey]:
+    """The read ``source`` makes for ``row``, None when it cannot answer the row."""
+    scope: List[str] = []
+    for name in source["scope"]:
+        value = row.get(name)
+        if not isinstance(value, str) or not value:
+            return None
+        scope.append(value)
+    if "fields" in source:
+        identity = {"operation", source.get("key"), *source["scope"]}
+        if any(name not in identity and name not in source["fields"] for name in row):
+            return None
+    return (source["command"], tuple(scope))
+
+
+def _normalise(value: Any) -> Any:
+    """Values as the server writes them, "true" for True and "5" for 5."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, dict):
+        return {name: _normalise(item) for name, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalise(item) for item in value]
+    return value
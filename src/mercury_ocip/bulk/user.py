@@ -8,6 +8,11 @@ class UserBulkOperations(BaseBulkOperations):
     This class is used to handle all bulk user operations.
 
     Inherits from BaseBulkOperations which contains client needed for the operations
+
+    Upserts of ``user.modify`` rows list each group's users once when the rows
+    carry ``service_provider_id`` and ``group_id``. The list only has names,
+    extension and email address, a row changing anything else, or without the
+    group columns, costs a ``UserGetRequest23V2`` of its own.
     """
 
     def __init__(self, client: BaseClient) -> None:
@@ -40,6 +45,16 @@ class UserBulkOperations(BaseBulkOperations):
                     "access_device_endpoint.port",
                     "access_device_endpoint.port_number",
                 ],
+                "checks": ["new_id", "free_dn", "free_extension", "existing_device"],
+                "upsert": {
+                    "state": {
+                        "command": "UserGetListInGroupRequest",
+                        "scope": ["service_provider_id", "group_id"],
+                        "table": "user_table",
+                        "key": "user_id",
+                    },
+                    "modify": "user.modify",
+                },
             },
             "user.modify": {
                 "command": "UserConsolidatedModifyRequest22",
@@ -50,5 +65,25 @@ class UserBulkOperations(BaseBulkOperations):
                         }
                     }
                 },
+                "lookup": ["service_provider_id", "group_id"],
+                "upsert": {
+                    "state": [
+                        {
+                            "command": "UserGetListInGroupRequest",
+                            "scope": ["service_provider_id", "group_id"],
+                            "table": "user_table",
+                            "key": "user_id",
+                            "fields": [
+                                "last_name",
+                                "first_name",
+                                "hiragana_last_name",
+                                "hiragana_first_name",
+                                "extension",
+                                "email_address",
+                            ],
+                        },
+                        {"command": "UserGetRequest23V2", "scope": ["user_id"]},
+                    ],
+                },
             },
         }
@@ -0,0 +1,337 @@
+"""
+Read-through response cache for Get requests
+"""
+
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from mercury_ocip.commands.base_command import ErrorResponse, OCICommand
+from mercury_ocip.utils.defines import is_read_command
+from mercury_ocip.utils.parser import Parser
+
+# Fields linking a request to the entity it reads or changes
+ENTITY_FIELDS: Tuple[str, ...] = ("user_id", "service_user_id", "group_id")
+
+# Never cached and never invalidate, they only manage the session
+SESSION_COMMANDS = frozenset(
+    {"AuthenticationRequest", "LoginRequest14sp4", "LoginRequest22V5", "LogoutRequest"}
+)
+
+
+def command_key(command: OCICommand) -> str:
+    """Canonical key for a command: its class name plus a hash of its field values.
+
+    Two instances built with the same values produce the same key however their
+    fields were set.
+    """
+    payload = json.dumps(
+        Parser.to_dict_from_class(command),
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{command.__class__.__name__}:{digest}"
+
+
+def command_tags(command: OCICommand) -> FrozenSet[str]:
+    """Entity tags for a command, e.g. ``{"user_id=jdoe@example.com"}``."""
+    tags = set()
+    for name in ENTITY_FIELDS:
+        value = getattr(command, name, None)
+        if isinstance(value, str) and value:
+            tags.add(f"{name}={value}")
+    return frozenset(tags)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Counters for a ResponseCache.
+
+    Attributes:
+        hits: Reads answered from the cache.
+        misses: Reads that went to the server.
+        stores: Responses written to the cache.
+        invalidations: Entries dropped because a write touched the same entity.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+class CacheBackend(ABC):
+    """Storage for cached responses.
+
+    Backends handle expiry and size limits, ResponseCache decides what is stored.
+
+    Args:
+        max_entries (int): Least recently used entries are evicted beyond this.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored value, or None when missing or expired."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, tags: Iterable[str], ttl: float) -> None:
+        """Store a value for ``ttl`` seconds under the given entity tags."""
+        pass
+
+    @abstractmethod
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of the tags. Returns how many were dropped."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU backend. The default."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        super().__init__(max_entries=max_entries)
+        self._entries: OrderedDict[str, Tuple[float, Any, FrozenSet[str]]] = (
+            OrderedDict()
+        )
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, tags: Iterable[str], ttl: float) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            tags = frozenset(tags)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tags.get(tag, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """SQLite backend, lets several processes share one cache file.
+
+    Responses are pickled. Expiry uses wall clock time so it holds across processes.
+
+    Args:
+        path (str): Database file, created if missing.
+        max_entries (int): Least recently used entries are evicted beyond this.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10_000) -> None:
+        super().__init__(max_entries=max_entries)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB, expires_at REAL, last_used REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tags (tag TEXT, key TEXT, PRIMARY KEY (tag, key))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS tags_key ON tags (key)")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)"
+            )
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._delete(key)
+                return None
+            self._conn.execute(
+                "UPDATE entries SET last_used = ? WHERE key = ?", (now, key)
+            )
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value: Any, tags: Iterable[str], ttl: float) -> None:
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._conn:
+            self._delete(key)
+            self._conn.execute(
+                "INSERT INTO entries (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, blob, now + ttl, now),
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tags (tag, key) VALUES (?, ?)",
+                [(tag, key) for tag in tags],
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            if count > self.max_entries:
+                evicted = self._conn.execute(
+                    "SELECT key FROM entries ORDER BY last_used, rowid LIMIT ?",
+                    (count - self.max_entries,),
+                ).fetchall()
+                for (evict_key,) in evicted:
+                    self._delete(evict_key)
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        if not tags:
+            return 0
+        placeholders = ",".join("?" * len(tags))
+        with self._lock, self._conn:
+            keys = self._conn.execute(
+                f"SELECT DISTINCT key FROM tags WHERE tag IN ({placeholders})", tags
+            ).fetchall()
+            for (key,) in keys:
+                self._delete(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM tags")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        return count
+
+    def _delete(self, key: str) -> None:
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._conn.execute("DELETE FROM tags WHERE key = ?", (key,))
+
+
+@dataclass(slots=True)
+class ResponseCache:
+    """Read-through cache placed around ``client.command``.
+
+    Responses to ``*Get*Request`` commands are cached by command class and field
+    values. Any other command carrying a ``user_id``, ``service_user_id`` or
+    ``group_id`` drops the cached reads for the same entity once it completes.
+    Writes without any of those fields are not tracked, they age out with ``ttl``
+    or can be cleared with ``invalidate``/``clear``.
+
+    Cached responses are shared between callers, treat them as read only.
+
+    Args:
+        backend (CacheBackend): Where entries are kept. In memory by default.
+        ttl (float): Seconds a response stays valid.
+    """
+
+    backend: CacheBackend = field(default_factory=MemoryCacheBackend)
+    ttl: float = 300.0
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    def get(self, command: OCICommand) -> Optional[Any]:
+        """Return the cached response for a read, or None."""
+        if not self._cacheable(command):
+            return None
+        response = self.backend.get(command_key(command))
+        if response is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return response
+
+    def update(self, command: OCICommand, response: Any) -> None:
+        """Store a read's response, or invalidate what a write touched."""
+        name = command.__class__.__name__
+        if name in SESSION_COMMANDS:
+            return
+        if self._cacheable(command):
+            if response is None or isinstance(response, ErrorResponse):
+                return
+            self.backend.set(
+                command_key(command), response, command_tags(command), self.ttl
+            )
+            self.stats.stores += 1
+        else:
+            self.invalidate(command_tags(command))
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop entries for the given tags, e.g. ``["group_id=Sales"]``."""
+        dropped = self.backend.invalidate(tags)
+        self.stats.invalidations += dropped
+        return dropped
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    @staticmethod
+    def _cacheable(command: OCICommand) -> bool:
+        name = command.__class__.__name__
+        return name not in SESSION_COMMANDS and is_read_command(name)
@@ -2,8 +2,9 @@ import attr
 import sys
 import logging
 import hashlib
+import time
 import uuid
-from typing import Awaitable, Dict, Type, Union
+from typing import Any, Awaitable, Dict, List, Optional, Set, Tuple, Type, Union, cast
 import inspect
 from abc import ABC, abstractmethod
 import importlib
@@ -21,10 +22,30 @@ from mercury_ocip.requester import (
     AsyncTCPRequester,
     AsyncSOAPRequester,
 )
-from mercury_ocip.exceptions import MError
+from mercury_ocip.exceptions import (
+    MError,
+    MErrorDeadlineExceeded,
+    MErrorSocketTimeout,
+)
+from mercury_ocip.failover import HostSelector, is_retryable
+from mercury_ocip.limiter import Outcome, classify
 from mercury_ocip.utils.parser import Parser, AsyncParser
+from mercury_ocip.utils.interning import InternTable
+from mercury_ocip.cache import ResponseCache, command_key
+from mercury_ocip.single_flight import SingleFlight
+from mercury_ocip.timeouts import TimeoutPolicy, remaining
+from mercury_ocip.middleware import (
+    Middleware,
+    AsyncMiddleware,
+    is_async_middleware,
+    run_chain,
+    run_chain_async,
+)
+from mercury_ocip.utils.defines import VersionIndex, is_read_command
+from mercury_ocip.utils.parser import OCI_ENCODING
+from mercury_ocip.utils.raw_response import RawResponse
 from mercury_ocip.libs.types import (
-    RequestResult,
+    RawRequestResult,
     XMLDictResult,
     CommandInput,
     CommandResult,
@@ -36,7 +57,8 @@ type ClientResult = Union[None, BWKSCommand]  # Inlined To Prevent Circular Defi
 @attr.s(slots=True, kw_only=True)
 class BaseClient(ABC):
     """Base class for all clients
-    - Host: The host of the server
+    - Host: The host of the server, defaults to the first of hosts
+    - Hosts: Optional hosts to fail over between in order, host is tried first
     - Username: The username of the user
     - Password: The password of the user
     - Conn_type: The type of connection to the server
@@ -46,9 +68,14 @@ class BaseClient(ABC):
     - Authenticated: Whether the client is authenticated
     - Session_id: The session id of the client
     - Dispatch_table: The dispatch table of the client
+    - Intern_table: Optional table sharing repeated response values across every decode
+    - Cache: Optional read-through cache for Get requests, invalidated by writes
+    - Coalescing: Optional sharing of identical in-flight Get requests, AsyncClient only
+    - Middleware: Ordered callables wrapped around every command, empty by default
+    - Timeouts: Optional per command timeouts learned from latency, with overrides
     """
 
-    host: str = attr.ib()
+    host: str = attr.ib(default="")
     username: str = attr.ib()
     password: str = attr.ib()
     port: int = attr.ib(default=2209)
@@ -59,9 +86,17 @@ class BaseClient(ABC):
     authenticated: bool = attr.ib(default=False)
     session_id: str = attr.ib(default=str(uuid.uuid4()))
     tls: bool = attr.ib(default=True)
+    intern_table: Optional[InternTable] = attr.ib(default=None)
+    cache: Optional[ResponseCache] = attr.ib(default=None)
+    coalescing: Optional[SingleFlight] = attr.ib(default=None)
+    middleware: List[Union[Middleware, AsyncMiddleware]] = attr.ib(factory=list)
+    timeouts: Optional[TimeoutPolicy] = attr.ib(default=None)
+    hosts: List[str] = attr.ib(factory=list)
 
     _dispatch_table: Dict[str, Type[BWKSCommand]] = attr.ib(default=None)
     _type_table: Dict[str, Type[BWKSType]] = attr.ib(default=None)
+    _version_index: Optional[VersionIndex] = attr.ib(default=None)
+    _host_selector: Optional[HostSelector] = attr.ib(default=None)
     _requester: BaseRequester = attr.ib(default=None)
 
     def __attrs_post_init__(self):
@@ -70,10 +105,29 @@ class BaseClient(ABC):
                 f"conn_type must be 'TCP' or 'SOAP', got '{self.conn_type}'"
             )
 
+        self.middleware = list(self.middleware)
+        for middleware in self.middleware:
+            self._check_middleware(middleware)
+
+        self.hosts = list(self.hosts)
+        if not self.host:
+            if not self.hosts:
+                raise ValueError("host or hosts is required")
+            self.host = self.hosts[0]
+        elif self.host not in self.hosts:
+            self.hosts.insert(0, self.host)
+        if len(self.hosts) > 1:
+            self._host_selector = HostSelector(self.hosts)
+
         self._set_up_dispatch_table()
         self.logger = self.logger or self._set_up_logging()
         self.plugins: list[importlib.ModuleType] = []
-        self._requester = create_requester(
+        self._requester = self._create_requester()
+        if not self.async_mode:
+            self.authenticate()
+
+    def _create_requester(self) -> BaseRequester:
+        return create_requester(
             conn_type=self.conn_type,
             async_=self.async_mode,
             host=self.host,
@@ -83,8 +137,68 @@ class BaseClient(ABC):
             session_id=self.session_id,
             tls=self.tls,
         )
-        if not self.async_mode:
-            self.authenticate()
+
+    def _choose_host(self, error: MError, read: bool, tried: Set[str]) -> Optional[str]:
+        """
+        Picks the host to move to after a failure another host could fix.
+
+        Returns:
+            Optional[str]: None when there is no other host, or the command must not move
+        """
+        if self._host_selector is None:
+            return None
+        if isinstance(error, MErrorDeadlineExceeded):
+            # Never sent, the host neither failed nor answered
+            self._host_selector.abandon(self.host)
+            return None
+        # Record the failure even when the command stays, it settles any probe
+        self._host_selector.record(self.host, classify(error=error))
+        if not is_retryable(error, read):
+            return None
+        host = self._host_selector.choose(exclude=tried)
+        if host is None:
+            return None
+        tried.add(host)
+        self.logger.warning(f"{self.host} failed ({error}), moving to {host}")
+        return host
+
+    def _move_to(self, host: str) -> None:
+        """Points the client at ``host``, the old requester must be disconnected first"""
+        self.host = host
+        self.authenticated = False
+        self._requester = self._create_requester()
+
+    def _abandon_host(self) -> None:
+        """Frees the current host's half open probe when a request to it was given up"""
+        if self._host_selector is not None:
+            self._host_selector.abandon(self.host)
+
+    def _request_timeout(self, name: str) -> Optional[float]:
+        """
+        Timeout for one request, from the timeout policy and the current deadline.
+
+        Returns:
+            float: Seconds the request may take, None to keep the requester's own
+        """
+        left = remaining()
+        if self.timeouts is None:
+            return left
+        timeout = self.timeouts.timeout_for(name, self.timeout)
+        return timeout if left is None else min(timeout, left)
+
+    def _observe_latency(
+        self, name: str, response: RawRequestResult, latency: float, timeout: float
+    ) -> None:
+        """Feeds a request's latency into the timeout policy"""
+        if self.timeouts is None:
+            return
+        if isinstance(response, MErrorSocketTimeout):
+            # Only a timeout the policy chose says the command needs longer
+            left = remaining()
+            if left is None or left > 0:
+                self.timeouts.observe(name, timeout, timed_out=True)
+        elif not isinstance(response, MError):
+            self.timeouts.observe(name, latency)
 
     @property
     @abstractmethod
@@ -106,6 +220,20 @@ class BaseClient(ABC):
         """Executes raw command specified by end user - instantiates class command"""
         pass
 
+    @abstractmethod
+    def command_latest(
+        self, command: str, **kwargs: Any
+    ) -> Union[CommandResult, Awaitable[CommandResult]]:
+        """Executes the newest defined version of a command"""
+        pass
+
+    @abstractmethod
+    def raw_xml(
+        self, command_xml: Union[str, bytes], view: bool = False
+    ) -> Union[bytes, RawResponse, Awaitable[Union[bytes, RawResponse]]]:
+        """Sends a serialised command element and returns the response undecoded"""
+        pass
+
     @abstractmethod
     def authenticate(
         self,
@@ -115,7 +243,7 @@ class BaseClient(ABC):
 
     @abstractmethod
     def _receive_response(
-        self, response: RequestResult
+        self, response: RawRequestResult
     ) -> Union[CommandResult, Awaitable[CommandResult]]:
         """Receives response from requester and returns BWKSCommand"""
         pass
@@ -127,6 +255,30 @@ class BaseClient(ABC):
         """
         pass
 
+    def use(self, middleware: Union[Middleware, AsyncMiddleware]) -> None:
+        """
+        Appends a middleware to the end of the chain.
+
+        Middleware is called as ``middleware(command, payload, call_next)`` where payload
+        is the serialized request and ``call_next(command, payload)`` runs the rest of the
+        chain. Async clients take coroutine functions, sync clients plain functions.
+
+        Args:
+            middleware (Callable): The middleware to add
+
+        Raises:
+            TypeError: If the middleware does not match the client's mode
+        """
+        self._check_middleware(middleware)
+        self.middleware.append(middleware)
+
+    def _check_middleware(self, middleware: Any) -> None:
+        if is_async_middleware(middleware) != self.async_mode:
+            kind = "a coroutine function" if self.async_mode else "a plain function"
+            raise TypeError(
+                f"{self.__class__.__name__} middleware must be {kind}, got {middleware!r}"
+            )
+
     def _set_up_dispatch_table(self):
         """Set up the dispatch table for the client"""
         self._dispatch_table = {}
@@ -140,6 +292,69 @@ class BaseClient(ABC):
         for cls in [BWKSErrorResponse, BWKSSucessResponse]:
             self._dispatch_table[cls.__name__] = cls
 
+        self._version_index = VersionIndex(self._dispatch_table)
+
+    def resolve(
+        self, command: str, max_release: Optional[Union[str, int]] = None
+    ) -> Type[BWKSCommand]:
+        """
+        Returns the newest version of a command the target release supports.
+
+        Args:
+            command (str): Base or versioned name, e.g. "UserGetRequest"
+            max_release (Union[str, int], optional): Application Server release, e.g. "22" or "21sp1".
+                The newest defined version when omitted.
+
+        Returns:
+            Type[BWKSCommand]: The resolved command class
+
+        Raises:
+            ValueError: If no version of the command fits
+        """
+        assert self._version_index is not None
+        try:
+            name = self._version_index.resolve(command, max_release)
+        except ValueError:
+            name = None
+        if name is None:
+            self.logger.error(f"Command {command} not found in dispatch table")
+            raise ValueError(f"Command {command} not found in dispatch table")
+        return self._dispatch_table[name]
+
+    def _command_class(self, command: str) -> Type[BWKSCommand]:
+        """Exact class for a name, falling back to the newest version of a base name"""
+        command_class = self._dispatch_table.get(command)
+        if command_class is not None:
+            return command_class
+        return self.resolve(command)
+
+    def _receive_raw(
+        self, response: RawRequestResult, view: bool
+    ) -> Union[bytes, RawResponse]:
+        """Returns the response document as bytes without decoding it"""
+        if isinstance(response, MError):
+            raise response
+
+        # SOAP transports hand back text, bring it in line with TCP
+        if isinstance(response, str):
+            response = response.encode(OCI_ENCODING, errors="xmlcharrefreplace")
+
+        return RawResponse(response) if view else response
+
+    @staticmethod
+    def _raw_payload(command_xml: Union[str, bytes]) -> Tuple[bytes, str]:
+        """The encoded command and its type name, used for its timeout and failover"""
+        if isinstance(command_xml, str):
+            command_xml = command_xml.encode(OCI_ENCODING, errors="xmlcharrefreplace")
+        # The byte scan finds a request's type the same way as a response's
+        return command_xml, RawResponse(command_xml).type_name or ""
+
+    def _parse_options(self) -> Dict[str, Any]:
+        """Options forwarded to the response decoder"""
+        if self.intern_table is None:
+            return {}
+        return {"intern_table": self.intern_table}
+
     def _set_up_logging(self):
         """Common logging setup for all clients"""
         logger = logging.getLogger(__name__)
@@ -192,19 +407,108 @@ class Client(BaseClient):
         Returns:
             BWKSCommand: The response from the server
         """
+        if self.cache is not None and (cached := self.cache.get(command)) is not None:
+            self.logger.info(f"Cache hit: {command.__class__.__name__}")
+            return cached
         if not self.authenticated:
             self.authenticate()
         self.logger.info(f"Executing command: {command.__class__.__name__}")
-        self.logger.debug(f"Command: {command.to_dict()}")
-        response = self._requester.send_request(command.to_xml())
-        return self._receive_response(response)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Command: {command.to_dict()}")
+        payload = command.to_xml_bytes()
+        if self.middleware:
+            # _check_middleware only lets sync middleware onto a sync client
+            chain = cast(List[Middleware], self.middleware)
+            result = run_chain(chain, command, payload, self._send)
+        elif self._host_selector is not None:
+            result = self._send(command, payload)
+        else:
+            name = command.__class__.__name__
+            result = self._receive_response(self._send_bytes(name, payload))
+        if self.cache is not None:
+            self.cache.update(command, result)
+        return result
+
+    def _send(self, command: CommandInput, payload: bytes) -> CommandResult:
+        """End of the middleware chain, sends the payload and decodes the response"""
+        return self._receive_response(
+            self._deliver(command.__class__.__name__, payload)
+        )
+
+    def _deliver(self, name: str, payload: bytes) -> RawRequestResult:
+        """Sends the payload, moving to another host when this one fails"""
+        response = self._send_bytes(name, payload)
+        if (
+            isinstance(response, MError)
+            and not isinstance(response, MErrorDeadlineExceeded)
+            and self._host_selector is not None
+        ):
+            response = self._fail_over(name, payload, response)
+        return response
+
+    def _send_bytes(self, name: str, payload: bytes) -> RawRequestResult:
+        """Sends a payload with the timeout for command ``name``, bounded by any deadline"""
+        timeout = self._request_timeout(name)
+        if timeout is None:
+            response = self._requester.send_request_bytes(payload)
+        elif timeout <= 0:
+            return MErrorDeadlineExceeded(f"Deadline passed before {name} was sent")
+        else:
+            started = time.monotonic()
+            response = self._requester.send_request_bytes(payload, timeout)
+            self._observe_latency(name, response, time.monotonic() - started, timeout)
+        if isinstance(response, MErrorSocketTimeout):
+            # The requester dropped the connection and the session went with it
+            self.authenticated = False
+        return response
+
+    def _next_host(self, error: MError, read: bool, tried: Set[str]) -> bool:
+        """
+        Moves the client to the next host after a failure another host could fix.
+
+        The new host needs logging in to before anything is sent to it.
+
+        Returns:
+            bool: False when there is no other host, or the command must not move
+        """
+        host = self._choose_host(error, read, tried)
+        if host is None:
+            return False
+        self._requester.disconnect()
+        self._move_to(host)
+        return True
+
+    def _fail_over(self, name: str, payload: bytes, error: MError) -> RawRequestResult:
+        """Sends the payload to each remaining host until one answers"""
+        assert self._host_selector is not None
+        read = is_read_command(name)
+        tried = {self.host}
+        response: RawRequestResult = error
+        settled = False
+        try:
+            while isinstance(response, MError) and self._next_host(
+                response, read, tried
+            ):
+                try:
+                    self._login()
+                except MError as e:
+                    response = e
+                    continue
+                response = self._send_bytes(name, payload)
+            settled = True
+        finally:
+            if not settled:
+                self._abandon_host()
+        if not isinstance(response, MError):
+            self._host_selector.record(self.host, Outcome.SUCCESS)
+        return response
 
     def raw_command(self, command: str, **kwargs: str) -> CommandResult:
         """
         Executes raw command specified by end user - instantiates class command.
 
         Args:
-            command (str): The command to execute
+            command (str): The command to execute, a base name without a version runs the newest version
             **kwargs: The arguments to pass to the command
 
         Returns:
@@ -213,15 +517,51 @@ class Client(BaseClient):
         Raises:
             ValueError: If the command is not found in the dispatch table
         """
-        command_class = self._dispatch_table.get(command)
-        if not command_class:
-            self.logger.error(f"Command {command} not found in dispatch table")
-            raise ValueError(f"Command {command} not found in dispatch table")
+        command_class = self._command_class(command)
         return self.command(command_class(**kwargs))
 
+    def command_latest(self, command: str, **kwargs: Any) -> CommandResult:
+        """
+        Executes the newest defined version of a command.
+
+        Args:
+            command (str): The base command name, e.g. "UserGetRequest"
+            **kwargs: The arguments to pass to the command
+
+        Returns:
+            BWKSCommand: The response from the server
+
+        Raises:
+            ValueError: If no version of the command is defined
+        """
+        return self.command(self.resolve(command)(**kwargs))
+
+    def raw_xml(
+        self, command_xml: Union[str, bytes], view: bool = False
+    ) -> Union[bytes, RawResponse]:
+        """
+        Sends an already serialised command and returns the response as received.
+
+        The command is framed with the client's session and sent as is. The response is
+        never parsed, so this suits relays and callers that only need one field.
+
+        Args:
+            command_xml (Union[str, bytes]): The <command> element to send
+            view (bool): Return a RawResponse exposing the type name and error summary
+
+        Returns:
+            Union[bytes, RawResponse]: The response document from the server
+        """
+        if not self.authenticated:
+            self.authenticate()
+        self.logger.info("Executing raw XML command")
+        payload, name = self._raw_payload(command_xml)
+        return self._receive_raw(self._deliver(name, payload), view)
+
     def authenticate(self) -> CommandResult:
         """
         Authenticates client with username and password in client.
+        With several hosts, moves on to the next one when a host cannot be reached.
 
         Note: Directly send request to requester to avoid double authentication
 
@@ -235,6 +575,17 @@ class Client(BaseClient):
         if self.authenticated:
             return
 
+        tried = {self.host}
+        while True:
+            try:
+                return self._login()
+            except MError as e:
+                if not self._next_host(e, True, tried):
+                    raise
+
+    def _login(self) -> CommandResult:
+        """Logs in to the current host"""
+
         if self.session_id == "":
             self.session_id = str(uuid.uuid4())
 
@@ -250,8 +601,8 @@ class Client(BaseClient):
                 raise ValueError("AuthenticationRequest not found in dispatch table")
 
             auth_resp = self._receive_response(
-                self._requester.send_request(
-                    auth_request(user_id=self.username).to_xml()
+                self._requester.send_request_bytes(
+                    auth_request(user_id=self.username).to_xml_bytes()
                 )
             )
 
@@ -274,7 +625,7 @@ class Client(BaseClient):
             )
 
         login_resp = self._receive_response(
-            self._requester.send_request(request.to_xml())
+            self._requester.send_request_bytes(request.to_xml_bytes())
         )
 
         if isinstance(login_resp, BWKSErrorResponse):
@@ -284,14 +635,16 @@ class Client(BaseClient):
         self.authenticated = True
         return login_resp
 
-    def _receive_response(self, response: RequestResult) -> CommandResult:
+    def _receive_response(self, response: RawRequestResult) -> CommandResult:
         """Receives response from requester and returns BWKSCommand"""
 
         if isinstance(response, MError):
             raise response
 
-        # Extract Typename From Raw Response
-        response_dict: XMLDictResult = Parser.to_dict_from_xml(response)
+        # Decode Once, The Typename And The Response Class Both Come From This
+        response_dict: XMLDictResult = Parser.to_dict_from_xml(
+            response, **self._parse_options()
+        )
 
         # Check if response_dict is a dict before accessing
         if not isinstance(response_dict, dict):
@@ -321,8 +674,8 @@ class Client(BaseClient):
         if not response_class:
             raise MError(f"Failed To Find Raw Response Type: {type_name}")
 
-        # Construct Response Class With Raw Response
-        return response_class.from_xml(response)  # type: ignore
+        # Construct Response Class With Decoded Response
+        return response_class.from_dict(response_dict)  # type: ignore
 
     def disconnect(self):
         """Disconnects from the server
@@ -357,6 +710,8 @@ class AsyncClient(BaseClient):
         authenticated (bool): Whether the client is authenticated
         session_id (str): The session id of the client
         _dispatch_table (dict): The dispatch table of the client
+        coalescing (SingleFlight): Shares identical in-flight Get requests when set, off by default.
+            Every caller sharing a request gets the same response object.
 
     Raises:
         Exception: If the client fails to authenticate
@@ -387,19 +742,121 @@ class AsyncClient(BaseClient):
             BWKSCommand: The response from the server
         """
 
+        if self.cache is not None and (cached := self.cache.get(command)) is not None:
+            self.logger.info(f"Cache hit: {command.__class__.__name__}")
+            return cached
+
+        # Identical reads already on the wire are awaited rather than sent again,
+        # each caller gets the same response object
+        if self.coalescing is not None and is_read_command(command.__class__.__name__):
+            return await self.coalescing.do(
+                command_key(command), lambda: self._execute(command)
+            )
+        return await self._execute(command)
+
+    async def _execute(self, command: CommandInput) -> CommandResult:
+        """Sends the command and decodes the response"""
         if not self.authenticated:
             await self.authenticate()
         self.logger.info(f"Executing command: {command.__class__.__name__}")
-        self.logger.debug(f"Command: {await command.to_dict_async()}")
-        response = await self._requester.send_request(await command.to_xml_async())
-        return await self._receive_response(response)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Command: {await command.to_dict_async()}")
+        payload = await command.to_xml_bytes_async()
+        if self.middleware:
+            # _check_middleware only lets async middleware onto an async client
+            chain = cast(List[AsyncMiddleware], self.middleware)
+            result = await run_chain_async(chain, command, payload, self._send)
+        elif self._host_selector is not None:
+            result = await self._send(command, payload)
+        else:
+            name = command.__class__.__name__
+            result = await self._receive_response(await self._send_bytes(name, payload))
+        if self.cache is not None:
+            self.cache.update(command, result)
+        return result
+
+    async def _send(self, command: CommandInput, payload: bytes) -> CommandResult:
+        """End of the middleware chain, sends the payload and decodes the response"""
+        return await self._receive_response(
+            await self._deliver(command.__class__.__name__, payload)
+        )
+
+    async def _deliver(self, name: str, payload: bytes) -> RawRequestResult:
+        """Sends the payload, moving to another host when this one fails"""
+        response = await self._send_bytes(name, payload)
+        if (
+            isinstance(response, MError)
+            and not isinstance(response, MErrorDeadlineExceeded)
+            and self._host_selector is not None
+        ):
+            response = await self._fail_over(name, payload, response)
+        return response
+
+    async def _send_bytes(self, name: str, payload: bytes) -> RawRequestResult:
+        """Sends a payload with the timeout for command ``name``, bounded by any deadline"""
+        timeout = self._request_timeout(name)
+        if timeout is None:
+            response = await self._requester.send_request_bytes(payload)
+        elif timeout <= 0:
+            return MErrorDeadlineExceeded(f"Deadline passed before {name} was sent")
+        else:
+            started = time.monotonic()
+            response = await self._requester.send_request_bytes(payload, timeout)
+            self._observe_latency(name, response, time.monotonic() - started, timeout)
+        if isinstance(response, MErrorSocketTimeout):
+            # The requester dropped the connection and the session went with it
+            self.authenticated = False
+        return response
+
+    async def _next_host(self, error: MError, read: bool, tried: Set[str]) -> bool:
+        """
+        Moves the client to the next host after a failure another host could fix.
+
+        The new host needs logging in to before anything is sent to it.
+
+        Returns:
+            bool: False when there is no other host, or the command must not move
+        """
+        host = self._choose_host(error, read, tried)
+        if host is None:
+            return False
+        await self._requester.disconnect()
+        self._move_to(host)
+        return True
+
+    async def _fail_over(
+        self, name: str, payload: bytes, error: MError
+    ) -> RawRequestResult:
+        """Sends the payload to each remaining host until one answers"""
+        assert self._host_selector is not None
+        read = is_read_command(name)
+        tried = {self.host}
+        response: RawRequestResult = error
+        settled = False
+        try:
+            while isinstance(response, MError) and await self._next_host(
+                response, read, tried
+            ):
+                try:
+                    await self._login()
+                except MError as e:
+                    response = e
+                    continue
+                response = await self._send_bytes(name, payload)
+            settled = True
+        finally:
+            if not settled:
+                self._abandon_host()
+        if not isinstance(response, MError):
+            self._host_selector.record(self.host, Outcome.SUCCESS)
+        return response
 
     async def raw_command(self, command: str, **kwargs: str) -> CommandResult:
         """
         Executes raw command specified by end user - instantiates class command.
 
         Args:
-            command (str): The command to execute
+            command (str): The command to execute, a base name without a version runs the newest version
             **kwargs: The arguments to pass to the command
 
         Returns:
@@ -408,16 +865,52 @@ class AsyncClient(BaseClient):
         Raises:
             ValueError: If the command is not found in the dispatch table
         """
-        command_class = self._dispatch_table.get(command)
-        if not command_class:
-            self.logger.error(f"Command {command} not found in dispatch table")
-            raise ValueError(f"Command {command} not found in dispatch table")
+        command_class = self._command_class(command)
         response = await self.command(command_class(**kwargs))
         return response
 
+    async def command_latest(self, command: str, **kwargs: Any) -> CommandResult:
+        """
+        Executes the newest defined version of a command.
+
+        Args:
+            command (str): The base command name, e.g. "UserGetRequest"
+            **kwargs: The arguments to pass to the command
+
+        Returns:
+            BWKSCommand: The response from the server
+
+        Raises:
+            ValueError: If no version of the command is defined
+        """
+        return await self.command(self.resolve(command)(**kwargs))
+
+    async def raw_xml(
+        self, command_xml: Union[str, bytes], view: bool = False
+    ) -> Union[bytes, RawResponse]:
+        """
+        Sends an already serialised command and returns the response as received.
+
+        The command is framed with the client's session and sent as is. The response is
+        never parsed, so this suits relays and callers that only need one field.
+
+        Args:
+            command_xml (Union[str, bytes]): The <command> element to send
+            view (bool): Return a RawResponse exposing the type name and error summary
+
+        Returns:
+            Union[bytes, RawResponse]: The response document from the server
+        """
+        if not self.authenticated:
+            await self.authenticate()
+        self.logger.info("Executing raw XML command")
+        payload, name = self._raw_payload(command_xml)
+        return self._receive_raw(await self._deliver(name, payload), view)
+
     async def authenticate(self) -> CommandResult:
         """
         Authenticates client with username and password in client.
+        With several hosts, moves on to the next one when a host cannot be reached.
 
         Note: Directly send request to requester to avoid double authentication
 
@@ -431,6 +924,17 @@ class AsyncClient(BaseClient):
         if self.authenticated:
             return
 
+        tried = {self.host}
+        while True:
+            try:
+                return await self._login()
+            except MError as e:
+                if not await self._next_host(e, True, tried):
+                    raise
+
+    async def _login(self) -> CommandResult:
+        """Logs in to the current host"""
+
         if self.session_id == "":
             self.session_id = str(uuid.uuid4())
 
@@ -448,8 +952,8 @@ class AsyncClient(BaseClient):
                 raise ValueError("AuthenticationRequest not found in dispatch table")
 
             auth_resp: BWKSCommand | None = await self._receive_response(
-                await self._requester.send_request(
-                    await auth_request(user_id=self.username).to_xml_async()
+                await self._requester.send_request_bytes(
+                    await auth_request(user_id=self.username).to_xml_bytes_async()
                 )
             )
 
@@ -472,7 +976,7 @@ class AsyncClient(BaseClient):
             )
 
         login_resp = await self._receive_response(
-            await self._requester.send_request(await request.to_xml_async())
+            await self._requester.send_request_bytes(await request.to_xml_bytes_async())
         )
 
         if isinstance(login_resp, BWKSErrorResponse):
@@ -482,13 +986,15 @@ class AsyncClient(BaseClient):
         self.authenticated = True
         return login_resp
 
-    async def _receive_response(self, response: RequestResult) -> CommandResult:
+    async def _receive_response(self, response: RawRequestResult) -> CommandResult:
         """Receives response from requester and returns BWKSCommand"""
 
         if isinstance(response, MError):
             raise response
 
-        response_dict: XMLDictResult = await AsyncParser.to_dict_from_xml(response)
+        response_dict: XMLDictResult = await AsyncParser.to_dict_from_xml(
+            response, **self._parse_options()
+        )
 
         # Check if response_dict is a dict before accessing
         if not isinstance(response_dict, dict):
@@ -519,8 +1025,13 @@ class AsyncClient(BaseClient):
         if not response_class:
             raise MError(f"Failed To Find Raw Response Type: {type_name}")
 
-        # Construct Response Class With Raw Response
-        return await response_class.from_xml_async(response)  # type: ignore
+        # Construct Response Class With Decoded Response, Sized By The Raw Document
+        # Never In A Process, Pickling The Dict There Costs As Much As Converting It
+        return await AsyncParser.to_class_from_dict(
+            response_dict,  # type: ignore
+            response_class,
+            source=response,
+        )
 
     async def disconnect(self) -> None:
         """Disconnects from the server
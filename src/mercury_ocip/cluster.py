@@ -0,0 +1,198 @@
+"""
+Routing commands to separate BroadWorks clusters by service provider
+"""
+
+import asyncio
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from mercury_ocip.exceptions import MErrorNoRoute
+from mercury_ocip.lanes import Lane
+from mercury_ocip.libs.types import CommandInput, CommandResult
+from mercury_ocip.pool import BasePool, FailoverPool, PoolResult, SessionPool
+
+# Checked in order, the first one a command carries decides its cluster
+ROUTE_FIELDS: Tuple[str, ...] = ("service_provider_id", "user_id", "service_user_id")
+
+PATTERN_CHARS = "*?["
+
+
+def route_key(command: CommandInput) -> Optional[str]:
+    """The value a command is routed on.
+
+    That is its service provider or enterprise ID, or failing that the domain of
+    its user ID, ``jdoe@acme.example.com`` routes on ``acme.example.com``.
+    """
+    for name in ROUTE_FIELDS:
+        value = getattr(command, name, None)
+        if not value:
+            continue
+        if name == "service_provider_id":
+            return value
+        _, at, domain = value.rpartition("@")
+        if at:
+            return domain
+    return None
+
+
+class ClusterRouter(BasePool):
+    """Runs commands against several independent BroadWorks clusters as one.
+
+    Each cluster is a pool of its own. Routes map service provider or enterprise
+    IDs, and user ID domains, to the cluster that hosts them. A route key with
+    ``*``, ``?`` or ``[`` is a glob pattern, ``"Acme*"`` or ``"*.acme.example.com"``.
+    Exact keys are checked first, then patterns in the order given. Commands that
+    carry none of those fields, or match no route, go to ``default``.
+
+    ``command_many`` spreads work over every cluster at once, so a crawl across
+    all of them runs in parallel. ``broadcast`` sends one command, such as
+    ``ServiceProviderGetListRequest``, to each cluster.
+
+    Args:
+        clusters (Mapping[str, BasePool]): Pools by cluster name.
+        routes (Mapping[str, str]): Cluster name by ID, domain or pattern.
+        default (str, optional): Cluster for commands no route matches.
+
+    Example:
+        async with ClusterRouter.from_hosts(
+            {"east": ["as1.east.example.com", "as2.east.example.com"], "west": "as1.west.example.com"},
+            routes={"Acme": "east", "Globex*": "west", "*.globex.example.com": "west"},
+            size=4, username=..., password=...,
+        ) as router:
+            await router.authenticate()
+            results = await router.command_many(commands)
+    """
+
+    def __init__(
+        self,
+        clusters: Mapping[str, BasePool],
+        routes: Mapping[str, str],
+        default: Optional[str] = None,
+    ) -> None:
+        if not clusters:
+            raise ValueError("ClusterRouter needs at least one cluster")
+        unknown = {
+            name for name in [*routes.values(), default] if name is not None
+        } - set(clusters)
+        if unknown:
+            raise ValueError(f"Routes name unknown clusters: {sorted(unknown)}")
+        self.clusters: Dict[str, BasePool] = dict(clusters)
+        self.default = default
+        self._exact: Dict[str, str] = {}
+        self._patterns: List[Tuple[str, str]] = []
+        for key, cluster in routes.items():
+            if any(char in key for char in PATTERN_CHARS):
+                self._patterns.append((key, cluster))
+            else:
+                self._exact[key] = cluster
+        # Pattern lookups repeat for every command of the same customer
+        self._resolved: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def from_hosts(
+        cls,
+        clusters: Mapping[str, Union[str, Sequence[str]]],
+        routes: Mapping[str, str],
+        default: Optional[str] = None,
+        **pool_kwargs: Any,
+    ) -> "ClusterRouter":
+        """Builds a pool for each cluster from its host, or hosts.
+
+        A cluster with one host gets a SessionPool, one with several a FailoverPool.
+
+        Args:
+            clusters (Mapping[str, str | Sequence[str]]): Host or hosts by cluster name.
+            routes (Mapping[str, str]): Cluster name by ID, domain or pattern.
+            default (str, optional): Cluster for commands no route matches.
+            **pool_kwargs: Passed to every pool, e.g. size, username and password.
+        """
+        pools: Dict[str, BasePool] = {}
+        for name, hosts in clusters.items():
+            if isinstance(hosts, str):
+                pools[name] = SessionPool(host=hosts, **pool_kwargs)
+            elif len(hosts) == 1:
+                pools[name] = SessionPool(host=hosts[0], **pool_kwargs)
+            else:
+                pools[name] = FailoverPool(hosts, **pool_kwargs)
+        return cls(pools, routes, default)
+
+    @property
+    def size(self) -> int:
+        return sum(pool.size for pool in self.clusters.values())
+
+    def route(self, command: CommandInput) -> str:
+        """Name of the cluster a command is sent to.
+
+        Raises:
+            MErrorNoRoute: If nothing matches and there is no default cluster
+        """
+        key = route_key(command)
+        cluster = self._match(key) if key is not None else None
+        if cluster is None:
+            cluster = self.default
+        if cluster is None:
+            raise MErrorNoRoute(
+                f"No cluster for {command.__class__.__name__} ({key or 'no route field'})"
+            )
+        return cluster
+
+    def _match(self, key: str) -> Optional[str]:
+        if key in self._exact:
+            return self._exact[key]
+        if key not in self._resolved:
+            self._resolved[key] = next(
+                (
+                    cluster
+                    for pattern, cluster in self._patterns
+                    if fnmatchcase(key, pattern)
+                ),
+                None,
+            )
+        return self._resolved[key]
+
+    async def authenticate(self) -> None:
+        """Logs in every session in every cluster."""
+        await asyncio.gather(*(pool.authenticate() for pool in self.clusters.values()))
+
+    async def command(
+        self, command: CommandInput, lane: Union[Lane, str] = Lane.NORMAL
+    ) -> CommandResult:
+        """Runs a command on the cluster its route points to.
+
+        Args:
+            command (BWKSCommand): The command class to execute
+            lane (Lane): Priority class, "interactive", "normal" or "bulk"
+
+        Returns:
+            BWKSCommand: The response from the server
+
+        Raises:
+            MErrorNoRoute: If the command matches no cluster
+        """
+        return await self.clusters[self.route(command)].command(command, lane)
+
+    async def broadcast(
+        self,
+        command: CommandInput,
+        return_exceptions: bool = True,
+        lane: Union[Lane, str] = Lane.NORMAL,
+    ) -> Dict[str, PoolResult]:
+        """Runs one command on every cluster at once.
+
+        Args:
+            command (BWKSCommand): The command class to execute
+            return_exceptions (bool): Put exceptions in the results instead of
+                raising the first one.
+            lane (Lane): Priority class for the command
+
+        Returns:
+            Dict: The response or exception from each cluster, by cluster name
+        """
+        results = await asyncio.gather(
+            *(pool.command(command, lane) for pool in self.clusters.values()),
+            return_exceptions=return_exceptions,
+        )
+        return dict(zip(self.clusters, results))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(pool.close() for pool in self.clusters.values()))
@@ -1,8 +1,9 @@
-from typing import Any
+from typing import Any, Iterator
 from typing import get_type_hints, Optional
 from dataclasses import fields, is_dataclass, dataclass
-from mercury_ocip.utils.parser import Parser, AsyncParser
+from mercury_ocip.utils.parser import Parser, AsyncParser, XMLInput
 from mercury_ocip.utils.defines import to_snake_case
+from mercury_ocip.utils import exporters
 
 
 class OCIType:
@@ -14,8 +15,10 @@ class OCIType:
     - __init__: Handles dataclass default initialisation of raw objects
     - to_dict: Invokes Parser to_dict_from_class
     - to_xml: Invokes Parser to_xml_from_class
+    - to_xml_bytes: Invokes Parser to_xml_bytes_from_class
     - from_dict: Invokes Parser to_class_from_dict
     - from_xml: Invokes Parser to_class_from_xml
+    - to_csv / to_jsonl / to_parquet: Stream the type, or its table, to a file
     """
 
     namespace = "C"
@@ -46,13 +49,25 @@ class OCIType:
     def to_xml(self) -> str:
         return Parser.to_xml_from_class(self)
 
+    def to_xml_bytes(self) -> bytes:
+        return Parser.to_xml_bytes_from_class(self)
+
     @classmethod
     def from_dict(cls: type["OCIType"], data: dict[str, Any]) -> "OCIType":
         return Parser.to_class_from_dict(data, cls)
 
     @classmethod
-    def from_xml(cls, xml: str) -> "OCIType":
-        return Parser.to_class_from_xml(xml, cls)
+    def from_xml(cls, xml: XMLInput, **parse_options: Any) -> "OCIType":
+        return Parser.to_class_from_xml(xml, cls, **parse_options)
+
+    def to_csv(self, target: exporters.ExportTarget, **options: Any) -> int:
+        return exporters.export_csv(self, target, **options)
+
+    def to_jsonl(self, target: exporters.ExportTarget, **options: Any) -> int:
+        return exporters.export_jsonl(self, target, **options)
+
+    def to_parquet(self, target: exporters.ExportTarget, **options: Any) -> int:
+        return exporters.export_parquet(self, target, **options)
 
     async def to_dict_async(self) -> dict[str, Any]:
         return await AsyncParser.to_dict_from_class(self)
@@ -60,13 +75,18 @@ class OCIType:
     async def to_xml_async(self) -> str:
         return await AsyncParser.to_xml_from_class(self)
 
+    async def to_xml_bytes_async(self) -> bytes:
+        return await AsyncParser.to_xml_bytes_from_class(self)
+
     @classmethod
     async def from_dict_async(cls: type["OCIType"], data: dict[str, Any]) -> "OCIType":
         return await AsyncParser.to_class_from_dict(data, cls)
 
     @classmethod
-    async def from_xml_async(cls: type["OCIType"], xml: str) -> "OCIType":
-        return await AsyncParser.to_class_from_xml(xml, cls)
+    async def from_xml_async(
+        cls: type["OCIType"], xml: XMLInput, **parse_options: Any
+    ) -> "OCIType":
+        return await AsyncParser.to_class_from_xml(xml, cls, **parse_options)
 
 
 class OCICommand(OCIType):
@@ -90,7 +110,7 @@ class SuccessResponse(OCIResponse):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class OCITableRow:
     col: list[str]
 
@@ -98,7 +118,7 @@ class OCITableRow:
         self.col = col
 
 
-@dataclass
+@dataclass(slots=True)
 class OCITable:
     col_heading: list[str]
     row: list[OCITableRow]
@@ -107,14 +127,23 @@ class OCITable:
         self.col_heading = col_heading
         self.row = row if row is not None else []
 
+    def iter_rows(self) -> Iterator[dict[str, str]]:
+        """Yield each row as a dict without building the full list."""
+        headings = [to_snake_case(heading) for heading in self.col_heading]
+        for row in self.row:
+            yield dict(zip(headings, row.col))
+
     def to_dict(self):
-        return [
-            {
-                to_snake_case(self.col_heading[i]): row.col[i]
-                for i in range(len(self.col_heading))
-            }
-            for row in self.row
-        ]
+        return list(self.iter_rows())
+
+    def to_csv(self, target: exporters.ExportTarget, **options: Any) -> int:
+        return exporters.export_csv(self, target, **options)
+
+    def to_jsonl(self, target: exporters.ExportTarget, **options: Any) -> int:
+        return exporters.export_jsonl(self, target, **options)
+
+    def to_parquet(self, target: exporters.ExportTarget, **options: Any) -> int:
+        return exporters.export_parquet(self, target, **options)
 
 
 class ErrorResponse(OCIResponse):
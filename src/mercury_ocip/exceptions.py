@@ -118,3 +118,39 @@ class MErrorFailedXMLConversion(MError):
     """
 
     pass
+
+
+@attr.s(slots=True, frozen=True)
+class MErrorMissingDependency(MError):
+    """
+    Exception raised when an optional dependency needed for a feature is not installed.
+    """
+
+    pass
+
+
+@attr.s(slots=True, frozen=True)
+class MErrorNoHealthyHost(MError):
+    """
+    Exception raised when every configured Application Server has its circuit breaker open.
+    """
+
+    pass
+
+
+@attr.s(slots=True, frozen=True)
+class MErrorNoRoute(MError):
+    """
+    Exception raised when a command cannot be matched to a cluster.
+    """
+
+    pass
+
+
+@attr.s(slots=True, frozen=True)
+class MErrorDeadlineExceeded(MError):
+    """
+    Exception raised when a command is not sent because its deadline has already passed.
+    """
+
+    pass
@@ -0,0 +1,202 @@
+"""
+Health tracking and failover across several Application Servers
+"""
+
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from mercury_ocip.exceptions import (
+    MErrorClientInitialisation,
+    MErrorSendRequestFailed,
+    MErrorSocketInitialisation,
+    MErrorSocketTimeout,
+    MErrorTimeOut,
+)
+from mercury_ocip.limiter import Outcome
+
+
+def is_retryable(error: BaseException, read: bool) -> bool:
+    """Whether a failed command can safely be sent again to another host.
+
+    Connection failures mean nothing reached the server, so any command can move.
+    A timeout or broken connection mid request may have left a write applied, so
+    only reads are sent again after those.
+    """
+    if isinstance(error, (MErrorSocketInitialisation, MErrorClientInitialisation)):
+        return True
+    if isinstance(error, (MErrorSocketTimeout, MErrorTimeOut, MErrorSendRequestFailed)):
+        return read
+    return False
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops traffic to a host after repeated failures.
+
+    After ``failure_threshold`` failures in a row the breaker opens and the host
+    is skipped. Once ``reset_timeout`` seconds pass one request is let through as
+    a probe. If it succeeds the breaker closes, if it fails the breaker opens
+    again for another ``reset_timeout``.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the breaker.
+        reset_timeout (float): Seconds an open breaker waits before probing.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> BreakerState:
+        if self._opened_at is None:
+            return BreakerState.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return BreakerState.HALF_OPEN
+        return BreakerState.OPEN
+
+    def available(self) -> bool:
+        """Whether a request may be sent now. Does not claim the half open probe."""
+        state = self.state
+        return state is BreakerState.CLOSED or (
+            state is BreakerState.HALF_OPEN and not self._probing
+        )
+
+    def attempt(self) -> None:
+        """Mark a request as sent, claiming the probe when half open."""
+        if self.state is BreakerState.HALF_OPEN:
+            self._probing = True
+
+    def abandon(self) -> None:
+        """Release the probe without a verdict, e.g. the request was cancelled."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+
+@dataclass(slots=True)
+class HostHealth:
+    """What is known about one host.
+
+    Attributes:
+        host: The host name or address.
+        breaker: Its circuit breaker.
+        latency: Smoothed latency of recent responses, None until one arrives.
+        in_flight: Requests currently sent to it.
+        requests: Requests completed.
+        failures: Requests that failed with a timeout, overload or connection error.
+    """
+
+    host: str
+    breaker: CircuitBreaker
+    latency: Optional[float] = None
+    in_flight: int = 0
+    requests: int = 0
+    failures: int = 0
+
+    def expected_latency(self) -> float:
+        """Latency a new request can expect given what is already queued."""
+        return (self.in_flight + 1) * (self.latency or 0.0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state.value,
+            "latency": self.latency,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+@dataclass(slots=True)
+class HostSelector:
+    """Picks the host for each request.
+
+    Reads go to the available host with the lowest expected latency, hosts with
+    no measurements yet count as fastest so each gets tried. With ``pin_writes``
+    every other command goes to the first available host in configured order,
+    the primary, and only moves once the primary's breaker opens.
+
+    Args:
+        hosts (Sequence[str]): Hosts in order of preference.
+        pin_writes (bool): Send writes to the primary host only.
+        failure_threshold (int): Consecutive failures that open a host's breaker.
+        reset_timeout (float): Seconds before an open breaker lets a probe through.
+    """
+
+    hosts: Sequence[str]
+    pin_writes: bool = False
+    failure_threshold: int = 3
+    reset_timeout: float = 30.0
+    health: Dict[str, HostHealth] = field(init=False)
+
+    def __post_init__(self) -> None:
+        if not self.hosts:
+            raise ValueError("HostSelector needs at least one host")
+        self.health = {
+            host: HostHealth(
+                host, CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            )
+            for host in self.hosts
+        }
+
+    def choose(self, write: bool = False, exclude: Iterable[str] = ()) -> Optional[str]:
+        """The host to send to next, or None when every host is excluded or open."""
+        excluded = set(exclude)
+        candidates: List[HostHealth] = [
+            health
+            for host, health in self.health.items()
+            if host not in excluded and health.breaker.available()
+        ]
+        if not candidates:
+            return None
+        if write and self.pin_writes:
+            chosen = candidates[0]
+        else:
+            chosen = min(candidates, key=HostHealth.expected_latency)
+        chosen.breaker.attempt()
+        return chosen.host
+
+    def record(
+        self, host: str, outcome: Outcome, latency: Optional[float] = None
+    ) -> None:
+        """Feed a completed request into the host's breaker and latency."""
+        health = self.health[host]
+        health.requests += 1
+        if outcome.congested:
+            health.failures += 1
+            health.breaker.record_failure()
+            return
+        health.breaker.record_success()
+        if latency is None:
+            return
+        if health.latency is None:
+            health.latency = latency
+        else:
+            health.latency += (latency - health.latency) * 0.2
+
+    def abandon(self, host: str) -> None:
+        """A request to ``host`` was given up without an answer, free its probe."""
+        self.health[host].breaker.abandon()
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {host: health.as_dict() for host, health in self.health.items()}
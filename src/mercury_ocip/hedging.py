@@ -0,0 +1,104 @@
+"""
+Hedged reads: a second copy of a slow read races the first
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+
+@dataclass(slots=True)
+class HedgeStats:
+    """Counters for a HedgePolicy.
+
+    Attributes:
+        requests: Reads sent through the policy.
+        hedged: Reads that had a second copy sent.
+        hedge_wins: Hedged reads answered by the second copy first.
+        over_budget: Hedges skipped because the budget was spent.
+    """
+
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    over_budget: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "over_budget": self.over_budget,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+        }
+
+
+class HedgePolicy:
+    """Decides when a read has waited long enough to send a second copy.
+
+    Latency is tracked per command type. Once a command type has ``min_samples``
+    completed reads, a read still running after the ``percentile`` latency of the
+    last ``window`` reads gets a duplicate sent on another session and whichever
+    answers first is used. Hedges are capped at ``budget`` as a fraction of all
+    reads, so a server that is slow across the board is not sent twice the work.
+
+    Args:
+        percentile (float): Latency percentile to wait for before hedging, 0 to 1.
+        budget (float): Most hedges allowed as a fraction of reads, e.g. 0.05.
+        min_samples (int): Reads seen for a command type before it is hedged.
+        min_delay (float): Never hedge sooner than this many seconds.
+        window (int): Recent latencies kept per command type.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        min_delay: float = 0.0,
+        window: int = 256,
+    ) -> None:
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if not 0 <= budget <= 1:
+            raise ValueError("budget must be between 0 and 1")
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        self.stats = HedgeStats()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._thresholds: Dict[str, float] = {}
+        self._unsorted: Dict[str, int] = {}
+
+    def delay_for(self, command: str) -> Optional[float]:
+        """Seconds to wait before hedging a read, None while too few are known."""
+        self.stats.requests += 1
+        samples = self._latencies.get(command)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        # Sorting on every read is wasteful, refresh after a few new samples
+        if command not in self._thresholds or self._unsorted[command] >= 16:
+            ordered = sorted(samples)
+            index = min(len(ordered) - 1, int(len(ordered) * self.percentile))
+            self._thresholds[command] = ordered[index]
+            self._unsorted[command] = 0
+        return max(self.min_delay, self._thresholds[command])
+
+    def allow(self) -> bool:
+        """Whether the budget has room for another hedge. Counts it if so."""
+        if self.stats.hedged + 1 > self.budget * self.stats.requests:
+            self.stats.over_budget += 1
+            return False
+        self.stats.hedged += 1
+        return True
+
+    def observe(self, command: str, latency: float) -> None:
+        """Record how long a completed read took."""
+        samples = self._latencies.get(command)
+        if samples is None:
+            samples = self._latencies[command] = deque(maxlen=self.window)
+            self._unsorted[command] = 0
+        samples.append(latency)
+        self._unsorted[command] += 1
@@ -0,0 +1,189 @@
+"""
+Priority lanes deciding which queued command gets the next free session
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Deque, Dict, Generic, Iterable, Optional, Tuple, TypeVar
+
+from mercury_ocip.limiter import AdaptiveLimiter
+
+T = TypeVar("T")
+
+
+class Lane(Enum):
+    """Priority class of a command, highest first.
+
+    LIST is for long running ``*Get*ListIn*Request`` scans. Pools with dedicated
+    list sessions put them there, so a scan never holds up other work.
+    """
+
+    INTERACTIVE = "interactive"
+    NORMAL = "normal"
+    BULK = "bulk"
+    LIST = "list"
+
+
+DEFAULT_WEIGHTS: Dict[Lane, int] = {
+    Lane.INTERACTIVE: 16,
+    Lane.NORMAL: 4,
+    Lane.BULK: 1,
+    Lane.LIST: 1,
+}
+
+
+@dataclass(slots=True)
+class LaneStats:
+    """Queue wait for one lane.
+
+    Attributes:
+        requests: Commands granted a session.
+        queued: Commands that had to wait for one.
+        total_wait: Seconds spent waiting, across all commands.
+        max_wait: Longest single wait in seconds.
+        recent: The latest waits, used for percentiles.
+    """
+
+    requests: int = 0
+    queued: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+
+    def record(self, wait: float) -> None:
+        self.requests += 1
+        if wait > 0:
+            self.queued += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        self.recent.append(wait)
+
+    def as_dict(self) -> Dict[str, float]:
+        ordered = sorted(self.recent)
+        p95 = ordered[int(len(ordered) * 0.95)] if ordered else 0.0
+        return {
+            "requests": self.requests,
+            "queued": self.queued,
+            "mean_wait": self.total_wait / self.requests if self.requests else 0.0,
+            "p95_wait": p95,
+            "max_wait": self.max_wait,
+        }
+
+
+class LaneScheduler(Generic[T]):
+    """Hands out a fixed set of resources (sessions) to callers queued in lanes.
+
+    When a resource frees up it goes to a waiting caller chosen by lane. With
+    ``strict`` the highest lane with anyone waiting always goes first, bulk work
+    can then wait indefinitely behind a steady stream of interactive commands.
+    Otherwise lanes share by weight using smooth weighted round robin. With the
+    default weights an interactive command is almost always next in line, while
+    bulk work still gets 1 in 22 sessions under full contention. Callers in the
+    same lane are served in arrival order.
+
+    Args:
+        resources (Iterable): What is handed out, e.g. AsyncClient sessions.
+        weights (Dict[Lane, int], optional): Share of each lane under contention.
+        strict (bool): Serve lanes in strict priority order instead of by weight.
+        limiter (AdaptiveLimiter, optional): Also required to grant a resource.
+    """
+
+    def __init__(
+        self,
+        resources: Iterable[T],
+        weights: Optional[Dict[Lane, int]] = None,
+        strict: bool = False,
+        limiter: Optional[AdaptiveLimiter] = None,
+    ) -> None:
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.strict = strict
+        self.limiter = limiter
+        self.stats: Dict[Lane, LaneStats] = {lane: LaneStats() for lane in Lane}
+        self._idle: Deque[T] = deque(resources)
+        self._waiting: Dict[Lane, Deque[Tuple[float, "asyncio.Future[T]"]]] = {
+            lane: deque() for lane in Lane
+        }
+        self._credit: Dict[Lane, int] = {lane: 0 for lane in Lane}
+
+    async def acquire(self, lane: Lane = Lane.NORMAL) -> T:
+        """Wait for a resource. Give it back with release."""
+        if self._idle and not self._any_waiting() and self._limiter_allows():
+            self.stats[lane].record(0.0)
+            return self._idle.popleft()
+
+        waiter: "asyncio.Future[T]" = asyncio.get_running_loop().create_future()
+        self._waiting[lane].append((time.monotonic(), waiter))
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted as we were cancelled, give it straight back
+                if self.limiter is not None:
+                    self.limiter.discard()
+                self.release(waiter.result())
+            raise
+
+    def release(self, resource: T) -> None:
+        """Return a resource and grant it to the next caller in line."""
+        self._idle.append(resource)
+        self.dispatch()
+
+    def dispatch(self) -> None:
+        """Grant idle resources to waiting callers, e.g. after the limiter grows."""
+        while self._idle:
+            lane = self._next_lane()
+            if lane is None or not self._limiter_allows():
+                return
+            queued_at, waiter = self._waiting[lane].popleft()
+            self.stats[lane].record(time.monotonic() - queued_at)
+            waiter.set_result(self._idle.popleft())
+
+    def waiting(self, lane: Optional[Lane] = None) -> int:
+        """Callers currently queued, in one lane or all of them."""
+        if lane is not None:
+            return len(self._waiting[lane])
+        return sum(len(queue) for queue in self._waiting.values())
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            lane.value: {**self.stats[lane].as_dict(), "waiting": self.waiting(lane)}
+            for lane in Lane
+        }
+
+    def _limiter_allows(self) -> bool:
+        return self.limiter is None or self.limiter.try_acquire()
+
+    def _any_waiting(self) -> bool:
+        found = False
+        for queue in self._waiting.values():
+            # Drop callers cancelled while they waited
+            while queue and queue[0][1].done():
+                queue.popleft()
+            found = found or bool(queue)
+        return found
+
+    def _next_lane(self) -> Optional[Lane]:
+        if not self._any_waiting():
+            return None
+        ready = []
+        for lane, queue in self._waiting.items():
+            if queue:
+                ready.append(lane)
+            else:
+                # An idle lane does not save up credit for later
+                self._credit[lane] = 0
+        if not ready:
+            return None
+        if self.strict:
+            return ready[0]
+
+        total = 0
+        for lane in ready:
+            self._credit[lane] += self.weights[lane]
+            total += self.weights[lane]
+        chosen = max(ready, key=lambda lane: self._credit[lane])
+        self._credit[chosen] -= total
+        return chosen
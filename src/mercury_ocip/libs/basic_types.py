@@ -4,6 +4,9 @@ from mercury_ocip.exceptions import MError
 # Used for when requester returns a successful/unsuccessful result
 type RequestResult = Union[str, MError]
 
+# Used for when requester returns the undecoded response, SOAP transports only deal in str
+type RawRequestResult = Union[bytes, str, MError]
+
 # Used for when requester connects to the server
 type ConnectResult = Union[None, MError]
 
@@ -13,4 +16,4 @@ type DisconnectResult = None
 # Used In Parser For XMLToDict / ClassToDict Conversions
 type XMLDictResult = Union[
     Dict[str, Union[str, "XMLDictResult", List["XMLDictResult"]]], str
-]
\ No newline at end of file
+]
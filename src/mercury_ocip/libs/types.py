@@ -7,6 +7,7 @@ from mercury_ocip.commands.base_command import (
 )
 from mercury_ocip.libs.basic_types import (
     RequestResult,
+    RawRequestResult,
     ConnectResult,
     DisconnectResult,
     XMLDictResult,
@@ -14,6 +15,7 @@ from mercury_ocip.libs.basic_types import (
 
 __all__ = [
     "RequestResult",
+    "RawRequestResult",
     "ConnectResult",
     "DisconnectResult",
     "XMLDictResult",
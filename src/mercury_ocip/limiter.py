@@ -0,0 +1,279 @@
+"""
+Concurrency and rate limits for traffic sent to an Application Server
+"""
+
+import asyncio
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Deque, Dict, Optional
+
+from mercury_ocip.commands.base_command import ErrorResponse
+from mercury_ocip.exceptions import (
+    MError,
+    MErrorDeadlineExceeded,
+    MErrorSocketTimeout,
+    MErrorTimeOut,
+)
+
+# Error summaries the Application Server returns when it is shedding load
+OVERLOAD_PATTERN = re.compile(
+    r"overload|too many|busy|try again later|capacity|throttl", re.IGNORECASE
+)
+
+
+class Outcome(Enum):
+    """How a request ended, as far as load on the server is concerned.
+
+    SUCCESS and ERROR mean the server answered in time, ERROR being a business
+    error such as a missing user. TIMEOUT, OVERLOAD and FAILURE are signs the
+    server or the path to it is struggling.
+    """
+
+    SUCCESS = "success"
+    ERROR = "error"
+    TIMEOUT = "timeout"
+    OVERLOAD = "overload"
+    FAILURE = "failure"
+
+    @property
+    def congested(self) -> bool:
+        return self in (Outcome.TIMEOUT, Outcome.OVERLOAD, Outcome.FAILURE)
+
+
+def classify(result: Any = None, error: Optional[BaseException] = None) -> Outcome:
+    """Map a command's response, or the exception it raised, to an Outcome."""
+    if error is not None:
+        if isinstance(
+            error, (MErrorSocketTimeout, MErrorTimeOut, asyncio.TimeoutError)
+        ):
+            return Outcome.TIMEOUT
+        if isinstance(error, MErrorDeadlineExceeded):
+            # Never sent, says nothing about the server
+            return Outcome.ERROR
+        if isinstance(error, MError):
+            return Outcome.FAILURE
+        return Outcome.ERROR
+    if isinstance(result, ErrorResponse):
+        summary = getattr(result, "summary", None) or ""
+        return Outcome.OVERLOAD if OVERLOAD_PATTERN.search(summary) else Outcome.ERROR
+    return Outcome.SUCCESS
+
+
+@dataclass(slots=True)
+class LimiterStats:
+    """Counters for an AdaptiveLimiter.
+
+    Attributes:
+        acquired: Slots handed out.
+        increases: Times the limit grew.
+        decreases: Times the limit was cut.
+        timeouts: Requests that timed out.
+        overloads: Requests the server refused as overloaded.
+        failures: Requests that failed in transport.
+    """
+
+    acquired: int = 0
+    increases: int = 0
+    decreases: int = 0
+    timeouts: int = 0
+    overloads: int = 0
+    failures: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "acquired": self.acquired,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "timeouts": self.timeouts,
+            "overloads": self.overloads,
+            "failures": self.failures,
+        }
+
+
+class AdaptiveLimiter:
+    """Limits in-flight requests, finding the limit by additive increase and
+    multiplicative decrease (AIMD).
+
+    Every request that completes while the limiter is saturated adds
+    ``1 / limit`` to the limit, so it grows by roughly one per round of requests.
+    The limit is multiplied by ``backoff`` when a request times out, the server
+    reports overload, or recent latency climbs past ``tolerance`` times the
+    baseline, the lowest latency seen lately, which is what the server manages
+    when nothing is queued. At most one cut is made per round so a burst of slow
+    responses counts once.
+
+    Args:
+        initial (int): Starting limit.
+        min_limit (int): The limit never drops below this.
+        max_limit (int): The limit never grows past this.
+        backoff (float): Factor applied to the limit on congestion.
+        tolerance (float): How far recent latency may rise over the baseline before
+            it counts as congestion.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        tolerance: float = 2.0,
+    ) -> None:
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError(
+                "AdaptiveLimiter needs 1 <= min_limit <= initial <= max_limit"
+            )
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.stats = LimiterStats()
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._recent_latency: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._completed = 0
+        self._hold_until = 0
+
+    @property
+    def limit(self) -> int:
+        return min(int(self._limit), self.max_limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free right now, without waiting."""
+        if self._waiters or self._in_flight >= self.limit:
+            return False
+        self._in_flight += 1
+        self.stats.acquired += 1
+        return True
+
+    async def acquire(self) -> None:
+        """Wait for a slot. Pair every acquire with one release."""
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            self.stats.acquired += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted as we were cancelled, hand it on
+                self._in_flight -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        self.stats.acquired += 1
+
+    def release(self, latency: float, outcome: Outcome = Outcome.SUCCESS) -> None:
+        """Return a slot and feed the request's latency and outcome into the limit."""
+        saturated = self._in_flight >= self.limit
+        self._in_flight -= 1
+        self._completed += 1
+
+        if outcome is Outcome.TIMEOUT:
+            self.stats.timeouts += 1
+        elif outcome is Outcome.OVERLOAD:
+            self.stats.overloads += 1
+        elif outcome is Outcome.FAILURE:
+            self.stats.failures += 1
+
+        if outcome.congested or self._latency_rising(latency):
+            self._decrease()
+        elif saturated and self._completed > self._hold_until:
+            self._increase()
+
+        self._wake()
+
+    def discard(self) -> None:
+        """Return a slot that was never used, without affecting the limit."""
+        self._in_flight -= 1
+        self._wake()
+
+    def _latency_rising(self, latency: float) -> bool:
+        if self._recent_latency is None or self._baseline is None:
+            self._recent_latency = self._baseline = latency
+            return False
+        self._recent_latency += (latency - self._recent_latency) * 0.2
+        if latency < self._baseline:
+            self._baseline = latency
+        else:
+            # Drift up slowly so a lasting change in the server is picked up
+            self._baseline += (latency - self._baseline) * 0.001
+        return self._recent_latency > self._baseline * self.tolerance
+
+    def _increase(self) -> None:
+        if self._limit < self.max_limit:
+            self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            self.stats.increases += 1
+
+    def _decrease(self) -> None:
+        if self._completed <= self._hold_until:
+            return
+        self._limit = max(float(self.min_limit), self.limit * self.backoff)
+        # Requests already in flight were sent at the old limit, let them drain
+        self._hold_until = self._completed + self._in_flight
+        # Latency has to rise again on fresh samples before the next cut
+        self._recent_latency = self._baseline
+        self.stats.decreases += 1
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            **self.stats.as_dict(),
+        }
+
+
+class TokenBucket:
+    """Caps the request rate to a host at ``rate`` per second with bursts of up to
+    ``burst`` requests. Callers beyond that wait their turn in arrival order.
+
+    Args:
+        rate (float): Requests per second.
+        burst (int): Requests allowed back to back after an idle period.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("TokenBucket needs rate > 0 and burst >= 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
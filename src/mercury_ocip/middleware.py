@@ -0,0 +1,70 @@
+"""
+Middleware chain wrapped around command execution
+"""
+
+import inspect
+from typing import Any, Awaitable, Callable, Sequence
+
+from mercury_ocip.libs.types import CommandInput, CommandResult
+
+# call_next(command, payload) sends the payload on to the next middleware or the server
+type CallNext = Callable[[CommandInput, bytes], CommandResult]
+type AsyncCallNext = Callable[[CommandInput, bytes], Awaitable[CommandResult]]
+
+# middleware(command, payload, call_next) returns the decoded response
+type Middleware = Callable[[CommandInput, bytes, CallNext], CommandResult]
+type AsyncMiddleware = Callable[
+    [CommandInput, bytes, AsyncCallNext], Awaitable[CommandResult]
+]
+
+
+def run_chain(
+    middleware: Sequence[Middleware],
+    command: CommandInput,
+    payload: bytes,
+    send: CallNext,
+) -> CommandResult:
+    """Runs ``command`` through each middleware in order, then ``send``.
+
+    Each middleware receives the command, its serialized request and ``call_next``.
+    It can change either before passing them on, return without calling
+    ``call_next`` at all, or call it more than once to retry.
+    """
+    chain = tuple(middleware)
+    last = len(chain)
+
+    def call(index: int, command: CommandInput, payload: bytes) -> CommandResult:
+        if index == last:
+            return send(command, payload)
+        return chain[index](
+            command, payload, lambda command, payload: call(index + 1, command, payload)
+        )
+
+    return call(0, command, payload)
+
+
+async def run_chain_async(
+    middleware: Sequence[AsyncMiddleware],
+    command: CommandInput,
+    payload: bytes,
+    send: AsyncCallNext,
+) -> CommandResult:
+    """Async form of :func:`run_chain`, every middleware is awaited."""
+    chain = tuple(middleware)
+    last = len(chain)
+
+    async def call(index: int, command: CommandInput, payload: bytes) -> CommandResult:
+        if index == last:
+            return await send(command, payload)
+        return await chain[index](
+            command, payload, lambda command, payload: call(index + 1, command, payload)
+        )
+
+    return await call(0, command, payload)
+
+
+def is_async_middleware(middleware: Any) -> bool:
+    """Whether calling ``middleware`` returns an awaitable."""
+    return inspect.iscoroutinefunction(middleware) or inspect.iscoroutinefunction(
+        getattr(middleware, "__call__", None)
+    )
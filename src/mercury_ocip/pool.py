@@ -0,0 +1,495 @@
+"""
+Pool of authenticated sessions to one Application Server
+"""
+
+import asyncio
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Union,
+    cast,
+)
+
+from mercury_ocip.client import AsyncClient, BaseClient
+from mercury_ocip.exceptions import MError, MErrorNoHealthyHost
+from mercury_ocip.failover import HostSelector, is_retryable
+from mercury_ocip.hedging import HedgePolicy
+from mercury_ocip.lanes import Lane, LaneScheduler
+from mercury_ocip.libs.types import CommandInput, CommandResult
+from mercury_ocip.limiter import AdaptiveLimiter, Outcome, TokenBucket, classify
+from mercury_ocip.utils.defines import is_list_command, is_read_command
+
+type PoolResult = Union[CommandResult, BaseException]
+
+
+class BasePool(ABC):
+    """Shared interface of the pools, anything that runs commands concurrently"""
+
+    @property
+    @abstractmethod
+    def size(self) -> int:
+        """How many commands can be in flight at once"""
+        pass
+
+    @abstractmethod
+    async def command(
+        self, command: CommandInput, lane: Union[Lane, str] = Lane.NORMAL
+    ) -> CommandResult:
+        """Runs one command"""
+        pass
+
+    @abstractmethod
+    async def authenticate(self) -> None:
+        """Logs every session in"""
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Disconnects every session"""
+        pass
+
+    async def command_many(
+        self,
+        commands: Iterable[CommandInput],
+        return_exceptions: bool = True,
+        lane: Union[Lane, str] = Lane.NORMAL,
+    ) -> List[PoolResult]:
+        """Runs commands concurrently and returns their responses in input order.
+
+        Commands are taken from the iterable as sessions free up, a generator is
+        never read ahead by more than the pool size.
+
+        Args:
+            commands (Iterable[BWKSCommand]): The commands to execute
+            return_exceptions (bool): Put exceptions in the results instead of
+                raising the first one, the default. When False the remaining
+                commands are cancelled once one fails.
+            lane (Lane): Priority class for every command, bulk jobs should pass "bulk"
+
+        Returns:
+            List: One response or exception per command
+        """
+        results: List[PoolResult] = []
+        pending = enumerate(commands)
+
+        async def worker() -> None:
+            for index, command in pending:
+                results.extend([None] * (index + 1 - len(results)))
+                try:
+                    results[index] = await self.command(command, lane)
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results[index] = e
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.size)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        return results
+
+    async def __aenter__(self) -> "BasePool":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+
+class SessionPool(BasePool):
+    """Runs commands concurrently over several AsyncClient sessions.
+
+    A single OCI-P connection answers one request at a time, so concurrency comes
+    from holding several sessions and giving each command an idle one. How many
+    run at once is capped by the number of sessions and, when given, an
+    AdaptiveLimiter that backs off while the server is struggling. The limiter's
+    ``max_limit`` is lowered to the pool size if it is larger. A TokenBucket caps
+    the request rate on top of that.
+
+    Commands are submitted in a Lane. When every session is busy, the next free
+    one goes to the waiting command picked by lane weight, or strict priority, so
+    interactive commands do not queue behind bulk jobs. ``list_sessions`` sets
+    sessions aside for ``*Get*ListIn*Request`` scans, which then never take a
+    session from other work.
+
+    With a HedgePolicy, a ``*Get*Request`` still running past the usual latency
+    for its command type is sent again on another session and the first response
+    wins. The slower copy is left to finish so its session is not reset.
+
+    Args:
+        size (int): Number of sessions to open.
+        limiter (AdaptiveLimiter, optional): Adjusts how many sessions are in use.
+        rate_limit (TokenBucket, optional): Caps requests per second to the host.
+        weights (Dict[Lane, int], optional): Share of sessions per lane under contention.
+        strict (bool): Serve lanes in strict priority order instead of by weight.
+        list_sessions (int): Sessions dedicated to list scans, 0 to share them all.
+        hedging (HedgePolicy, optional): Sends a second copy of slow reads.
+        client_factory (Callable[..., BaseClient]): Builds each session from the
+            client keyword arguments, AsyncClient by default.
+        **client_kwargs: Passed to every session, e.g. host, username and password.
+
+    Example:
+        async with SessionPool(size=8, limiter=AdaptiveLimiter(max_limit=8), host=...) as pool:
+            results = await pool.command_many(commands)
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        limiter: Optional[AdaptiveLimiter] = None,
+        rate_limit: Optional[TokenBucket] = None,
+        weights: Optional[Dict[Lane, int]] = None,
+        strict: bool = False,
+        list_sessions: int = 0,
+        hedging: Optional[HedgePolicy] = None,
+        client_factory: Callable[..., BaseClient] = AsyncClient,
+        **client_kwargs: Any,
+    ) -> None:
+        if size < 1:
+            raise ValueError("SessionPool needs at least one session")
+        if not 0 <= list_sessions < size:
+            raise ValueError("list_sessions must leave at least one shared session")
+        if limiter is not None and limiter.max_limit > size:
+            # A slot from the limiter should always find an idle session
+            limiter.max_limit = size
+            limiter.min_limit = min(limiter.min_limit, size)
+        self.limiter = limiter
+        self.rate_limit = rate_limit
+        self.hedging = hedging
+        self._stragglers: Set["asyncio.Future[CommandResult]"] = set()
+        # Each session needs its own id, the server ties a login to it
+        self.sessions: List[AsyncClient] = [
+            cast(
+                AsyncClient,
+                client_factory(**{**client_kwargs, "session_id": str(uuid.uuid4())}),
+            )
+            for _ in range(size)
+        ]
+        for session in self.sessions:
+            # Coalescing happens per session, it cannot share reads across the pool
+            session.coalescing = None
+        self.scheduler: LaneScheduler[AsyncClient] = LaneScheduler(
+            self.sessions[list_sessions:], weights, strict, limiter
+        )
+        self.list_scheduler: Optional[LaneScheduler[AsyncClient]] = (
+            LaneScheduler(self.sessions[:list_sessions], limiter=limiter)
+            if list_sessions
+            else None
+        )
+
+    @classmethod
+    def from_client(
+        cls, client: BaseClient, size: int = 4, **kwargs: Any
+    ) -> "SessionPool":
+        """A pool of sessions to the same server, with the same login, as ``client``.
+
+        Works from a sync Client too, so its work can be spread over several
+        connections.
+
+        Args:
+            client (BaseClient): Client to copy the connection settings of.
+            size (int): Number of sessions to open.
+            **kwargs: Other SessionPool options, e.g. limiter, or client
+                settings to change for the pool.
+        """
+        return cls(
+            size=size,
+            hosts=kwargs.pop("hosts", list(client.hosts)),
+            username=kwargs.pop("username", client.username),
+            password=kwargs.pop("password", client.password),
+            port=kwargs.pop("port", client.port),
+            conn_type=kwargs.pop("conn_type", client.conn_type),
+            user_agent=kwargs.pop("user_agent", client.user_agent),
+            timeout=kwargs.pop("timeout", client.timeout),
+            logger=kwargs.pop("logger", client.logger),
+            tls=kwargs.pop("tls", client.tls),
+            timeouts=kwargs.pop("timeouts", client.timeouts),
+            **kwargs,
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self.sessions)
+
+    async def authenticate(self) -> None:
+        """Logs every session in. Sessions also log in on first use."""
+        await asyncio.gather(*(session.authenticate() for session in self.sessions))
+
+    async def command(
+        self, command: CommandInput, lane: Union[Lane, str] = Lane.NORMAL
+    ) -> CommandResult:
+        """Runs a command on the next session its lane is granted.
+
+        Args:
+            command (BWKSCommand): The command class to execute
+            lane (Lane): Priority class, "interactive", "normal" or "bulk"
+
+        Returns:
+            BWKSCommand: The response from the server
+        """
+        lane = Lane(lane)
+        name = command.__class__.__name__
+        if is_list_command(name):
+            if self.list_scheduler is not None:
+                return await self._dispatch(command, Lane.LIST, self.list_scheduler)
+        elif self.hedging is not None and is_read_command(name):
+            return await self._hedged(command, lane)
+        return await self._dispatch(command, lane, self.scheduler)
+
+    async def _dispatch(
+        self,
+        command: CommandInput,
+        lane: Lane,
+        scheduler: LaneScheduler[AsyncClient],
+    ) -> CommandResult:
+        """Runs a command on one session from the scheduler"""
+        session = await scheduler.acquire(lane)
+        started: Optional[float] = None
+        outcome = Outcome.SUCCESS
+        try:
+            if self.rate_limit is not None:
+                await self.rate_limit.acquire()
+            started = time.monotonic()
+            result = await session.command(command)
+            outcome = classify(result)
+            return result
+        except asyncio.CancelledError:
+            if started is not None:
+                # The response may still arrive, it must not be read as the next one
+                await session.disconnect()
+            started = None
+            raise
+        except BaseException as e:
+            outcome = classify(error=e)
+            raise
+        finally:
+            if self.limiter is not None:
+                if started is None:
+                    self.limiter.discard()
+                else:
+                    self.limiter.release(time.monotonic() - started, outcome)
+            scheduler.release(session)
+            if self.list_scheduler is not None:
+                # Both share the limiter, a freed slot may suit the other one
+                other = (
+                    self.scheduler
+                    if scheduler is self.list_scheduler
+                    else self.list_scheduler
+                )
+                other.dispatch()
+
+    def lane_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue wait per lane: requests, queued, mean_wait, p95_wait, max_wait, waiting."""
+        stats = self.scheduler.as_dict()
+        if self.list_scheduler is not None:
+            stats[Lane.LIST.value] = self.list_scheduler.as_dict()[Lane.LIST.value]
+        return stats
+
+    async def _hedged(self, command: CommandInput, lane: Lane) -> CommandResult:
+        """Races a second copy of a slow read against the first"""
+        policy = self.hedging
+        assert policy is not None
+        name = command.__class__.__name__
+        delay = policy.delay_for(name)
+        primary = self._timed(command, lane)
+        tasks = [primary]
+        try:
+            if delay is None:
+                return await primary
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not policy.allow():
+                return await primary
+
+            tasks.append(self._timed(command, lane))
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next(iter(done))
+                # A failed copy only decides the result when the other failed too
+                if winner.exception() is None or not pending:
+                    break
+            if winner is tasks[1]:
+                policy.stats.hedge_wins += 1
+            for task in pending:
+                self._stragglers.add(task)
+                task.add_done_callback(self._straggler_done)
+            return winner.result()
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    def _straggler_done(self, task: "asyncio.Future[CommandResult]") -> None:
+        self._stragglers.discard(task)
+        # Nobody awaits the slower copy, mark any failure as seen
+        if not task.cancelled():
+            task.exception()
+
+    def _timed(
+        self, command: CommandInput, lane: Lane
+    ) -> "asyncio.Future[CommandResult]":
+        """Dispatches a read as a task that feeds its latency to the hedge policy"""
+        policy = self.hedging
+        assert policy is not None
+        name = command.__class__.__name__
+        started = time.monotonic()
+
+        def observe(task: "asyncio.Future[CommandResult]") -> None:
+            if not task.cancelled() and task.exception() is None:
+                policy.observe(name, time.monotonic() - started)
+
+        task = asyncio.ensure_future(self._dispatch(command, lane, self.scheduler))
+        task.add_done_callback(observe)
+        return task
+
+    async def close(self) -> None:
+        """Disconnects every session."""
+        for task in list(self._stragglers):
+            task.cancel()
+        await asyncio.gather(
+            *(session.disconnect() for session in self.sessions),
+            return_exceptions=True,
+        )
+
+
+class FailoverPool(BasePool):
+    """Spreads commands over SessionPools to several Application Servers.
+
+    Each host gets its own SessionPool. Every command goes to the healthy host
+    with the lowest expected latency, its smoothed latency times the requests it
+    already has in flight. Hosts that keep failing have their circuit breaker
+    opened and are skipped until a probe gets through. A command that cannot
+    connect moves to the next host straight away, reads also move after a
+    timeout or an overload response.
+
+    With ``pin_writes`` everything other than ``*Get*Request`` goes to the first
+    healthy host in ``hosts``, so reads use every node while writes stay on the
+    primary.
+
+    Args:
+        hosts (Sequence[str]): Application Servers, primary first.
+        size (int): Sessions per host.
+        pin_writes (bool): Keep writes on the primary host.
+        failure_threshold (int): Consecutive failures that open a host's breaker.
+        reset_timeout (float): Seconds before an open breaker lets a probe through.
+        limiter_factory (Callable, optional): Builds an AdaptiveLimiter for each host.
+        rate_limit_factory (Callable, optional): Builds a TokenBucket for each host.
+        **pool_kwargs: Passed to every SessionPool, e.g. username and password.
+    """
+
+    def __init__(
+        self,
+        hosts: Sequence[str],
+        size: int = 4,
+        pin_writes: bool = False,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        limiter_factory: Optional[Callable[[], AdaptiveLimiter]] = None,
+        rate_limit_factory: Optional[Callable[[], TokenBucket]] = None,
+        **pool_kwargs: Any,
+    ) -> None:
+        self.selector = HostSelector(
+            list(hosts),
+            pin_writes=pin_writes,
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+        )
+        self.pools: Dict[str, SessionPool] = {
+            host: SessionPool(
+                size=size,
+                host=host,
+                limiter=limiter_factory() if limiter_factory else None,
+                rate_limit=rate_limit_factory() if rate_limit_factory else None,
+                **pool_kwargs,
+            )
+            for host in self.selector.hosts
+        }
+
+    @property
+    def size(self) -> int:
+        return sum(pool.size for pool in self.pools.values())
+
+    async def authenticate(self) -> None:
+        """Logs in every session on every reachable host."""
+        await asyncio.gather(
+            *(pool.authenticate() for pool in self.pools.values()),
+            return_exceptions=True,
+        )
+
+    async def command(
+        self, command: CommandInput, lane: Union[Lane, str] = Lane.NORMAL
+    ) -> CommandResult:
+        """Runs a command on the best available host, moving on if it fails.
+
+        Args:
+            command (BWKSCommand): The command class to execute
+            lane (Lane): Priority class, "interactive", "normal" or "bulk"
+
+        Returns:
+            BWKSCommand: The response from the server
+
+        Raises:
+            MErrorNoHealthyHost: If every host's breaker is open
+        """
+        name = command.__class__.__name__
+        read = is_read_command(name)
+        tried: Set[str] = set()
+        last_error: Optional[BaseException] = None
+        overloaded: Optional[CommandResult] = None
+        while (host := self.selector.choose(write=not read, exclude=tried)) is not None:
+            tried.add(host)
+            health = self.selector.health[host]
+            health.in_flight += 1
+            started = time.monotonic()
+            try:
+                result = await self.pools[host].command(command, lane)
+            except asyncio.CancelledError:
+                self.selector.abandon(host)
+                raise
+            except MError as e:
+                self.selector.record(host, classify(error=e))
+                if not is_retryable(e, read):
+                    raise
+                last_error = e
+                continue
+            finally:
+                health.in_flight -= 1
+
+            outcome = classify(result)
+            self.selector.record(host, outcome, time.monotonic() - started)
+            if outcome is Outcome.OVERLOAD and read:
+                overloaded = result
+                continue
+            return result
+
+        # Every host was tried, an overload answer beats an exception
+        if overloaded is not None:
+            return overloaded
+        if last_error is not None:
+            raise last_error
+        raise MErrorNoHealthyHost(
+            "Every Application Server has its circuit breaker open"
+        )
+
+    def host_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Breaker state, latency, in flight, requests and failures per host."""
+        return self.selector.as_dict()
+
+    def lane_stats(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Queue wait per lane, per host."""
+        return {host: pool.lane_stats() for host, pool in self.pools.items()}
+
+    async def close(self) -> None:
+        await asyncio.gather(*(pool.close() for pool in self.pools.values()))
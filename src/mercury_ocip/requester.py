@@ -2,11 +2,13 @@ from asyncio.streams import StreamWriter
 from asyncio.streams import StreamReader
 import asyncio
 import socket
+import time
 import requests
 import ssl
 import logging
 from abc import ABC, abstractmethod
 from typing import Optional, Union, Awaitable
+from xml.sax.saxutils import escape
 
 from mercury_ocip.exceptions import (
     MErrorSocketInitialisation,
@@ -17,11 +19,12 @@ from mercury_ocip.exceptions import (
 )
 from mercury_ocip.libs.types import (
     RequestResult,
+    RawRequestResult,
     ConnectResult,
     DisconnectResult,
 )
+from mercury_ocip.utils.parser import OCI_ENCODING
 
-from lxml import etree, builder
 from zeep import Client, Settings, Transport
 from zeep import AsyncClient as AsyncClientZeep
 from zeep.transports import AsyncTransport
@@ -29,6 +32,13 @@ from httpx import AsyncClient as AsyncClientHttpx
 from httpx import Client as ClientHttpx
 
 
+OCI_DOCUMENT_HEAD = (
+    b"<?xml version='1.0' encoding='ISO-8859-1'?>\n"
+    b'<BroadsoftDocument xmlns="C" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" protocol="OCI">'
+)
+OCI_DOCUMENT_TAIL = b"</BroadsoftDocument>"
+
+
 class BaseRequester(ABC):
     """Base class for all requesters.
 
@@ -40,6 +50,8 @@ class BaseRequester(ABC):
         session_id (str): The session id of the requester.
     """
 
+    _RECV_SIZE = 65536
+
     def __init__(
         self,
         logger: logging.Logger,
@@ -65,6 +77,19 @@ class BaseRequester(ABC):
         """
         pass
 
+    @abstractmethod
+    def send_request_bytes(
+        self, command: Union[str, bytes], timeout: Optional[float] = None
+    ) -> Union[RawRequestResult, Awaitable[RawRequestResult]]:
+        """Sends a request to the server without decoding the response.
+
+        Args:
+            command (Union[str, bytes]): The serialised command, ideally already encoded.
+            timeout (float, optional): Seconds the whole request may take, instead of
+                the requester's timeout.
+        """
+        pass
+
     @abstractmethod
     def connect(
         self,
@@ -82,37 +107,46 @@ class BaseRequester(ABC):
         """Disconnects from the server."""
         pass
 
-    def build_oci_xml(self, command: str) -> bytes:
+    def build_oci_xml(self, command: Union[str, bytes]) -> bytes:
         """Builds an OCI XML request from the given BroadworksCommand.
 
         Constructs an XML document with a session ID and the encoded command,
-        wrapped in a BroadsoftDocument element with the OCI protocol.
+        wrapped in a BroadsoftDocument element with the OCI protocol. The command
+        is already well formed so it is framed as bytes rather than parsed again.
 
         Args:
-            command (BroadworksCommand): The command to be encoded into the XML.
+            command (Union[str, bytes]): The serialised command element.
 
         Returns:
             bytes: The serialized XML document as bytes, encoded with ISO-8859-1.
         """
+        if isinstance(command, str):
+            command = command.encode(OCI_ENCODING, errors="xmlcharrefreplace")
 
-        ElementMaker = builder.ElementMaker(
-            namespace="C",
-            nsmap={None: "C", "xsi": "http://www.w3.org/2001/XMLSchema-instance"},
+        session_id = escape(self.session_id or "").encode(
+            OCI_ENCODING, errors="xmlcharrefreplace"
         )
 
-        session_id = etree.Element("sessionId")
-        session_id.text = self.session_id
-        session_id.set("xmlns", "")
-
-        command_element = etree.fromstring(command.encode("ISO-8859-1"))
-
-        broadsoft_doc = ElementMaker.BroadsoftDocument(
-            session_id, command_element, protocol="OCI"
+        return b"".join(
+            (
+                OCI_DOCUMENT_HEAD,
+                b'<sessionId xmlns="">',
+                session_id,
+                b"</sessionId>",
+                command,
+                OCI_DOCUMENT_TAIL,
+            )
         )
 
-        return etree.tostring(
-            broadsoft_doc, xml_declaration=True, encoding="ISO-8859-1"
-        )
+    @staticmethod
+    def _document_complete(content: bytearray, searched: int) -> bool:
+        """Checks for the closing tag in data received since the last check.
+
+        Only the new tail is scanned, stepping back far enough to catch a tag
+        split across two reads.
+        """
+        start = max(0, searched - len(OCI_DOCUMENT_TAIL) + 1)
+        return content.find(OCI_DOCUMENT_TAIL, start) != -1
 
     def __del__(self) -> None:
         self.disconnect()
@@ -204,40 +238,72 @@ class SyncTCPRequester(BaseRequester):
         Returns:
             Any: The response from the server.
         """
+        response = self.send_request_bytes(command)
+        if isinstance(response, bytes):
+            return response.decode(OCI_ENCODING)
+        return response
+
+    def send_request_bytes(
+        self, command: Union[str, bytes], timeout: Optional[float] = None
+    ) -> RawRequestResult:
+        """Sends a request to the server and returns the response undecoded.
+
+        Args:
+            command (Union[str, bytes]): The command to send to the server.
+            timeout (float, optional): Seconds the whole request may take. Without
+                it the requester's timeout applies to each read.
+
+        Returns:
+            bytes: The raw response document, or an MError.
+        """
         try:
             if self.sock is None and isinstance(connection := self.connect(), MError):
                 return connection
 
             assert self.sock is not None
 
+            ends = None if timeout is None else time.monotonic() + timeout
+            self.sock.settimeout(self.timeout if timeout is None else timeout)
+
             command_bytes: bytes = self.build_oci_xml(command)
 
-            self.logger.debug(f"Sending command to {self.host}:{self.port}: {command}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    f"Sending command to {self.host}:{self.port}: {command!r}"
+                )
 
             self.sock.sendall(command_bytes + b"\n")
 
-            content = b""
+            content = bytearray()
             while True:
                 try:
-                    chunk: bytes = self.sock.recv(4096)
+                    if ends is not None:
+                        left = ends - time.monotonic()
+                        if left <= 0:
+                            raise socket.timeout("timed out")
+                        self.sock.settimeout(left)
+                    chunk: bytes = self.sock.recv(self._RECV_SIZE)
 
                     if not chunk:
                         self.logger.warning(
                             "Socket connection closed unexpectedly before receiving full message."
                         )
                         break
+                    searched = len(content)
                     content += chunk
 
-                    if b"</BroadsoftDocument>" in content:
+                    if self._document_complete(content, searched):
                         break
                 # Handle blocking IO errors and interruptions gracefully
                 except BlockingIOError:
                     continue
                 except InterruptedError:
                     continue
-            return content.rstrip(b"\n").decode("ISO-8859-1")
+            return bytes(content.rstrip(b"\n"))
         except socket.timeout as e:
             self.logger.error(f"Socket timed out: {self.__class__.__name__}: {e}")
+            # The response may still arrive, it must not be read as the next one
+            self.disconnect()
             return MErrorSocketTimeout(str(e))
 
 
@@ -313,12 +379,13 @@ class SyncSOAPRequester(BaseRequester):
                 pass
             finally:
                 self.client = None
+                self.zclient = None
 
-    def send_request(self, command: str) -> RequestResult:
+    def send_request(self, command: Union[str, bytes]) -> RequestResult:
         """Sends a request to the server.
 
         Args:
-            command (str): The command to send to the server.
+            command (Union[str, bytes]): The command to send to the server.
 
         Returns:
             Any: The response from the server.
@@ -340,12 +407,32 @@ class SyncSOAPRequester(BaseRequester):
             )
 
             return response
+        except requests.exceptions.Timeout as e:
+            self.logger.error(f"Request timed out in {self.__class__.__name__}: {e}")
+            self.disconnect()
+            return MErrorSocketTimeout(str(e))
         except Exception as e:
             self.logger.error(
                 f"Failed to send command over {self.__class__.__name__}: {e}"
             )
             return MErrorSendRequestFailed(str(e))
 
+    def send_request_bytes(
+        self, command: Union[str, bytes], timeout: Optional[float] = None
+    ) -> RawRequestResult:
+        """Sends a request to the server.
+
+        Zeep hands back the SOAP body as text, so the response is returned as
+        ``str`` the same as `send_request`.
+        """
+        if timeout is None:
+            return self.send_request(command)
+        if self.zclient is None and isinstance(connection := self.connect(), MError):
+            return connection
+        assert self.zclient is not None
+        with self.zclient.transport.settings(timeout=timeout):
+            return self.send_request(command)
+
     # def __del__(self):
     #     self.disconnect()
 
@@ -435,6 +522,25 @@ class AsyncTCPRequester(BaseRequester):
         Returns:
             Any: The response from the server.
         """
+        response = await self.send_request_bytes(command)
+        if isinstance(response, bytes):
+            return response.decode(OCI_ENCODING)
+        return response
+
+    async def send_request_bytes(
+        self, command: Union[str, bytes], timeout: Optional[float] = None
+    ) -> RawRequestResult:
+        """Sends a request to the server and returns the response undecoded.
+
+        Args:
+            command (Union[str, bytes]): The command to send to the server.
+            timeout (float, optional): Seconds the whole request may take. Without
+                it the requester's timeout applies to each read.
+
+        Returns:
+            bytes: The raw response document, or an MError.
+        """
+        ends = None if timeout is None else time.monotonic() + timeout
         try:
             if self.reader is None or self.writer is None:
                 result: MError | None = await self.connect()
@@ -445,30 +551,39 @@ class AsyncTCPRequester(BaseRequester):
 
             command_bytes: bytes = self.build_oci_xml(command)
 
-            self.logger.debug(f"Sending command to {self.host}:{self.port}: {command}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    f"Sending command to {self.host}:{self.port}: {command!r}"
+                )
 
             self.writer.write(command_bytes + b"\n")
             await self.writer.drain()
 
-            content = b""
+            content = bytearray()
             while True:
                 try:
                     chunk: bytes = await asyncio.wait_for(
-                        self.reader.read(4096), timeout=self.timeout
+                        self.reader.read(self._RECV_SIZE),
+                        timeout=self.timeout
+                        if ends is None
+                        else max(0.0, ends - time.monotonic()),
                     )
                 except asyncio.TimeoutError as e:
                     self.logger.error(
                         f"Socket read timed out in {self.__class__.__name__}: {e}"
                     )
+                    # The response may still arrive, it must not be read as the next one
+                    await self.disconnect()
                     return MErrorSocketTimeout(str(e))
 
                 if not chunk:
                     break
 
+                searched = len(content)
                 content += chunk
-                if b"</BroadsoftDocument>" in content:
+                if self._document_complete(content, searched):
                     break
-            return content.rstrip(b"\n").decode("ISO-8859-1")
+            return bytes(content.rstrip(b"\n"))
 
         except Exception as e:
             self.logger.error(
@@ -549,7 +664,7 @@ class AsyncSOAPRequester(BaseRequester):
             finally:
                 self.async_client = None
 
-    async def send_request(self, command: str) -> RequestResult:
+    async def send_request(self, command: Union[str, bytes]) -> RequestResult:
         """Sends a request to the server.
 
         Args:
@@ -577,6 +692,23 @@ class AsyncSOAPRequester(BaseRequester):
             )
             return MErrorSendRequestFailed(str(e))
 
+    async def send_request_bytes(
+        self, command: Union[str, bytes], timeout: Optional[float] = None
+    ) -> RawRequestResult:
+        """Sends a request to the server.
+
+        Zeep hands back the SOAP body as text, so the response is returned as
+        ``str`` the same as `send_request`.
+        """
+        if timeout is None:
+            return await self.send_request(command)
+        try:
+            return await asyncio.wait_for(self.send_request(command), timeout=timeout)
+        except asyncio.TimeoutError as e:
+            self.logger.error(f"Request timed out in {self.__class__.__name__}: {e}")
+            await self.disconnect()
+            return MErrorSocketTimeout(str(e))
+
 
 def create_requester(
     logger: logging.Logger,
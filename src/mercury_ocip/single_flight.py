@@ -0,0 +1,65 @@
+"""
+Single-flight coalescing of identical in-flight requests
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class CoalescingStats:
+    """Counters for a SingleFlight group.
+
+    Attributes:
+        requests: Calls made through the group.
+        coalesced: Calls answered by awaiting an identical call already in flight.
+    """
+
+    requests: int = 0
+    coalesced: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "coalesce_rate": self.coalesced / self.requests if self.requests else 0.0,
+        }
+
+
+@dataclass(slots=True)
+class SingleFlight:
+    """Shares one in-flight call between every caller asking for the same key.
+
+    The first caller starts the call as its own task, anyone arriving with the same
+    key before it finishes awaits that task instead of starting another. Callers
+    await it shielded, so one caller being cancelled never cancels the call for
+    the rest.
+    """
+
+    stats: CoalescingStats = field(default_factory=CoalescingStats)
+    _in_flight: Dict[str, "asyncio.Future[Any]"] = field(default_factory=dict)
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run ``call`` unless a call for ``key`` is already running, then share it."""
+        self.stats.requests += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def _finish(self, key: str, task: "asyncio.Future[Any]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the failure as seen, every caller may have been cancelled already
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,195 @@
+"""
+Per command timeouts learned from latency, and deadlines bounding a whole job
+"""
+
+import contextvars
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Deque, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from mercury_ocip.utils.defines import parse_version
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "mercury_ocip_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Bounds every command sent inside the block to ``seconds`` from now.
+
+    Each request's timeout is cut to the time left, and once it is spent
+    commands fail with MErrorDeadlineExceeded without being sent. Nested
+    deadlines keep the earlier one. Tasks started inside the block inherit it.
+    ``None`` leaves the current deadline, if any, as it is.
+
+    Example:
+        with deadline(5.0):
+            client.command(UserGetRequest23V2(user_id=...))
+            client.command(UserDoNotDisturbGetRequest(user_id=...))
+    """
+    if seconds is None:
+        yield
+        return
+    ends = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(ends if current is None else min(current, ends))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, None outside of one."""
+    ends = _deadline.get()
+    return None if ends is None else ends - time.monotonic()
+
+
+@dataclass(slots=True)
+class TimeoutStats:
+    """Counters for a TimeoutPolicy.
+
+    Attributes:
+        learned: Timeouts taken from observed latency.
+        overridden: Timeouts taken from an override.
+        defaulted: Timeouts left at the client default, too few samples.
+        timeouts: Requests that ran out of time.
+    """
+
+    learned: int = 0
+    overridden: int = 0
+    defaulted: int = 0
+    timeouts: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "learned": self.learned,
+            "overridden": self.overridden,
+            "defaulted": self.defaulted,
+            "timeouts": self.timeouts,
+        }
+
+
+class TimeoutPolicy:
+    """Chooses the timeout for each command from what that command type usually takes.
+
+    Latency is kept per command class. Once a class has ``min_samples`` responses
+    its timeout is the ``percentile`` latency of the last ``window`` responses
+    times ``multiplier``, kept between ``min_timeout`` and ``max_timeout``. Until
+    then the client's own timeout is used. A request that times out counts as a
+    sample of the timeout it was given, so a class that keeps running out of
+    time has its timeout raised.
+
+    Overrides are fixed timeouts by command class name, with or without the
+    version suffix, or glob patterns such as ``"*GetListInSystemRequest"``.
+
+    Args:
+        overrides (Mapping[str, float], optional): Fixed timeouts in seconds.
+        percentile (float): Latency percentile the timeout is based on, 0 to 1.
+        multiplier (float): Headroom over that percentile.
+        min_timeout (float): Learned timeouts never drop below this.
+        max_timeout (float, optional): Learned timeouts never grow past this.
+        min_samples (int): Responses seen for a class before its timeout is learned.
+        window (int): Recent latencies kept per command class.
+    """
+
+    def __init__(
+        self,
+        overrides: Optional[Mapping[str, float]] = None,
+        percentile: float = 0.99,
+        multiplier: float = 3.0,
+        min_timeout: float = 1.0,
+        max_timeout: Optional[float] = None,
+        min_samples: int = 20,
+        window: int = 256,
+    ) -> None:
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if multiplier < 1:
+            raise ValueError("multiplier must be at least 1")
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        self.window = window
+        self.stats = TimeoutStats()
+        self._exact: Dict[str, float] = {}
+        self._patterns: List[Tuple[str, float]] = []
+        self._resolved: Dict[str, Optional[float]] = {}
+        for key, seconds in (overrides or {}).items():
+            self.override(key, seconds)
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._learned: Dict[str, float] = {}
+        self._unsorted: Dict[str, int] = {}
+
+    def override(self, command: str, seconds: float) -> None:
+        """Fix the timeout of a command class, base name or glob pattern."""
+        if any(char in command for char in "*?["):
+            self._patterns.append((command, seconds))
+        else:
+            self._exact[command] = seconds
+        self._resolved.clear()
+
+    def timeout_for(self, command: str, default: float) -> float:
+        """Timeout in seconds for the next request of a command class."""
+        fixed = self._override_for(command)
+        if fixed is not None:
+            self.stats.overridden += 1
+            return fixed
+        samples = self._latencies.get(command)
+        if samples is None or len(samples) < self.min_samples:
+            self.stats.defaulted += 1
+            return default
+        # Sorting on every request is wasteful, refresh after a few new samples
+        if command not in self._learned or self._unsorted[command] >= 16:
+            ordered = sorted(samples)
+            index = min(len(ordered) - 1, int(len(ordered) * self.percentile))
+            learned = max(self.min_timeout, ordered[index] * self.multiplier)
+            if self.max_timeout is not None:
+                learned = min(self.max_timeout, learned)
+            self._learned[command] = learned
+            self._unsorted[command] = 0
+        self.stats.learned += 1
+        return self._learned[command]
+
+    def observe(self, command: str, latency: float, timed_out: bool = False) -> None:
+        """Record how long a request took, or the timeout it ran out of."""
+        if timed_out:
+            self.stats.timeouts += 1
+        samples = self._latencies.get(command)
+        if samples is None:
+            samples = self._latencies[command] = deque(maxlen=self.window)
+            self._unsorted[command] = 0
+        samples.append(latency)
+        self._unsorted[command] += 1
+        if timed_out:
+            # Do not wait for the next refresh, the current timeout is too short
+            self._learned.pop(command, None)
+
+    def _override_for(self, command: str) -> Optional[float]:
+        if command not in self._resolved:
+            self._resolved[command] = self._match_override(command)
+        return self._resolved[command]
+
+    def _match_override(self, command: str) -> Optional[float]:
+        if command in self._exact:
+            return self._exact[command]
+        try:
+            base = parse_version(command)[0]
+        except ValueError:
+            base = command
+        if base in self._exact:
+            return self._exact[base]
+        for pattern, seconds in self._patterns:
+            if fnmatchcase(command, pattern):
+                return seconds
+        return None
+
+    def as_dict(self) -> Dict[str, float]:
+        """Current learned timeout per command class."""
+        return dict(self._learned)
@@ -2,6 +2,7 @@ import re
 import string
 import secrets
 import random
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 
 def to_snake_case(name: str) -> str:
@@ -237,6 +238,9 @@ def highest_version_for(command: str, defined_names: set[str]) -> str | None:
 
     Returns:
         str: The highest version of the class name, or None if no versioned variant is found.
+
+    Note:
+        Scans every name on each call. Build a VersionIndex once when resolving many names.
     """
 
     base_command, _, _, _ = parse_version(command)
@@ -256,3 +260,145 @@ def highest_version_for(command: str, defined_names: set[str]) -> str | None:
     matching.sort(key=lambda x: (x[1], x[2], x[3]), reverse=True)
 
     return matching[0][0]
+
+
+def parse_release(release: Union[str, int]) -> Tuple[int, int]:
+    """
+    Parse an Application Server release into (major, service_pack).
+
+    Accepts the forms seen in the wild: ``22``, ``"22"``, ``"R22"``, ``"21sp1"``, ``"24.0"``.
+    Calendar releases (``"2023.10"``) follow every numbered release so they support
+    every version.
+
+    Args:
+        release (Union[str, int]): The release to parse.
+
+    Returns:
+        tuple[int, int]: (major, service_pack)
+
+    Raises:
+        ValueError: If no release number can be found.
+    """
+    if isinstance(release, int):
+        return (release, 0)
+
+    match = re.search(r"(\d+)(?:\.\d+)?(?:\s*sp(\d+))?", release, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid release format: {release}")
+
+    major = int(match.group(1))
+    if major >= 1000:
+        return (major, 0)
+    return (major, int(match.group(2)) if match.group(2) else 0)
+
+
+class VersionIndex:
+    """
+    Precomputed map from base command name to its defined versions, newest first.
+
+    Built once from the defined class names so lookups never rescan them.
+    ``latest`` is a single dict lookup, ``resolve`` with a release walks only the
+    versions of that one command.
+
+    Args:
+        names (Iterable[str]): Defined class names, e.g. the dispatch table keys.
+    """
+
+    __slots__ = ("_versions", "_latest")
+
+    def __init__(self, names: Iterable[str]) -> None:
+        versions: Dict[str, List[Tuple[Tuple[int, int, int], str]]] = {}
+        for name in names:
+            try:
+                base, major, sp, v = parse_version(name)
+            except ValueError:
+                continue
+            versions.setdefault(base, []).append(((major, sp, v), name))
+
+        self._versions: Dict[str, List[Tuple[Tuple[int, int, int], str]]] = {}
+        self._latest: Dict[str, str] = {}
+        for base, found in versions.items():
+            found.sort(reverse=True)
+            self._versions[base] = found
+            self._latest[base] = found[0][1]
+
+    @staticmethod
+    def base_of(command: str) -> str:
+        """The base name of a versioned or unversioned command name."""
+        return parse_version(command)[0]
+
+    def latest(self, command: str) -> Optional[str]:
+        """The newest defined version of ``command``, or None."""
+        return self._latest.get(self.base_of(command))
+
+    def versions(self, command: str) -> List[str]:
+        """Every defined version of ``command``, newest first."""
+        return [name for _, name in self._versions.get(self.base_of(command), [])]
+
+    def resolve(
+        self, command: str, max_release: Optional[Union[str, int]] = None
+    ) -> Optional[str]:
+        """
+        The newest version of ``command`` an Application Server release supports.
+
+        Args:
+            command (str): Base or versioned command name, e.g. "UserGetRequest".
+            max_release (Union[str, int], optional): The target release, e.g. "22" or "21sp1".
+                Newest overall when omitted.
+
+        Returns:
+            str: The resolved class name, or None if no version fits.
+        """
+        if max_release is None:
+            return self.latest(command)
+
+        limit = parse_release(max_release)
+        for (major, sp, _), name in self._versions.get(self.base_of(command), []):
+            if (major, sp) <= limit:
+                return name
+        return None
+
+    def __contains__(self, command: str) -> bool:
+        try:
+            return self.base_of(command) in self._latest
+        except ValueError:
+            return False
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+
+READ_COMMAND_PATTERN = re.compile(r"Get\w*Request")
+
+
+def is_read_command(command: str) -> bool:
+    """
+    Whether a command class name is a read, i.e. a ``*Get*Request``.
+
+    Reads never change server state so their responses are safe to cache and share.
+
+    Args:
+        command (str): The name of the command class (e.g., "GroupHuntGroupGetInstanceListRequest").
+
+    Returns:
+        bool: True for Get requests, False for everything else.
+    """
+    return READ_COMMAND_PATTERN.search(command) is not None
+
+
+LIST_COMMAND_PATTERN = re.compile(r"Get\w*ListIn\w*Request")
+
+
+def is_list_command(command: str) -> bool:
+    """
+    Whether a command class name lists everything in a group, enterprise or system.
+
+    These scans (e.g. UserGetListInSystemRequest) can run for seconds on large systems.
+
+    Args:
+        command (str): The name of the command class (e.g., "UserGetListInGroupRequest").
+
+    Returns:
+        bool: True for ``*Get*ListIn*Request`` commands.
+    """
+    return LIST_COMMAND_PATTERN.search(command) is not None
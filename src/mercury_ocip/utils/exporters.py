@@ -0,0 +1,428 @@
+import csv
+import io
+import json
+import os
+from contextlib import contextmanager
+from itertools import chain, islice
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    get_type_hints,
+)
+
+from mercury_ocip.exceptions import MErrorMissingDependency
+from mercury_ocip.utils.defines import to_snake_case
+from mercury_ocip.utils.parser import Parser
+
+if TYPE_CHECKING:
+    import orjson
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+else:
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover - optional fast path
+        orjson = None
+
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:  # pragma: no cover - optional dependency
+        pyarrow = None
+
+type Row = Dict[str, Any]
+type ExportTarget = Union[str, os.PathLike, IO]
+
+DEFAULT_BATCH_SIZE = 10_000
+
+__all__ = [
+    "iter_rows",
+    "flatten_row",
+    "export_csv",
+    "export_jsonl",
+    "export_parquet",
+    "export_arrow",
+    "iter_record_batches",
+]
+
+
+def iter_rows(source: Any, table: Optional[str] = None) -> Iterator[Row]:
+    """Yield rows from an OCITable, an OCIType or any iterable of rows.
+
+    - OCITable: one row per table row, keyed by snake_case column heading.
+    - OCIType: the rows of its table when it has one (or the one named by ``table``),
+      otherwise the type itself as a single row.
+    - Iterables: each item as a row, OCIType items are converted with to_dict.
+
+    Rows are produced one at a time so exports never hold the full result set.
+    """
+    from mercury_ocip.commands.base_command import OCIType
+
+    found = _table_of(source, table)
+    if found is not None:
+        yield from found.iter_rows()
+        return
+
+    if isinstance(source, dict):
+        yield source
+        return
+
+    if isinstance(source, OCIType):
+        yield Parser.to_dict_from_class(source)
+        return
+
+    for item in source:
+        if isinstance(item, OCIType):
+            yield Parser.to_dict_from_class(item)
+        else:
+            yield item
+
+
+def flatten_row(row: Row, prefix: str = "") -> Row:
+    """Flatten nested values into a single level row.
+
+    Keys follow the bulk CSV header syntax (``address.city``, ``alias[0]``) so an
+    exported record can be edited and fed straight back into a bulk sheet.
+    """
+    if not prefix and not any(isinstance(v, (dict, list)) for v in row.values()):
+        return row
+
+    flat: Row = {}
+    for key, value in row.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_row(value, f"{path}."))
+        elif isinstance(value, list):
+            for index, item in enumerate(value):
+                if isinstance(item, dict):
+                    flat.update(flatten_row(item, f"{path}[{index}]."))
+                else:
+                    flat[f"{path}[{index}]"] = item
+        else:
+            flat[path] = value
+    return flat
+
+
+def export_csv(
+    source: Any,
+    target: ExportTarget,
+    fieldnames: Optional[Sequence[str]] = None,
+    table: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Write rows to CSV incrementally.
+
+    Nested values are flattened. Columns come from ``fieldnames`` or the first row,
+    keys missing from a later row are left blank. Keys outside ``fieldnames`` are
+    dropped, but without it a later row with a key the first row lacks raises
+    ValueError, pass ``fieldnames`` for rows whose columns differ.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        ValueError: If a row has a column the header lacks and ``fieldnames`` was not given.
+    """
+    found = _table_of(source, table)
+    if found is not None and fieldnames is None:
+        return _export_table_csv(found, target, batch_size)
+
+    rows = (flatten_row(row) for row in iter_rows(source, table))
+    count = 0
+    with _open(target, binary=False, newline="") as handle:
+        first = next(rows, None)
+        if first is None:
+            if fieldnames:
+                csv.writer(handle).writerow(fieldnames)
+            return 0
+
+        writer = csv.DictWriter(
+            handle,
+            fieldnames=list(fieldnames or first.keys()),
+            extrasaction="ignore" if fieldnames else "raise",
+        )
+        writer.writeheader()
+        writer.writerow(first)
+        count = 1
+        for batch in _batched(rows, batch_size):
+            try:
+                writer.writerows(batch)
+            except ValueError as e:
+                raise ValueError(
+                    f"Row {count + 1} onwards: {e}, pass fieldnames= to export "
+                    "rows whose columns differ"
+                ) from e
+            count += len(batch)
+    return count
+
+
+def export_jsonl(
+    source: Any,
+    target: ExportTarget,
+    table: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> int:
+    """Write one JSON object per line. Uses orjson when installed.
+
+    Returns:
+        int: The number of rows written.
+    """
+    count = 0
+    with _open(target, binary=True) as handle:
+        text = isinstance(handle, io.TextIOBase)
+        for batch in _batched(iter_rows(source, table), batch_size):
+            chunk = b"".join(_dump_json(row) for row in batch)
+            handle.write(chunk.decode("utf-8") if text else chunk)
+            count += len(batch)
+    return count
+
+
+def iter_record_batches(
+    source: Any,
+    table: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    schema: Optional["pyarrow.Schema"] = None,
+) -> Iterator["pyarrow.RecordBatch"]:
+    """Yield Arrow record batches of flattened rows. Requires pyarrow.
+
+    Every batch shares one schema and rows are streamed a batch at a time. With
+    ``schema`` given, keys outside it are dropped. Otherwise the schema is taken
+    from the first batch, columns that are null throughout it are strings, and a
+    later row with a column the first batch lacks raises ValueError. Tables
+    export their columns as strings, or cast to ``schema``.
+
+    At least one batch is always yielded, empty when there are no rows, so
+    writers always have a schema.
+
+    Raises:
+        ValueError: If a row after the first batch adds a column and ``schema`` was not given.
+    """
+    _require_pyarrow()
+    found = _table_of(source, table)
+    if found is not None:
+        yield from _table_record_batches(found, batch_size, schema)
+        return
+
+    rows = (flatten_row(row) for row in iter_rows(source, table))
+    if schema is not None:
+        empty = True
+        for batch in _batched(rows, batch_size):
+            empty = False
+            yield pyarrow.RecordBatch.from_pylist(batch, schema=schema)
+        if empty:
+            yield pyarrow.RecordBatch.from_pylist([], schema=schema)
+        return
+
+    batches = _batched(rows, batch_size)
+    first = next(batches, None)
+    if first is None:
+        yield pyarrow.RecordBatch.from_pylist([], schema=pyarrow.schema([]))
+        return
+
+    columns: Dict[str, None] = {}
+    for row in first:
+        columns.update(dict.fromkeys(row))
+    record_batch = pyarrow.RecordBatch.from_pydict(
+        {column: [row.get(column) for row in first] for column in columns}
+    )
+    schema = pyarrow.schema(
+        [
+            field.with_type(pyarrow.string())
+            if pyarrow.types.is_null(field.type)
+            else field
+            for field in record_batch.schema
+        ]
+    )
+    yield _conform(record_batch, schema)
+
+    seen = len(first)
+    for batch in batches:
+        added = {key for row in batch for key in row}.difference(schema.names)
+        if added:
+            raise ValueError(
+                f"Columns {', '.join(sorted(added))} first appear after row {seen}, "
+                "pass schema= to export rows whose columns differ"
+            )
+        yield pyarrow.RecordBatch.from_pylist(batch, schema=schema)
+        seen += len(batch)
+
+
+def export_parquet(
+    source: Any,
+    target: ExportTarget,
+    table: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compression: str = "snappy",
+    schema: Optional["pyarrow.Schema"] = None,
+) -> int:
+    """Write rows to a Parquet file one record batch at a time. Requires pyarrow.
+
+    The file is written even when there are no rows. See `iter_record_batches`
+    for how the schema is chosen.
+
+    Returns:
+        int: The number of rows written.
+    """
+    batches = iter_record_batches(source, table, batch_size, schema)
+    first = next(batches)
+    count = 0
+    with pyarrow.parquet.ParquetWriter(
+        target, first.schema, compression=compression
+    ) as writer:
+        for record_batch in chain([first], batches):
+            if record_batch.num_rows:
+                writer.write_batch(record_batch)
+                count += record_batch.num_rows
+    return count
+
+
+def export_arrow(
+    source: Any,
+    target: ExportTarget,
+    table: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    schema: Optional["pyarrow.Schema"] = None,
+) -> int:
+    """Write rows to an Arrow IPC file one record batch at a time. Requires pyarrow.
+
+    The file is written even when there are no rows. See `iter_record_batches`
+    for how the schema is chosen.
+
+    Returns:
+        int: The number of rows written.
+    """
+    batches = iter_record_batches(source, table, batch_size, schema)
+    first = next(batches)
+    count = 0
+    with pyarrow.ipc.new_file(target, first.schema) as writer:
+        for record_batch in chain([first], batches):
+            if record_batch.num_rows:
+                writer.write_batch(record_batch)
+                count += record_batch.num_rows
+    return count
+
+
+def _export_table_csv(table: Any, target: ExportTarget, batch_size: int) -> int:
+    """Tables are already flat, write their columns without building dicts."""
+    count = 0
+    with _open(target, binary=False, newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(_table_headings(table))
+        for batch in _batched((row.col for row in table.row), batch_size):
+            writer.writerows(batch)
+            count += len(batch)
+    return count
+
+
+def _table_record_batches(
+    table: Any, batch_size: int, schema: Optional["pyarrow.Schema"]
+) -> Iterator["pyarrow.RecordBatch"]:
+    headings = _table_headings(table)
+    strings = pyarrow.schema([(heading, pyarrow.string()) for heading in headings])
+    empty = True
+    for batch in _batched((row.col for row in table.row), batch_size):
+        empty = False
+        columns = [pyarrow.array(column, pyarrow.string()) for column in zip(*batch)]
+        record_batch = pyarrow.RecordBatch.from_arrays(columns, schema=strings)
+        yield record_batch if schema is None else _conform(record_batch, schema)
+    if empty:
+        yield pyarrow.RecordBatch.from_pylist([], schema=schema or strings)
+
+
+def _conform(
+    record_batch: "pyarrow.RecordBatch", schema: "pyarrow.Schema"
+) -> "pyarrow.RecordBatch":
+    """Cast a batch to ``schema``, filling columns it lacks with nulls."""
+    columns = []
+    for field in schema:
+        index = record_batch.schema.get_field_index(field.name)
+        if index == -1:
+            columns.append(pyarrow.nulls(record_batch.num_rows, field.type))
+        else:
+            columns.append(record_batch.column(index).cast(field.type))
+    return pyarrow.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def _table_headings(table: Any) -> List[str]:
+    return [to_snake_case(heading) for heading in table.col_heading]
+
+
+def _table_of(source: Any, name: Optional[str]) -> Any:
+    """Return the table ``source`` exports as, if any."""
+    from mercury_ocip.commands.base_command import OCIType, OCITable
+
+    if isinstance(source, OCITable):
+        return source
+    if isinstance(source, OCIType):
+        return _find_table(source, name)
+    return None
+
+
+def _find_table(source: Any, name: Optional[str]) -> Any:
+    """Return the named table, or the only table on the type."""
+    if name is not None:
+        found = getattr(source, name, None)
+        if not hasattr(found, "iter_rows"):
+            raise ValueError(f"{source.__class__.__name__} has no table named '{name}'")
+        return found
+
+    tables = [
+        value
+        for value in (
+            getattr(source, attr, None) for attr in get_type_hints(type(source))
+        )
+        if hasattr(value, "iter_rows")
+    ]
+    if len(tables) > 1:
+        raise ValueError(
+            f"{source.__class__.__name__} has {len(tables)} tables, pass table= to choose one"
+        )
+    return tables[0] if tables else None
+
+
+def _dump_json(row: Row) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(row, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return (
+        json.dumps(row, default=str, ensure_ascii=False, separators=(",", ":")) + "\n"
+    ).encode("utf-8")
+
+
+def _batched(rows: Iterable[Row], size: int) -> Iterator[List[Row]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@contextmanager
+def _open(
+    target: ExportTarget, binary: bool, newline: Optional[str] = None
+) -> Iterator[IO]:
+    """Open a path for writing, or use an already open file as is."""
+    if not isinstance(target, (str, os.PathLike)):
+        yield target
+        return
+
+    if binary:
+        with open(target, "wb") as handle:
+            yield handle
+    else:
+        with open(target, "w", encoding="utf-8", newline=newline) as handle:
+            yield handle
+
+
+def _require_pyarrow() -> None:
+    if pyarrow is None:
+        raise MErrorMissingDependency(
+            "pyarrow is required for Parquet and Arrow exports, install mercury-ocip[export]"
+        )
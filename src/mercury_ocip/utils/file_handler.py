@@ -1,6 +1,6 @@
 import csv
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 
 class FileHandler:
@@ -16,6 +16,36 @@ class FileHandler:
             reader = csv.DictReader(file)
             return [dict(row) for row in reader if any(row.values())]
 
+    @staticmethod
+    def iter_csv_rows(file_path: str) -> Iterator[Dict[str, str]]:
+        """Read a CSV file one row at a time, keyed by the header row
+
+        Blank rows are skipped and short rows leave out their missing columns.
+        Only the current row is held, so the file can be any size.
+        """
+        FileHandler._check_file_exists(file_path)
+        return FileHandler._iter_csv_rows(file_path)
+
+    @staticmethod
+    def count_csv_rows(file_path: str) -> int:
+        """Count the rows `iter_csv_rows` would yield, without keeping any"""
+        FileHandler._check_file_exists(file_path)
+        with open(file_path, mode="r", encoding="utf-8-sig", newline="") as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            return sum(1 for values in reader if any(values))
+
+    @staticmethod
+    def _iter_csv_rows(file_path: str) -> Iterator[Dict[str, str]]:
+        with open(file_path, mode="r", encoding="utf-8-sig", newline="") as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                return
+            for values in reader:
+                if any(values):
+                    yield dict(zip(header, values))
+
     def _check_file_exists(file_path: str) -> bool:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File {file_path} does not exist")
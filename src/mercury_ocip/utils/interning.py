@@ -0,0 +1,80 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass(slots=True)
+class InternStats:
+    """Deduplication counters for decoded response values.
+
+    Attributes:
+        hits: Values that were replaced by an already seen string.
+        misses: Values seen for the first time.
+        bytes_saved: Approximate memory released by sharing repeated values.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+
+    def merge(self, other: "InternStats") -> None:
+        self.hits += other.hits
+        self.misses += other.misses
+        self.bytes_saved += other.bytes_saved
+
+    def as_dict(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+            "dedup_ratio": self.hits / total if total else 0.0,
+        }
+
+
+@dataclass(slots=True)
+class InternTable:
+    """Shares one string object between equal values while decoding responses.
+
+    System wide list responses repeat the same service provider, group, domain and
+    device type values on every row. Routing each value through the table means
+    all of those rows point at a single string instead of holding their own copy.
+
+    A fresh table is used for each decode unless one is given to the client, in which
+    case values are shared across every response that client decodes.
+
+    Args:
+        max_length (int): Longer values are returned untouched as they rarely repeat.
+        max_entries (int): Once reached, new values are no longer stored but existing
+            entries are still shared. Keeps long lived client tables bounded.
+    """
+
+    max_length: int = 128
+    max_entries: int = 100_000
+    stats: InternStats = field(default_factory=InternStats)
+    _values: Dict[str, str] = field(default_factory=dict)
+
+    def intern(self, value: str) -> str:
+        """Return the shared instance of ``value``."""
+        if len(value) > self.max_length:
+            return value
+
+        shared = self._values.get(value)
+        if shared is not None:
+            if shared is not value:
+                self.stats.hits += 1
+                self.stats.bytes_saved += sys.getsizeof(value)
+            return shared
+
+        self.stats.misses += 1
+        if len(self._values) < self.max_entries:
+            self._values[value] = value
+        return value
+
+    def clear(self) -> None:
+        """Drop stored values and reset the counters."""
+        self._values.clear()
+        self.stats = InternStats()
+
+    def __len__(self) -> int:
+        return len(self._values)
@@ -1,7 +1,13 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import io
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 import xmltodict
 from typing import (
+    Callable,
+    Optional,
     get_type_hints,
     List,
     get_args,
@@ -16,10 +22,16 @@ from typing import (
 )
 
 from mercury_ocip.utils.defines import snake_to_camel, to_snake_case
+from mercury_ocip.utils.interning import InternStats, InternTable
 
 OCIType = TypeVar("OCIType")
 T = TypeVar("T")
 
+# Encoding BroadWorks uses for OCI-P documents
+OCI_ENCODING = "ISO-8859-1"
+
+type XMLInput = Union[str, bytes, bytearray, memoryview]
+
 
 @runtime_checkable
 class HasFieldAliases(Protocol):
@@ -35,16 +47,54 @@ class Parser:
     method table:
 
     - to_xml_from_class: Translates class object to xml
+    - to_xml_bytes_from_class: Translates class object to encoded xml bytes
     - to_xml_from_dict: Translates dictionary object to xml
     - to_dict_from_class: Translates class object to dictionary
-    - to_dict_from_xml: Translates xml into dictionary
+    - to_dict_from_xml: Translates xml (str or bytes) into dictionary
     - to_class_from_dict: Translates dictionary object to class
-    - to_class_from_xml: Translates xml to class
+    - to_class_from_xml: Translates xml (str or bytes) to class
+
+    Decoded values are deduplicated through InternTable, ``intern_stats`` holds the
+    running totals for this process.
     """
 
+    intern_stats: InternStats = InternStats()
+
     @staticmethod
     def to_xml_from_class(obj: object) -> str:
         """Convert a class instance to XML string."""
+        output = xmltodict.unparse(
+            {"command": Parser._command_content(obj)},
+            full_document=False,
+            short_empty_elements=True,
+        )
+
+        if not isinstance(output, str):
+            raise ValueError("XML output is not a string")
+
+        return output
+
+    @staticmethod
+    def to_xml_bytes_from_class(obj: object, encoding: str = OCI_ENCODING) -> bytes:
+        """Convert a class instance straight to encoded XML bytes.
+
+        Used on the wire path so the command is written in the OCI encoding once
+        instead of being built as a str and encoded again by the requester.
+        Characters outside the encoding are written as character references.
+        """
+        buffer = io.BytesIO()
+        xmltodict.unparse(
+            {"command": Parser._command_content(obj)},
+            output=buffer,
+            encoding=encoding,
+            full_document=False,
+            short_empty_elements=True,
+        )
+        return buffer.getvalue()
+
+    @staticmethod
+    def _command_content(obj: object) -> Dict[str, Any]:
+        """Build the xmltodict tree for the <command> element of a class instance."""
         aliases: Dict[str, str] = {}
         if isinstance(obj, HasFieldAliases):
             aliases = obj.get_field_aliases()
@@ -143,14 +193,7 @@ class Parser:
                     str(value).lower() if isinstance(value, bool) else value
                 )
 
-        output = xmltodict.unparse(
-            {"command": root_content}, full_document=False, short_empty_elements=True
-        )
-
-        if not isinstance(output, str):
-            raise ValueError("XML output is not a string")
-
-        return output
+        return root_content
 
     @staticmethod
     def to_xml_from_dict(data: Dict[str, Any], cls: Type[OCIType]) -> str:
@@ -211,23 +254,54 @@ class Parser:
         return attributes
 
     @staticmethod
-    def to_dict_from_xml(xml: str) -> Dict[str, Any]:
-        """Parse XML string to dictionary."""
-        if not isinstance(xml, str):
+    def to_dict_from_xml(
+        xml: XMLInput, intern_table: Optional[InternTable] = None
+    ) -> Dict[str, Any]:
+        """Parse XML to dictionary.
+
+        Accepts str or the raw bytes read from the wire. Bytes are parsed as is in the
+        OCI encoding (ISO-8859-1), so responses never need decoding first.
+
+        Repeated values are shared through an InternTable. A new table is used for each
+        call unless one is passed in to share values across several decodes.
+        """
+        if not isinstance(xml, (str, bytes, bytearray, memoryview)):
             return {}
 
-        parsed = xmltodict.parse(xml)
+        if isinstance(xml, str):
+            parsed = xmltodict.parse(xml)
+        else:
+            parsed = xmltodict.parse(bytes(xml), encoding=OCI_ENCODING)
         if not parsed or not isinstance(parsed, dict):
             return {}
 
+        table = intern_table if intern_table is not None else InternTable()
+        hits, misses, saved = (
+            table.stats.hits,
+            table.stats.misses,
+            table.stats.bytes_saved,
+        )
+
         root_key = next(iter(parsed.keys()))
         root_val = parsed[root_key]
-
-        return cast(Dict[str, Any], Parser._process_dict_item(root_key, root_val))
+        result = Parser._process_dict_item(root_key, root_val, table)
+
+        # Only count what this decode added, shared tables carry earlier totals
+        Parser.intern_stats.merge(
+            InternStats(
+                hits=table.stats.hits - hits,
+                misses=table.stats.misses - misses,
+                bytes_saved=table.stats.bytes_saved - saved,
+            )
+        )
+        return cast(Dict[str, Any], result)
 
     @staticmethod
-    def _process_dict_item(key: str, value: Any) -> Any:
+    def _process_dict_item(
+        key: str, value: Any, intern_table: Optional[InternTable] = None
+    ) -> Any:
         """Process individual dictionary items during XML parsing."""
+        intern = intern_table.intern if intern_table is not None else None
         # Handle OCITable special case
         if (
             "Table" in key
@@ -250,6 +324,8 @@ class Parser:
                 cols = r.get("col", [])
                 if not isinstance(cols, list):
                     cols = [cols]
+                if intern is not None:
+                    cols = [intern(c) if isinstance(c, str) else c for c in cols]
                 rows.append(OCITableRow(col=cols))
 
             return OCITable(col_heading=col_headings, row=rows)
@@ -257,7 +333,8 @@ class Parser:
         # Handle dictionaries
         if isinstance(value, dict):
             if "#text" in value:
-                return value["#text"]
+                text = value["#text"]
+                return intern(text) if intern is not None else text
 
             new_val: Dict[str, Any] = {}
             attributes: Dict[str, Any] = {}
@@ -278,9 +355,11 @@ class Parser:
                         attributes[attr_name] = v
                 else:
                     if isinstance(v, list):
-                        new_val[k] = [Parser._process_dict_item(k, i) for i in v]
+                        new_val[k] = [
+                            Parser._process_dict_item(k, i, intern_table) for i in v
+                        ]
                     else:
-                        new_val[k] = Parser._process_dict_item(k, v)
+                        new_val[k] = Parser._process_dict_item(k, v, intern_table)
 
             if attributes:
                 new_val["attributes"] = attributes
@@ -291,6 +370,9 @@ class Parser:
         if value is None:
             return ""
 
+        if intern is not None and isinstance(value, str):
+            return intern(value)
+
         return value
 
     @staticmethod
@@ -328,10 +410,12 @@ class Parser:
         init_args: Dict[str, Any] = {}
 
         for key, hint in type_hints.items():
-            if key not in snake_case_source:
+            # Base types such as ErrorResponse keep the camelCase names of the schema
+            name = key if key in snake_case_source else to_snake_case(key)
+            if name not in snake_case_source:
                 continue
 
-            val = snake_case_source[key]
+            val = snake_case_source[name]
             origin = getattr(hint, "__origin__", None)
             args = get_args(hint)
 
@@ -377,67 +461,272 @@ class Parser:
         return cls(**init_args)
 
     @staticmethod
-    def to_class_from_xml(xml: str, cls: Type[OCIType]) -> OCIType:
-        """Parse XML string and convert to class instance."""
-        return Parser.to_class_from_dict(Parser.to_dict_from_xml(xml), cls)
+    def to_class_from_xml(
+        xml: XMLInput, cls: Type[OCIType], intern_table: Optional[InternTable] = None
+    ) -> OCIType:
+        """Parse XML string or bytes and convert to class instance."""
+        return Parser.to_class_from_dict(
+            Parser.to_dict_from_xml(xml, intern_table), cls
+        )
+
+
+@dataclass(slots=True)
+class ParsePolicy:
+    """Size thresholds deciding where AsyncParser runs each conversion.
+
+    Attributes:
+        inline_threshold: Payloads smaller than this (in bytes) are parsed directly
+            on the event loop, the executor hop costs more than the parse.
+        process_threshold: Payloads at or above this size are sent to the process
+            pool when one is enabled. Free-threaded builds use threads instead.
+        thread_workers: Size of the thread pool used for offloaded payloads.
+        process_workers: Size of the process pool. ``0`` disables process offloading.
+    """
+
+    inline_threshold: int = 32 * 1024
+    process_threshold: int = 512 * 1024
+    thread_workers: int = 4
+    process_workers: int = 0
+
+
+@dataclass(slots=True)
+class ParseMetrics:
+    """Counters describing how AsyncParser routed its work.
+
+    Attributes:
+        calls: Number of conversions per route (``inline``, ``thread``, ``process``).
+        bytes: Payload bytes handled per route.
+        seconds: Wall clock time spent per route, including the executor hop.
+    """
+
+    calls: Dict[str, int] = field(
+        default_factory=lambda: {"inline": 0, "thread": 0, "process": 0}
+    )
+    bytes: Dict[str, int] = field(
+        default_factory=lambda: {"inline": 0, "thread": 0, "process": 0}
+    )
+    seconds: Dict[str, float] = field(
+        default_factory=lambda: {"inline": 0.0, "thread": 0.0, "process": 0.0}
+    )
+
+    def record(self, route: str, size: int, elapsed: float) -> None:
+        self.calls[route] += 1
+        self.bytes[route] += size
+        self.seconds[route] += elapsed
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of the counters, safe to hand to a metrics exporter."""
+        return {
+            route: {
+                "calls": self.calls[route],
+                "bytes": self.bytes[route],
+                "seconds": self.seconds[route],
+            }
+            for route in self.calls
+        }
+
+
+def _gil_disabled() -> bool:
+    """True when running on a free-threaded build with the GIL switched off."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _payload_size(payload: Any) -> Optional[int]:
+    """Size used for routing, None for objects.
+
+    Classes and dicts have no size short of walking them, which costs about as much
+    as converting them, and requests are rarely large, so they are parsed inline.
+    """
+    if isinstance(payload, (str, bytes, bytearray, memoryview)):
+        return len(payload)
+    return None
 
 
 class AsyncParser:
     """
     Base Class For Async OCI Object Parsing & Type Translation
 
-    It is doing the exact same thing as Parser, except adding each call onto the event loop.
+    It is doing the exact same thing as Parser, but decides per call where the work runs:
+
+    - Payloads under ``policy.inline_threshold`` are parsed inline on the event loop.
+    - Larger payloads go to a thread pool so the loop stays responsive.
+    - Payloads over ``policy.process_threshold`` go to a process pool when
+      ``policy.process_workers`` is set, giving real CPU parallelism under the GIL.
+      Free-threaded builds keep using threads as they already run in parallel.
+    - Only XML documents are sized. Classes and dicts are always converted inline,
+      unless ``to_class_from_dict`` is given the ``source`` document they came from.
+    - Some work never goes to a process and uses the thread pool instead. Decodes
+      given an ``intern_table`` would fill a pickled copy of the table in the worker.
+      ``to_class_from_dict`` would pickle the whole dict there and the class back.
+
+    Use ``configure`` to tune the thresholds and ``metrics`` to see how calls were routed.
 
     method table:
 
     - to_xml_from_class: Translates class object to xml
+    - to_xml_bytes_from_class: Translates class object to encoded xml bytes
     - to_xml_from_dict: Translates dictionary object to xml
     - to_dict_from_class: Translates class object to dictionary
-    - to_dict_from_xml: Translates xml into dictionary
+    - to_dict_from_xml: Translates xml (str or bytes) into dictionary
     - to_class_from_dict: Translates dictionary object to class
     - to_class_from_xml: Translates xml to class
     """
 
-    _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="async_parser")
+    policy: ParsePolicy = ParsePolicy()
+    metrics: ParseMetrics = ParseMetrics()
+
+    _thread_executor: Optional[ThreadPoolExecutor] = None
+    _process_executor: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def configure(cls, **kwargs: int) -> ParsePolicy:
+        """Update the offload policy.
+
+        Executors are rebuilt lazily, so changing worker counts takes effect on the next
+        offloaded call.
+
+        Args:
+            **kwargs: Any field of ParsePolicy.
+
+        Returns:
+            ParsePolicy: The policy now in use.
+
+        Raises:
+            ValueError: If an unknown policy field is given.
+        """
+        for key, value in kwargs.items():
+            if not hasattr(cls.policy, key):
+                raise ValueError(f"Unknown parse policy field: {key}")
+            setattr(cls.policy, key, value)
+        cls.shutdown(wait=False)
+        return cls.policy
+
+    @classmethod
+    def reset_metrics(cls) -> None:
+        cls.metrics = ParseMetrics()
+
+    @classmethod
+    def shutdown(cls, wait: bool = True) -> None:
+        """Shut down any executors started by the parser."""
+        if cls._thread_executor is not None:
+            cls._thread_executor.shutdown(wait=wait)
+            cls._thread_executor = None
+        if cls._process_executor is not None:
+            cls._process_executor.shutdown(wait=wait)
+            cls._process_executor = None
+
+    @classmethod
+    def _route(cls, size: int) -> str:
+        if size < cls.policy.inline_threshold:
+            return "inline"
+        if (
+            size >= cls.policy.process_threshold
+            and cls.policy.process_workers > 0
+            and not _gil_disabled()
+        ):
+            return "process"
+        return "thread"
+
+    @classmethod
+    def _executor(cls, route: str) -> Executor:
+        if route == "process":
+            if cls._process_executor is None:
+                cls._process_executor = ProcessPoolExecutor(
+                    max_workers=cls.policy.process_workers
+                )
+            return cls._process_executor
+        if cls._thread_executor is None:
+            cls._thread_executor = ThreadPoolExecutor(
+                max_workers=cls.policy.thread_workers,
+                thread_name_prefix="async_parser",
+            )
+        return cls._thread_executor
 
     @staticmethod
-    def _get_loop():
-        return asyncio.get_event_loop()
+    def _get_loop() -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    @staticmethod
+    async def _dispatch(
+        payload: Any, func: Callable[..., T], *args: Any, local: bool = False
+    ) -> T:
+        """Runs ``func(*args)`` on the route for ``payload``.
+
+        ``local`` keeps the work in this process, for arguments the caller needs to
+        see updated or that cost as much to pickle as to convert.
+        """
+        size = _payload_size(payload)
+        route = "inline" if size is None else AsyncParser._route(size)
+        if route == "process" and local:
+            route = "thread"
+        if route == "process":
+            # memoryviews cannot be pickled, the copy only happens on this route
+            args = tuple(bytes(a) if isinstance(a, memoryview) else a for a in args)
+        start = time.perf_counter()
+        if route == "inline":
+            result = func(*args)
+        else:
+            result = await AsyncParser._get_loop().run_in_executor(
+                AsyncParser._executor(route), func, *args
+            )
+        AsyncParser.metrics.record(route, size or 0, time.perf_counter() - start)
+        return result
 
     @staticmethod
     async def to_xml_from_class(obj: OCIType) -> str:
-        return await AsyncParser._get_loop().run_in_executor(
-            AsyncParser._executor, Parser.to_xml_from_class, obj
-        )
+        return await AsyncParser._dispatch(obj, Parser.to_xml_from_class, obj)
+
+    @staticmethod
+    async def to_xml_bytes_from_class(obj: OCIType) -> bytes:
+        return await AsyncParser._dispatch(obj, Parser.to_xml_bytes_from_class, obj)
 
     @staticmethod
     async def to_xml_from_dict(data: Dict[str, Any], cls: Type[OCIType]) -> str:
-        return await AsyncParser._get_loop().run_in_executor(
-            AsyncParser._executor, Parser.to_xml_from_dict, data, cls
-        )
+        return await AsyncParser._dispatch(data, Parser.to_xml_from_dict, data, cls)
 
     @staticmethod
     async def to_dict_from_class(
         obj: OCIType, wrap_in_class_name: bool = True
     ) -> Dict[str, Any]:
-        return await AsyncParser._get_loop().run_in_executor(
-            AsyncParser._executor, Parser.to_dict_from_class, obj, wrap_in_class_name
+        return await AsyncParser._dispatch(
+            obj, Parser.to_dict_from_class, obj, wrap_in_class_name
         )
 
     @staticmethod
-    async def to_dict_from_xml(xml: str) -> Dict[str, Any]:
-        return await AsyncParser._get_loop().run_in_executor(
-            AsyncParser._executor, Parser.to_dict_from_xml, xml
+    async def to_dict_from_xml(
+        xml: XMLInput, intern_table: Optional[InternTable] = None
+    ) -> Dict[str, Any]:
+        return await AsyncParser._dispatch(
+            xml,
+            Parser.to_dict_from_xml,
+            xml,
+            intern_table,
+            local=intern_table is not None,
         )
 
     @staticmethod
-    async def to_class_from_dict(data: Dict[str, Any], cls: Type[OCIType]) -> OCIType:
-        return await AsyncParser._get_loop().run_in_executor(
-            AsyncParser._executor, Parser.to_class_from_dict, data, cls
+    async def to_class_from_dict(
+        data: Dict[str, Any], cls: Type[OCIType], source: Optional[XMLInput] = None
+    ) -> OCIType:
+        """``source`` is the document ``data`` was decoded from, used to size the work."""
+        return await AsyncParser._dispatch(
+            data if source is None else source,
+            Parser.to_class_from_dict,
+            data,
+            cls,
+            local=True,
         )
 
     @staticmethod
-    async def to_class_from_xml(xml: str, cls: Type[OCIType]) -> OCIType:
-        return await AsyncParser._get_loop().run_in_executor(
-            AsyncParser._executor, Parser.to_class_from_xml, xml, cls
+    async def to_class_from_xml(
+        xml: XMLInput, cls: Type[OCIType], intern_table: Optional[InternTable] = None
+    ) -> OCIType:
+        return await AsyncParser._dispatch(
+            xml,
+            Parser.to_class_from_xml,
+            xml,
+            cls,
+            intern_table,
+            local=intern_table is not None,
         )
@@ -0,0 +1,53 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+from xml.sax.saxutils import unescape
+
+from mercury_ocip.utils.parser import OCI_ENCODING
+
+# Only the namespaced type, error responses also carry a plain type="Error" attribute
+_TYPE_PATTERN = re.compile(rb"<command\b[^>]*?\s[\w.-]+:type\s*=\s*[\"']([^\"']+)[\"']")
+_SUMMARY_PATTERN = re.compile(rb"<summary>(.*?)</summary>", re.DOTALL)
+_ERROR_TYPE = "ErrorResponse"
+_ENTITIES = {"&quot;": '"', "&apos;": "'"}
+
+
+@dataclass(slots=True, frozen=True)
+class RawResponse:
+    """Lightweight view over an undecoded OCI response document.
+
+    Returned by ``raw_xml(..., view=True)``. Only the response type name and error
+    summary are read, found with a byte scan, so the document is never handed to
+    Parser. Use ``xml`` to relay the response untouched.
+
+    Attributes:
+        xml: The response document exactly as received.
+    """
+
+    xml: bytes
+
+    @property
+    def type_name(self) -> Optional[str]:
+        """The ``xsi:type`` of the first command without its namespace prefix."""
+        match = _TYPE_PATTERN.search(self.xml)
+        if match is None:
+            return None
+        type_name = match.group(1).decode(OCI_ENCODING)
+        return type_name.split(":", 1)[-1]
+
+    @property
+    def is_error(self) -> bool:
+        return self.type_name == _ERROR_TYPE
+
+    @property
+    def summary(self) -> Optional[str]:
+        """The error summary, ``None`` for successful responses."""
+        if not self.is_error:
+            return None
+        match = _SUMMARY_PATTERN.search(self.xml)
+        if match is None:
+            return None
+        return unescape(match.group(1).decode(OCI_ENCODING), _ENTITIES)
+
+    def __bytes__(self) -> bytes:
+        return self.xml
@@ -9,6 +9,7 @@ import asyncio
 
 from mercury_ocip.client import AsyncClient
 from mercury_ocip.requester import AsyncTCPRequester
+from mercury_ocip.single_flight import SingleFlight
 from mercury_ocip.utils.parser import Parser, AsyncParser
 from mercury_ocip.commands.commands import (
     UserGetRegistrationListRequest,
@@ -51,7 +52,13 @@ def mock_async_requester():
         else:
             return "SuccessResponse"
 
+    async def mock_send_request_bytes(command):
+        if asyncio.iscoroutine(command):
+            command = await command
+        return await mock_send_request(command.decode("ISO-8859-1"))
+
     mock_req.send_request = Mock(side_effect=mock_send_request)
+    mock_req.send_request_bytes = Mock(side_effect=mock_send_request_bytes)
     mock_req.disconnect = Mock()
     return mock_req
 
@@ -70,11 +77,13 @@ def mock_async_parser():
     """Mock async parser that behaves like the real thing"""
     with (
         patch("mercury_ocip.client.AsyncParser.to_dict_from_xml") as mock_dict,
-        patch("mercury_ocip.client.AsyncParser.to_class_from_xml") as mock_class,
-        patch("mercury_ocip.client.AsyncParser.to_xml_from_class") as mock_cls_to_xml,
+        patch("mercury_ocip.client.AsyncParser.to_class_from_dict") as mock_class,
+        patch(
+            "mercury_ocip.client.AsyncParser.to_xml_bytes_from_class"
+        ) as mock_cls_to_xml,
     ):
 
-        async def mock_to_dict_from_xml(xml_string):
+        async def mock_to_dict_from_xml(xml_string, **kwargs):
             if "LoginResponse22V5" in xml_string:
                 return {
                     "command": {
@@ -100,12 +109,12 @@ def mock_async_parser():
                     }
                 }
 
-        async def mock_to_class_from_xml(xml_string, cls):
-            if "LoginResponse22V5" in xml_string:
+        async def mock_to_class_from_dict(data, cls, **kwargs):
+            if cls.__name__ == "LoginResponse22V5":
                 return LoginResponse22V5
-            if "LoginResponse14sp4" in xml_string:
+            if cls.__name__ == "LoginResponse14sp4":
                 return LoginResponse14sp4
-            if "AuthenticationResponse" in xml_string:
+            if cls.__name__ == "AuthenticationResponse":
                 return AuthenticationResponse(
                     nonce="12345678910",
                     user_id="user",
@@ -113,20 +122,20 @@ def mock_async_parser():
                 )
             return ErrorResponse
 
-        async def mock_to_xml_from_class(cls):
+        async def mock_to_xml_bytes_from_class(cls):
             if isinstance(cls, LoginRequest22V5):
-                return "LoginRequest22V5"
+                return b"LoginRequest22V5"
             if isinstance(cls, LoginRequest14sp4):
-                return "LoginRequest14sp4"
+                return b"LoginRequest14sp4"
             if isinstance(cls, AuthenticationRequest):
-                return "AuthenticationRequest"
+                return b"AuthenticationRequest"
             if isinstance(cls, UserGetRegistrationListRequest):
-                return "UserGetRegistrationListRequest"
-            return "SuccessResponse"
+                return b"UserGetRegistrationListRequest"
+            return b"SuccessResponse"
 
         mock_dict.side_effect = mock_to_dict_from_xml
-        mock_class.side_effect = mock_to_class_from_xml
-        mock_cls_to_xml.side_effect = mock_to_xml_from_class
+        mock_class.side_effect = mock_to_class_from_dict
+        mock_cls_to_xml.side_effect = mock_to_xml_bytes_from_class
         yield mock_dict, mock_class, mock_cls_to_xml
 
 
@@ -197,7 +206,7 @@ class TestAsyncClient:
         assert client.session_id is not None
 
         mock_requester = mock_create_async_requester.return_value
-        mock_requester.send_request.assert_called_once()
+        mock_requester.send_request_bytes.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_authentication_success_without_tls(
@@ -252,3 +261,109 @@ class TestAsyncClient:
         )
 
         assert response == "UserGetRegistrationListResponse"
+
+    @pytest.mark.asyncio
+    async def test_async_identical_reads_are_coalesced(
+        self,
+        mock_create_async_requester,
+        mock_dispatch_table,
+        mock_async_parser,
+        mock_async_authenticate,
+        mock_async_receive_response,
+    ):
+        """Test concurrent identical Get requests go on the wire once"""
+
+        client = AsyncClient(
+            host="localhost",
+            username="user",
+            password="pass",
+            coalescing=SingleFlight(),
+        )
+        client.authenticated = True
+        mock_requester = mock_create_async_requester.return_value
+
+        responses = await asyncio.gather(
+            *(
+                client.command(UserGetRegistrationListRequest(user_id="example_user"))
+                for _ in range(10)
+            )
+        )
+
+        assert responses == ["UserGetRegistrationListResponse"] * 10
+        assert mock_requester.send_request_bytes.call_count == 1
+        assert client.coalescing.stats.coalesced == 9
+
+    @pytest.mark.asyncio
+    async def test_async_reads_are_not_coalesced_by_default(
+        self,
+        mock_create_async_requester,
+        mock_dispatch_table,
+        mock_async_parser,
+        mock_async_authenticate,
+        mock_async_receive_response,
+    ):
+        """Test each concurrent Get request is sent unless coalescing is turned on"""
+
+        client = AsyncClient(host="localhost", username="user", password="pass")
+        client.authenticated = True
+        mock_requester = mock_create_async_requester.return_value
+
+        await asyncio.gather(
+            *(
+                client.command(UserGetRegistrationListRequest(user_id="example_user"))
+                for _ in range(3)
+            )
+        )
+
+        assert client.coalescing is None
+        assert mock_requester.send_request_bytes.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_async_middleware_wraps_command(
+        self,
+        mock_create_async_requester,
+        mock_dispatch_table,
+        mock_async_parser,
+        mock_async_authenticate,
+        mock_async_receive_response,
+    ):
+        """Test async middleware can answer without reaching the server"""
+
+        async def middleware(command, payload, call_next):
+            return "ShortCircuited"
+
+        client = AsyncClient(host="localhost", username="user", password="pass")
+        client.use(middleware)
+        client.authenticated = True
+        mock_requester = mock_create_async_requester.return_value
+
+        response = await client.command(
+            UserGetRegistrationListRequest(user_id="example_user")
+        )
+
+        assert response == "ShortCircuited"
+        mock_requester.send_request_bytes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_raw_xml_returns_view(
+        self,
+        mock_create_async_requester,
+        mock_dispatch_table,
+        mock_async_parser,
+        mock_async_authenticate,
+    ):
+        """Test the async raw XML path returns a view without decoding"""
+
+        client = AsyncClient(host="localhost", username="user", password="pass")
+        client.authenticated = True
+        mock_dict, mock_class, _ = mock_async_parser
+
+        response = await client.raw_xml(
+            b"<command>UserGetRegistrationListRequest</command>", view=True
+        )
+
+        assert response.xml == b"UserGetRegistrationListResponse"
+        assert response.type_name is None
+        assert response.summary is None
+        mock_dict.assert_not_called()
+        mock_class.assert_not_called()
@@ -0,0 +1,151 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+
+from mercury_ocip.bulk.base_operation import BaseBulkOperations
+from mercury_ocip.bulk.engine import entity_key, run_ordered
+from mercury_ocip.client import Client
+from mercury_ocip.commands.base_command import ErrorResponse
+from mercury_ocip.pool import BasePool
+
+
+@dataclass
+class UserAddRequest:
+    user_id: str
+    first_name: Optional[str] = None
+
+
+class ThingBulkOperations(BaseBulkOperations):
+    operation_mapping = {"user.create": {"command": "UserAddRequest"}}
+
+
+class RecordingPool(BasePool):
+    """Answers after a delay that shrinks with the row, so later rows finish first"""
+
+    def __init__(self, size=4):
+        self._size = size
+        self.sent = []
+        self.active = 0
+        self.peak = 0
+
+    @property
+    def size(self):
+        return self._size
+
+    async def command(self, command, lane="normal"):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.001 * (10 - len(self.sent) % 10))
+            self.sent.append(command)
+            if command.first_name == "error":
+                return ErrorResponse(summary="User already exists", detail="dup")
+            if command.first_name == "boom":
+                raise ConnectionError("connection reset")
+            return f"ok:{command.user_id}:{command.first_name}"
+        finally:
+            self.active -= 1
+
+    async def authenticate(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def operations():
+    client = Mock(spec=Client)
+    client._dispatch_table = {"UserAddRequest": UserAddRequest}
+    return ThingBulkOperations(client)
+
+
+def rows(count):
+    return [
+        {"operation": "user.create", "user_id": f"user{i}", "first_name": str(i)}
+        for i in range(count)
+    ]
+
+
+def test_entity_key_scopes_devices_and_groups():
+    assert entity_key({"user_id": "jdoe", "group_id": "Sales"}) == ("user_id", "jdoe")
+    assert entity_key(
+        {"service_provider_id": "Acme", "group_id": "Sales", "device_name": "dev1"}
+    ) == ("device_name", "Acme", "Sales", "dev1")
+    assert entity_key({"service_provider_id": "Acme", "group_id": "Sales"}) == (
+        "group_id",
+        "Acme",
+        "Sales",
+    )
+    assert entity_key({"first_name": "x"}) is None
+
+
+@pytest.mark.asyncio
+async def test_run_ordered_keeps_same_key_in_order():
+    log = []
+
+    async def handle(item):
+        key, step = item
+        await asyncio.sleep(0.002 if step == 0 else 0)
+        log.append(item)
+
+    items = [("a", 0), ("b", 0), ("a", 1), ("c", 0), ("a", 2), ("b", 1)]
+    await run_ordered(items, handle, lambda item: item[0], concurrency=3)
+
+    assert sorted(log) == sorted(items)
+    assert [step for key, step in log if key == "a"] == [0, 1, 2]
+    assert [step for key, step in log if key == "b"] == [0, 1]
+
+
+def test_concurrent_results_match_input_order(operations):
+    pool = RecordingPool(size=4)
+
+    results = operations.execute_from_data(rows(20), concurrency=4, pool=pool)
+
+    assert [result["index"] for result in results] == list(range(20))
+    assert [result["response"] for result in results] == [
+        f"ok:user{i}:{i}" for i in range(20)
+    ]
+    assert all(result["success"] for result in results)
+    assert pool.peak == 4
+
+
+def test_same_entity_rows_run_in_order(operations):
+    pool = RecordingPool(size=4)
+    data = [
+        {"operation": "user.create", "user_id": "jdoe", "first_name": str(i)}
+        for i in range(6)
+    ]
+
+    operations.execute_from_data(data, concurrency=4, pool=pool)
+
+    assert [command.first_name for command in pool.sent] == [str(i) for i in range(6)]
+    assert pool.peak == 1
+
+
+def test_failures_land_in_place(operations):
+    data = rows(4)
+    data[1]["first_name"] = "error"
+    data[2]["first_name"] = "boom"
+    data[3].pop("user_id")
+
+    results = operations.execute_from_data(data, concurrency=2, pool=RecordingPool())
+
+    assert results[0]["success"]
+    assert results[1]["response"] == "User already exists"
+    assert results[1]["detail"] == "dup"
+    assert not results[1]["success"]
+    assert "connection reset" in results[2]["error"]
+    assert results[3]["command"] is None and not results[3]["success"]
+
+
+@pytest.mark.asyncio
+async def test_sync_entry_point_refuses_a_running_loop(operations):
+    with pytest.raises(RuntimeError):
+        operations.execute_from_data(rows(2), concurrency=2, pool=RecordingPool())
+
+    results = await operations.execute_from_data_async(rows(2), pool=RecordingPool())
+    assert [result["success"] for result in results] == [True, True]
@@ -0,0 +1,177 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+
+from mercury_ocip.bulk.base_operation import BaseBulkOperations
+from mercury_ocip.bulk.journal import BulkJournal, row_digest
+from mercury_ocip.client import Client
+from mercury_ocip.commands.base_command import ErrorResponse
+from mercury_ocip.pool import BasePool
+
+
+@dataclass
+class UserAddRequest:
+    user_id: str
+    first_name: Optional[str] = None
+
+
+class ThingBulkOperations(BaseBulkOperations):
+    operation_mapping = {"user.create": {"command": "UserAddRequest"}}
+
+
+class Interrupted(BaseException):
+    pass
+
+
+class CountingPool(BasePool):
+    def __init__(self):
+        self.sent = []
+
+    @property
+    def size(self):
+        return 4
+
+    async def command(self, command, lane="normal"):
+        await asyncio.sleep(0)
+        self.sent.append(command.user_id)
+        return "ok"
+
+    async def authenticate(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def client():
+    client = Mock(spec=Client)
+    client._dispatch_table = {"UserAddRequest": UserAddRequest}
+    client.command.return_value = "ok"
+    return client
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return str(tmp_path / "users.journal")
+
+
+def rows(count=5):
+    return [
+        {"operation": "user.create", "user_id": f"user{i}", "first_name": "Ann"}
+        for i in range(count)
+    ]
+
+
+def sent(client):
+    return [call.args[0].user_id for call in client.command.call_args_list]
+
+
+def test_rerun_sends_only_failed_rows(client, journal):
+    operations = ThingBulkOperations(client)
+    client.command.side_effect = lambda command: (
+        ErrorResponse(summary="busy", detail="") if command.user_id == "user3" else "ok"
+    )
+    first = operations.execute_from_data(rows(), journal=journal)
+    assert [result["success"] for result in first] == [True, True, True, False, True]
+
+    client.command.reset_mock(side_effect=True)
+    second = operations.execute_from_data(rows(), journal=journal)
+
+    assert sent(client) == ["user3"]
+    assert [result.get("skipped", False) for result in second] == [
+        True,
+        True,
+        True,
+        False,
+        True,
+    ]
+    assert all(result["success"] for result in second)
+
+
+def test_interrupted_run_resumes_after_the_last_finished_row(client, journal):
+    operations = ThingBulkOperations(client)
+
+    def sink(result):
+        if result["index"] == 2:
+            raise Interrupted()
+
+    with pytest.raises(Interrupted):
+        operations.stream_from_data(rows(), sink, journal=journal)
+    client.command.reset_mock()
+
+    summary = operations.stream_from_data(rows(), lambda result: None, journal=journal)
+
+    # Row 2 was sent before the crash and recorded, only later rows remain
+    assert sent(client) == ["user3", "user4"]
+    assert summary.as_dict() == {
+        "total": 5,
+        "succeeded": 2,
+        "failed": 0,
+        "skipped": 3,
+        "retried": 0,
+    }
+
+
+def test_changed_rows_are_sent_again(client, journal):
+    operations = ThingBulkOperations(client)
+    operations.execute_from_data(rows(3), journal=journal)
+    client.command.reset_mock()
+
+    changed = rows(3)
+    changed[1]["first_name"] = "Bob"
+    operations.execute_from_data(changed, journal=journal)
+
+    assert sent(client) == ["user1"]
+
+
+def test_torn_lines_are_ignored(journal):
+    row = rows(1)[0]
+    with open(journal, "w", encoding="utf-8") as handle:
+        handle.write(json.dumps({"index": 0, "hash": row_digest(row), "success": True}))
+        handle.write('\n{"index": 1, "ha')
+
+    with BulkJournal(journal) as log:
+        assert log.completed == 1
+        assert log.is_complete(0, row_digest(row))
+        assert not log.is_complete(1, row_digest(row))
+
+
+def test_torn_last_line_is_cut_before_appending(journal):
+    row = rows(1)[0]
+    with open(journal, "w", encoding="utf-8") as handle:
+        handle.write(json.dumps({"index": 0, "hash": row_digest(row), "success": True}))
+        handle.write('\n{"index": 1, "ha')
+
+    with BulkJournal(journal) as log:
+        log.record(1, row_digest(row), True)
+
+    with open(journal, encoding="utf-8") as handle:
+        assert [json.loads(line)["index"] for line in handle] == [0, 1]
+    with BulkJournal(journal) as log:
+        assert log.completed == 2
+
+
+def test_concurrent_runs_share_the_journal(client, journal):
+    operations = ThingBulkOperations(client)
+    operations.execute_from_data(rows(3), journal=journal)
+    pool = CountingPool()
+
+    results = operations.execute_from_data(rows(6), pool=pool, journal=journal)
+
+    assert sorted(pool.sent) == ["user3", "user4", "user5"]
+    assert [result["index"] for result in results] == list(range(6))
+    with BulkJournal(journal) as log:
+        assert log.completed == 6
+
+
+def test_dry_run_leaves_the_journal_alone(client, journal, tmp_path):
+    operations = ThingBulkOperations(client)
+
+    operations.execute_from_data(rows(), dry_run=True, journal=journal)
+
+    assert not (tmp_path / "users.journal").exists()
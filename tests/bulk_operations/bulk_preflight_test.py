@@ -0,0 +1,205 @@
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+
+from mercury_ocip.bulk.base_operation import BaseBulkOperations
+from mercury_ocip.client import Client
+from mercury_ocip.commands.base_command import ErrorResponse, OCITable, OCITableRow
+
+
+@dataclass
+class UserAddRequest:
+    service_provider_id: str
+    group_id: str
+    user_id: str
+    phone_number: Optional[str] = None
+    extension: Optional[str] = None
+    access_device_endpoint: Optional[dict] = None
+
+
+@dataclass
+class DeviceAddRequest:
+    service_provider_id: str
+    group_id: str
+    device_name: str
+
+
+@dataclass
+class UserGetListInGroupRequest:
+    service_provider_id: str
+    group_id: str
+
+
+@dataclass
+class GroupDnGetAssignmentListRequest18:
+    service_provider_id: str
+    group_id: str
+
+
+@dataclass
+class GroupAccessDeviceGetListRequest:
+    service_provider_id: str
+    group_id: str
+
+
+class Response:
+    def __init__(self, name, headings, *rows):
+        setattr(self, name, OCITable(headings, [OCITableRow(list(r)) for r in rows]))
+
+
+def server(command):
+    if command.group_id == "Gone":
+        return ErrorResponse(summary="Group not found", detail="")
+    if isinstance(command, UserGetListInGroupRequest):
+        return Response(
+            "user_table",
+            ["User Id", "Extension"],
+            ("ann@acme.com", "1000"),
+            ("bob@acme.com", "1001"),
+        )
+    if isinstance(command, GroupDnGetAssignmentListRequest18):
+        return Response(
+            "dn_table",
+            ["Phone Numbers", "User Id"],
+            ("+1-2025551000 - +1-2025551009", ""),
+            ("+1-2025552000", "ann@acme.com"),
+        )
+    if isinstance(command, GroupAccessDeviceGetListRequest):
+        return Response("access_device_table", ["Device Name"], ("dev1",))
+    return "ok"
+
+
+class UserOperations(BaseBulkOperations):
+    operation_mapping = {
+        "user.create": {
+            "command": "UserAddRequest",
+            "checks": ["new_id", "free_dn", "free_extension", "existing_device"],
+        }
+    }
+
+
+class DeviceOperations(BaseBulkOperations):
+    operation_mapping = {
+        "device.create": {"command": "DeviceAddRequest", "checks": ["new_device"]}
+    }
+
+
+@pytest.fixture
+def client():
+    client = Mock(spec=Client)
+    client._dispatch_table = {
+        cls.__name__: cls
+        for cls in (
+            UserAddRequest,
+            DeviceAddRequest,
+            UserGetListInGroupRequest,
+            GroupDnGetAssignmentListRequest18,
+            GroupAccessDeviceGetListRequest,
+        )
+    }
+    client.command.side_effect = server
+    return client
+
+
+def user(user_id, group_id="Sales", **fields):
+    return {
+        "operation": "user.create",
+        "service_provider_id": "Acme",
+        "group_id": group_id,
+        "user_id": user_id,
+        **fields,
+    }
+
+
+def reads(client):
+    return [
+        type(call.args[0]).__name__
+        for call in client.command.call_args_list
+        if not isinstance(call.args[0], (UserAddRequest, DeviceAddRequest))
+    ]
+
+
+def test_validate_finds_conflicts_locally(client):
+    device = {"access_device": {"device_name": "dev9", "device_level": "Group"}}
+    data = [
+        user("new1@acme.com", phone_number="+1-2025551005", extension="2000"),
+        user("ann@acme.com"),
+        user("new1@acme.com"),
+        user("new2@acme.com", phone_number="2025551005"),
+        user("new3@acme.com", phone_number="+1-2025552000"),
+        user("new4@acme.com", phone_number="+1-3035550000"),
+        user("new5@acme.com", extension="1001"),
+        user("new6@acme.com", extension="2000"),
+        user("new7@acme.com", access_device_endpoint=device),
+        user("new8@acme.com", phone_number="+1-2025551006", extension="2001"),
+    ]
+
+    issues = UserOperations(client).validate_from_data(data)
+
+    assert issues == {
+        1: ["ID ann@acme.com already exists"],
+        2: ["ID new1@acme.com is also created by row 0"],
+        3: ["Phone number 2025551005 is also used by row 0"],
+        4: ["Phone number +1-2025552000 is already assigned to ann@acme.com"],
+        5: ["Phone number +1-3035550000 is not in group Sales"],
+        6: ["Extension 1001 is already used by bob@acme.com"],
+        7: ["Extension 2000 is also used by row 0"],
+        8: ["Device dev9 does not exist in group Sales"],
+    }
+    assert sorted(reads(client)) == [
+        "GroupAccessDeviceGetListRequest",
+        "GroupDnGetAssignmentListRequest18",
+        "UserGetListInGroupRequest",
+    ]
+
+
+def test_upsert_allows_existing_ids_and_their_own_numbers(client):
+    data = [user("ann@acme.com", phone_number="+1-2025552000", extension="1000")]
+
+    assert UserOperations(client).validate_from_data(data, upsert=True) == {}
+
+
+def test_failed_reads_only_skip_the_server_checks(client):
+    data = [user("ann@acme.com", group_id="Gone"), user("ann@acme.com", "Gone")]
+
+    issues = UserOperations(client).validate_from_data(data)
+
+    assert issues == {1: ["ID ann@acme.com is also created by row 0"]}
+
+
+def test_execute_rejects_conflicting_rows_without_sending_them(client):
+    data = [user("new@acme.com", extension="3000"), user("ann@acme.com")]
+
+    results = UserOperations(client).execute_from_data(data, preflight=True)
+
+    assert results[0]["success"]
+    assert not results[1]["success"]
+    assert results[1]["error"] == "Pre-flight: ID ann@acme.com already exists"
+    sent = [
+        call.args[0].user_id
+        for call in client.command.call_args_list
+        if isinstance(call.args[0], UserAddRequest)
+    ]
+    assert sent == ["new@acme.com"]
+
+
+def test_new_devices(client):
+    def device(name):
+        return {
+            "operation": "device.create",
+            "service_provider_id": "Acme",
+            "group_id": "Sales",
+            "device_name": name,
+        }
+
+    issues = DeviceOperations(client).validate_from_data(
+        [device("dev1"), device("dev2"), device("dev2")]
+    )
+
+    assert issues == {
+        0: ["Device dev1 already exists in group Sales"],
+        2: ["Device dev2 is also created by row 1"],
+    }
+    assert reads(client) == ["GroupAccessDeviceGetListRequest"]
@@ -0,0 +1,228 @@
+import asyncio
+import io
+import json
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+
+from mercury_ocip.bulk import progress as progress_module
+from mercury_ocip.bulk.base_operation import BaseBulkOperations
+from mercury_ocip.bulk.progress import (
+    BulkProgress,
+    JsonStatusWriter,
+    ProgressTracker,
+    TerminalProgress,
+)
+from mercury_ocip.bulk.streaming import BulkSummary
+from mercury_ocip.client import Client
+from mercury_ocip.commands.base_command import ErrorResponse
+from mercury_ocip.pool import BasePool
+
+
+@dataclass
+class UserAddRequest:
+    user_id: str
+    first_name: Optional[str] = None
+
+
+class ThingBulkOperations(BaseBulkOperations):
+    operation_mapping = {"user.create": {"command": "UserAddRequest"}}
+
+
+class SlowPool(BasePool):
+    @property
+    def size(self):
+        return 4
+
+    async def command(self, command, lane="normal"):
+        await asyncio.sleep(0.002)
+        return "ok"
+
+    async def authenticate(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(progress_module.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def client():
+    client = Mock(spec=Client)
+    client._dispatch_table = {"UserAddRequest": UserAddRequest}
+    client.command.return_value = "ok"
+    return client
+
+
+def rows(count=3):
+    return [{"operation": "user.create", "user_id": f"user{i}"} for i in range(count)]
+
+
+def finish_rows(summary, count, success=True):
+    for _ in range(count):
+        summary.add({"success": success})
+
+
+def test_tracker_reports_rates_and_eta(clock):
+    reports = []
+    summary = BulkSummary()
+    tracker = ProgressTracker(reports.append, summary, total=100, smoothing=0.5)
+
+    clock.now += 2
+    finish_rows(summary, 20)
+    first = tracker.report()
+    clock.now += 1
+    finish_rows(summary, 40)
+    second = tracker.report()
+
+    assert first.rate == 10
+    assert first.average_rate == 10
+    assert first.eta == 8
+    assert second.rate == 40
+    assert second.average_rate == 25
+    assert second.completed == 60
+    assert second.eta == pytest.approx(40 / 25)
+    assert second.percent == 60
+    assert reports == [first, second]
+
+
+def test_tracker_reports_latency_percentiles(clock):
+    reports = []
+    tracker = ProgressTracker(reports.append, BulkSummary())
+    for millis in range(1, 101):
+        tracker.latency(millis / 1000)
+
+    report = tracker.report()
+
+    assert report.latency_p50 == 0.051
+    assert report.latency_p90 == 0.091
+    assert report.latency_p99 == 0.1
+    assert report.eta is None
+
+
+def test_tracker_reports_at_most_once_an_interval(clock):
+    reports = []
+    tracker = ProgressTracker(reports.append, BulkSummary(), interval=1.0)
+
+    tracker.update()
+    clock.now += 0.5
+    tracker.update()
+    clock.now += 0.5
+    tracker.update()
+    tracker.finish()
+
+    assert [report.done for report in reports] == [False, True]
+    assert reports[-1].eta == 0.0
+
+
+def test_execute_reports_final_counts(client):
+    client.command.side_effect = ["ok", ErrorResponse(summary="User not found"), "ok"]
+    reports = []
+
+    ThingBulkOperations(client).execute_from_data(rows(), progress=reports.append)
+
+    final = reports[-1]
+    assert final.done
+    assert (final.completed, final.succeeded, final.failed) == (3, 2, 1)
+    assert final.total == 3
+    assert final.latency_p50 is not None
+
+
+def test_concurrent_run_reports_command_latency(client):
+    reports = []
+
+    ThingBulkOperations(client).execute_from_data(
+        rows(8), concurrency=4, pool=SlowPool(), progress=reports.append
+    )
+
+    final = reports[-1]
+    assert final.done and final.completed == 8 and final.total == 8
+    assert final.latency_p50 >= 0.002
+
+
+def test_stream_from_csv_counts_the_sheet_for_the_eta(client, tmp_path):
+    sheet = tmp_path / "users.csv"
+    sheet.write_text("operation,userId\nuser.create,a\n,\nuser.create,b\n")
+    reports = []
+
+    ThingBulkOperations(client).stream_from_csv(
+        str(sheet), lambda result: None, progress=reports.append
+    )
+
+    assert reports[-1].total == 2
+    assert reports[-1].completed == 2
+
+
+def test_stream_of_unknown_length_has_no_total(client):
+    reports = []
+
+    ThingBulkOperations(client).stream_from_data(
+        iter(rows()), lambda result: None, progress=reports.append
+    )
+
+    assert reports[-1].total is None
+    assert reports[-1].percent is None
+
+
+def test_terminal_progress_writes_a_line_per_report_off_a_terminal():
+    stream = io.StringIO()
+    render = TerminalProgress(stream, width=10)
+
+    render(
+        BulkProgress(
+            completed=25,
+            succeeded=24,
+            failed=1,
+            total=100,
+            average_rate=12.5,
+            latency_p50=0.08,
+            latency_p99=0.32,
+            eta=65,
+        )
+    )
+    render(BulkProgress(completed=7, succeeded=7, retried=2, elapsed=3, done=True))
+
+    first, second = stream.getvalue().splitlines()
+    assert first == (
+        "[##........] 25/100  25.0% | ok 24 failed 1 | 12.5 rows/s"
+        " | p50 80ms p99 320ms | ETA 0:01:05"
+    )
+    assert second == "7 rows | ok 7 failed 0 retried 2 | 0.0 rows/s | done in 0:00:03"
+
+
+def test_terminal_progress_skips_latency_until_both_percentiles_are_known():
+    line = TerminalProgress(io.StringIO()).format(
+        BulkProgress(completed=1, succeeded=1, latency_p50=0.08)
+    )
+
+    assert line == "1 rows | ok 1 failed 0 | 0.0 rows/s"
+
+
+def test_json_status_writer_replaces_the_file(tmp_path):
+    path = tmp_path / "status.json"
+    writer = JsonStatusWriter(path)
+
+    writer(BulkProgress(completed=1, total=4))
+    writer(BulkProgress(completed=4, total=4, done=True))
+
+    status = json.loads(path.read_text())
+    assert status["completed"] == 4
+    assert status["done"] is True
+    assert "updated" in status
+    assert [p.name for p in tmp_path.iterdir()] == ["status.json"]
@@ -0,0 +1,259 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+
+from mercury_ocip.bulk.base_operation import BaseBulkOperations
+from mercury_ocip.bulk.engine import run_ordered
+from mercury_ocip.bulk.retry import RetryPolicy
+from mercury_ocip.client import Client
+from mercury_ocip.commands.base_command import ErrorResponse
+from mercury_ocip.exceptions import (
+    MErrorResponse,
+    MErrorSendRequestFailed,
+    MErrorSocketTimeout,
+)
+from mercury_ocip.pool import BasePool
+from mercury_ocip.utils.parser import Parser
+
+NO_WAIT = RetryPolicy(base_delay=0, max_delay=0)
+
+
+@dataclass
+class UserAddRequest:
+    user_id: str
+    first_name: Optional[str] = None
+
+
+@dataclass
+class UserModifyRequest22:
+    user_id: str
+    first_name: Optional[str] = None
+
+
+class ThingBulkOperations(BaseBulkOperations):
+    operation_mapping = {
+        "user.create": {"command": "UserAddRequest"},
+        "user.modify": {"command": "UserModifyRequest22"},
+    }
+
+
+class FlakyPool(BasePool):
+    """Times out the first ``failures`` sends of each user in ``flaky``."""
+
+    def __init__(self, flaky=(), failures=1):
+        self.flaky = dict.fromkeys(flaky, failures)
+        self.sent = []
+
+    @property
+    def size(self):
+        return 2
+
+    async def command(self, command, lane="normal"):
+        await asyncio.sleep(0.001)
+        self.sent.append((type(command).__name__, command.user_id))
+        if self.flaky.get(command.user_id):
+            self.flaky[command.user_id] -= 1
+            raise MErrorSocketTimeout("timed out")
+        return f"ok:{command.user_id}"
+
+    async def authenticate(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def client():
+    client = Mock(spec=Client)
+    client._dispatch_table = {
+        "UserAddRequest": UserAddRequest,
+        "UserModifyRequest22": UserModifyRequest22,
+    }
+    client.command.return_value = "ok"
+    return client
+
+
+def rows(count=3):
+    return [{"operation": "user.create", "user_id": f"user{i}"} for i in range(count)]
+
+
+def test_timeouts_and_busy_responses_are_transient():
+    policy = RetryPolicy()
+
+    assert policy.transient(error=MErrorSocketTimeout("slow"))
+    assert policy.transient(error=MErrorSendRequestFailed("reset"))
+    assert policy.transient(error=asyncio.TimeoutError())
+    assert policy.transient(
+        response=ErrorResponse(summary="System busy, try again later")
+    )
+
+
+def test_business_errors_are_permanent():
+    policy = RetryPolicy()
+
+    assert not policy.transient(error=MErrorResponse("bad request"))
+    assert not policy.transient(error=ValueError("1 validation error"))
+    assert not policy.transient(response=ErrorResponse(summary="User not found"))
+    assert not policy.transient(response="ok")
+
+
+def test_wrapped_errors_are_classified_by_their_cause():
+    policy = RetryPolicy()
+    try:
+        try:
+            raise MErrorSocketTimeout("slow")
+        except MErrorSocketTimeout as e:
+            raise ValueError(f"Error executing command: {e}") from e
+    except ValueError as wrapped:
+        assert policy.transient(error=wrapped)
+
+
+def error_response(code):
+    return Parser.to_class_from_xml(
+        '<command echo="" type="Error" xsi:type="c:ErrorResponse" xmlns:c="C" xmlns=""'
+        ' xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        f"<errorCode>{code}</errorCode><summary>[Error {code}] Denied</summary>"
+        f"<summaryEnglish>[Error {code}] Denied</summaryEnglish></command>",
+        ErrorResponse,
+    )
+
+
+def test_busy_codes_are_transient():
+    policy = RetryPolicy(busy_codes=frozenset({4001}))
+
+    assert policy.transient(response=error_response(4001))
+    assert not policy.transient(response=error_response(4002))
+
+
+def test_delay_doubles_up_to_the_cap():
+    policy = RetryPolicy(base_delay=1, max_delay=5, jitter=False)
+
+    assert [policy.delay(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+    assert 2 <= RetryPolicy(base_delay=1).delay(3) <= 4
+
+
+def test_invalid_policies_are_rejected():
+    with pytest.raises(ValueError):
+        RetryPolicy(retries=-1)
+    with pytest.raises(ValueError):
+        RetryPolicy(base_delay=10, max_delay=1)
+
+
+def test_transient_failure_is_retried(client):
+    client.command.side_effect = [MErrorSocketTimeout("slow"), "ok", "ok"]
+    results = []
+
+    summary = ThingBulkOperations(client).stream_from_data(
+        rows(2), results.append, retry=NO_WAIT
+    )
+
+    assert client.command.call_count == 3
+    assert [result["success"] for result in results] == [True, True]
+    assert results[0]["attempts"] == 2
+    assert "attempts" not in results[1]
+    assert summary.retried == 1
+
+
+def test_permanent_failure_is_not_retried(client):
+    client.command.side_effect = MErrorResponse("User already exists")
+
+    results = ThingBulkOperations(client).execute_from_data(rows(1), retry=NO_WAIT)
+
+    assert client.command.call_count == 1
+    assert results[0]["success"] is False
+
+
+def test_busy_response_is_retried_until_it_clears(client):
+    client.command.side_effect = [ErrorResponse(summary="Server busy"), "ok"]
+
+    results = ThingBulkOperations(client).execute_from_data(rows(1), retry=NO_WAIT)
+
+    assert results[0]["success"] is True
+    assert results[0]["response"] == "ok"
+
+
+def test_row_gives_up_after_its_retries(client):
+    client.command.side_effect = MErrorSocketTimeout("slow")
+
+    results = ThingBulkOperations(client).execute_from_data(
+        rows(1), retry=RetryPolicy(retries=2, base_delay=0, max_delay=0)
+    )
+
+    assert client.command.call_count == 3
+    assert results[0]["success"] is False
+    assert results[0]["attempts"] == 3
+    assert "MErrorSocketTimeout" in results[0]["error"]
+
+
+def test_job_budget_caps_retries(client):
+    client.command.side_effect = MErrorSocketTimeout("slow")
+
+    summary = ThingBulkOperations(client).stream_from_data(
+        rows(3), lambda result: None, retry=RetryPolicy(budget=2, base_delay=0)
+    )
+
+    assert client.command.call_count == 5
+    assert summary.retried == 2
+    assert summary.failed == 3
+
+
+def test_no_retries_without_a_policy(client):
+    client.command.side_effect = MErrorSocketTimeout("slow")
+
+    results = ThingBulkOperations(client).execute_from_data(rows(1))
+
+    assert client.command.call_count == 1
+    assert results[0]["success"] is False
+
+
+def test_fresh_rows_run_while_a_retry_waits(client):
+    pool = FlakyPool(flaky=["user0"])
+
+    results = ThingBulkOperations(client).execute_from_data(
+        rows(4),
+        concurrency=2,
+        pool=pool,
+        retry=RetryPolicy(base_delay=0.05, jitter=False),
+    )
+
+    assert all(result["success"] for result in results)
+    assert results[0]["attempts"] == 2
+    # The retry went out only after every other row, its worker kept going
+    assert pool.sent[-1] == ("UserAddRequest", "user0")
+    assert len(pool.sent) == 5
+
+
+def test_retry_keeps_rows_for_the_same_entity_in_order(client):
+    pool = FlakyPool(flaky=["user0"], failures=2)
+    data = rows(2) + [
+        {"operation": "user.modify", "user_id": "user0", "first_name": "Ada"}
+    ]
+
+    results = ThingBulkOperations(client).execute_from_data(
+        data, concurrency=2, pool=pool, retry=NO_WAIT
+    )
+
+    assert all(result["success"] for result in results)
+    user0 = [name for name, user_id in pool.sent if user_id == "user0"]
+    assert user0 == ["UserAddRequest"] * 3 + ["UserModifyRequest22"]
+
+
+@pytest.mark.asyncio
+async def test_run_ordered_runs_an_item_again_after_its_delay():
+    log = []
+    again = {"a"}
+
+    async def handle(item):
+        log.append(item)
+        if item in again:
+            again.discard(item)
+            return 0.01
+        return None
+
+    await run_ordered(["a", "b", "c"], handle, lambda item: item, concurrency=1)
+
+    assert log == ["a", "b", "c", "a"]
@@ -0,0 +1,107 @@
+from unittest.mock import Mock
+
+from mercury_ocip.bulk.base_operation import MAX_ROW_PLANS, BaseBulkOperations
+from mercury_ocip.bulk.row_plan import RowPlan, parse_key_path
+from mercury_ocip.client import Client
+
+MAPPING = {
+    "queue.create": {"command": "QueueAddRequest", "integer_fields": ["queue_length"]},
+    "queue.modify": {"command": "QueueModifyRequest"},
+}
+
+
+class QueueBulkOperations(BaseBulkOperations):
+    operation_mapping = MAPPING
+
+
+def test_parse_key_path():
+    assert parse_key_path("user_id") == [("user_id", None)]
+    assert parse_key_path("service.data[1].name") == [
+        ("service", None),
+        ("data", 1),
+        ("name", None),
+    ]
+    assert parse_key_path("n[0][1]") == [("n[0][1]", None)]
+
+
+def test_plan_compiles_keys_and_paths_once():
+    plan = RowPlan(
+        ("operation", "serviceUserId", "agent[1].userId", "profile.isActive"), MAPPING
+    )
+
+    assert plan.keys == (
+        "operation",
+        "service_user_id",
+        "agent[1].user_id",
+        "profile.is_active",
+    )
+    assert plan.paths == (
+        None,
+        None,
+        (("agent", 1), ("user_id", None)),
+        (("profile", None), ("is_active", None)),
+    )
+    assert plan.array_roots == ("agent",)
+
+
+def test_build_converts_and_nests_values():
+    plan = RowPlan(
+        (
+            "operation",
+            "queueLength",
+            "phoneNumber",
+            "profile.isActive",
+            "alias[2]",
+            "alias[0]",
+            "agent[1].userId",
+            "agent[3].userId",
+            "note",
+        ),
+        MAPPING,
+    )
+    row = {
+        "operation": "queue.create",
+        "queueLength": " 10 ",
+        "phoneNumber": '"+1-5551234"',
+        "profile.isActive": "TRUE",
+        "alias[2]": "b",
+        "alias[0]": "a",
+        "agent[1].userId": "one",
+        "agent[3].userId": "None",
+        "note": "",
+    }
+
+    assert plan.build(row) == {
+        "operation": "queue.create",
+        "queue_length": 10,
+        "phone_number": '"+1-5551234"',
+        "profile": {"is_active": True},
+        "alias": ["a", "b"],
+        "agent": [{"user_id": "one"}],
+    }
+
+
+def test_integer_fields_follow_the_row_operation():
+    plan = RowPlan(("operation", "queueLength"), MAPPING)
+
+    assert plan.build({"operation": "queue.create", "queueLength": "5"}) == {
+        "operation": "queue.create",
+        "queue_length": 5,
+    }
+    assert plan.build({"operation": "queue.modify", "queueLength": "5"}) == {
+        "operation": "queue.modify",
+        "queue_length": "5",
+    }
+
+
+def test_process_row_reuses_plans_per_header():
+    operations = QueueBulkOperations(Mock(spec=Client))
+
+    operations._process_row({"operation": "queue.create", "queueLength": "1"})
+    plan = operations._row_plans[("operation", "queueLength")]
+    operations._process_row({"operation": "queue.create", "queueLength": "2"})
+
+    assert operations._row_plans[("operation", "queueLength")] is plan
+    for i in range(MAX_ROW_PLANS + 1):
+        operations._process_row({"operation": "queue.modify", f"field{i}": "x"})
+    assert len(operations._row_plans) <= MAX_ROW_PLANS
@@ -0,0 +1,199 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import List, Optional
+from unittest.mock import Mock
+
+import pytest
+
+from mercury_ocip.bulk.base_operation import BaseBulkOperations
+from mercury_ocip.bulk.scheduler import BulkJob, provided_key, referenced_keys
+from mercury_ocip.client import Client
+from mercury_ocip.commands.base_command import ErrorResponse
+from mercury_ocip.pool import BasePool
+
+
+@dataclass
+class DeviceAddRequest:
+    service_provider_id: str
+    group_id: str
+    device_name: str
+
+
+@dataclass
+class UserAddRequest:
+    service_provider_id: str
+    group_id: str
+    user_id: str
+    access_device_endpoint: Optional[dict] = None
+
+
+@dataclass
+class HuntGroupAddRequest:
+    service_provider_id: str
+    group_id: str
+    service_user_id: str
+    agent_user_id: List[str] = field(default_factory=list)
+
+
+class Devices(BaseBulkOperations):
+    operation_mapping = {"device.create": {"command": "DeviceAddRequest"}}
+
+
+class Users(BaseBulkOperations):
+    operation_mapping = {"user.create": {"command": "UserAddRequest"}}
+
+
+class HuntGroups(BaseBulkOperations):
+    operation_mapping = {"hunt.group.create": {"command": "HuntGroupAddRequest"}}
+
+
+class OrderPool(BasePool):
+    """Records the order commands complete in, failing any in ``fail``"""
+
+    def __init__(self, fail=()):
+        self.done = []
+        self.fail = set(fail)
+
+    @property
+    def size(self):
+        return 4
+
+    async def command(self, command, lane="normal"):
+        await asyncio.sleep(0.001)
+        name = getattr(command, "device_name", None) or getattr(
+            command, "service_user_id", None
+        )
+        name = name or command.user_id
+        self.done.append(name)
+        if name in self.fail:
+            return ErrorResponse(summary=f"{name} failed", detail="")
+        return f"ok:{name}"
+
+    async def authenticate(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def client():
+    client = Mock(spec=Client)
+    client._dispatch_table = {
+        "DeviceAddRequest": DeviceAddRequest,
+        "UserAddRequest": UserAddRequest,
+        "HuntGroupAddRequest": HuntGroupAddRequest,
+    }
+    return client
+
+
+def site():
+    scope = {"service_provider_id": "Acme", "group_id": "Sales"}
+    devices = [
+        {"operation": "device.create", **scope, "device_name": f"dev{i}"}
+        for i in range(2)
+    ]
+    users = [
+        {
+            "operation": "user.create",
+            **scope,
+            "user_id": f"user{i}@acme.com",
+            "access_device_endpoint": {
+                "access_device": {"device_name": f"dev{i}", "device_level": "Group"}
+            },
+        }
+        for i in range(2)
+    ] + [{"operation": "user.create", **scope, "user_id": "solo@acme.com"}]
+    hunt_groups = [
+        {
+            "operation": "hunt.group.create",
+            **scope,
+            "service_user_id": "hg@acme.com",
+            "agent_user_id": ["user0@acme.com", "user1@acme.com", "elsewhere@acme.com"],
+        }
+    ]
+    return hunt_groups, users, devices
+
+
+def test_references_and_provided_keys():
+    hunt_groups, users, devices = site()
+
+    assert provided_key(devices[0]) == ("device", "Acme", "Sales", "dev0")
+    assert provided_key(users[0]) == ("user", "user0@acme.com")
+    assert referenced_keys(users[0]) == {("device", "Acme", "Sales", "dev0")}
+    assert referenced_keys(hunt_groups[0]) == {
+        ("user", "user0@acme.com"),
+        ("user", "user1@acme.com"),
+        ("user", "elsewhere@acme.com"),
+    }
+
+
+def test_levels_follow_references(client):
+    hunt_groups, users, devices = site()
+    job = BulkJob()
+    job.add(HuntGroups(client), hunt_groups)
+    job.add(Users(client), users)
+    job.add(Devices(client), devices)
+
+    levels = job.levels()
+
+    assert sorted(levels[0]) == [(1, 2), (2, 0), (2, 1)]
+    assert sorted(levels[1]) == [(1, 0), (1, 1)]
+    assert levels[2] == [(0, 0)]
+
+
+def test_run_orders_sheets_by_dependency(client):
+    hunt_groups, users, devices = site()
+    job = BulkJob()
+    job.add(HuntGroups(client), hunt_groups)
+    job.add(Users(client), users)
+    job.add(Devices(client), devices)
+    pool = OrderPool()
+
+    hunt_group_results, user_results, device_results = job.run(pool=pool)
+
+    done = pool.done
+    assert done.index("dev0") < done.index("user0@acme.com") < done.index("hg@acme.com")
+    assert done.index("dev1") < done.index("user1@acme.com") < done.index("hg@acme.com")
+    assert [result["index"] for result in user_results] == [0, 1, 2]
+    assert all(result["success"] for result in user_results + device_results)
+    assert hunt_group_results[0]["response"] == "ok:hg@acme.com"
+
+
+def test_failed_prerequisite_skips_dependents_only(client):
+    hunt_groups, users, devices = site()
+    job = BulkJob()
+    job.add(Devices(client), devices)
+    job.add(Users(client), users)
+    job.add(HuntGroups(client), hunt_groups)
+    pool = OrderPool(fail={"dev1"})
+
+    device_results, user_results, hunt_group_results = job.run(pool=pool)
+
+    assert not device_results[1]["success"]
+    assert user_results[0]["success"] and user_results[2]["success"]
+    assert "Skipped" in user_results[1]["error"]
+    assert "Skipped" in hunt_group_results[0]["error"]
+    assert "user1@acme.com" not in pool.done and "hg@acme.com" not in pool.done
+
+
+def test_cycles_are_rejected(client):
+    job = BulkJob()
+    job.add(
+        HuntGroups(client),
+        [
+            {
+                "operation": "hunt.group.create",
+                "service_user_id": "a",
+                "agent_user_id": ["b"],
+            },
+            {
+                "operation": "hunt.group.create",
+                "service_user_id": "b",
+                "agent_user_id": ["a"],
+            },
+        ],
+    )
+
+    with pytest.raises(ValueError):
+        job.levels()
@@ -0,0 +1,187 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+
+from mercury_ocip.bulk.base_operation import BaseBulkOperations
+from mercury_ocip.bulk.retry import RetryPolicy
+from mercury_ocip.bulk.sharding import ShardedRunner
+from mercury_ocip.client import Client
+from mercury_ocip.commands.base_command import ErrorResponse
+from mercury_ocip.exceptions import MErrorSocketTimeout
+
+
+@dataclass
+class UserAddRequest:
+    service_provider_id: str
+    group_id: str
+    user_id: str
+    first_name: Optional[str] = None
+
+
+class ThingBulkOperations(BaseBulkOperations):
+    operation_mapping = {"user.create": {"command": "UserAddRequest"}}
+
+
+def worker_client():
+    """A client answering with the worker's pid and how many commands it has sent."""
+    client = Mock(spec=Client)
+    client._dispatch_table = {"UserAddRequest": UserAddRequest}
+    sent = []
+
+    def command(command):
+        sent.append(command.user_id)
+        if command.user_id == "bad":
+            return ErrorResponse(summary="User already exists")
+        return json.dumps({"pid": os.getpid(), "order": len(sent)})
+
+    client.command.side_effect = command
+    return client
+
+
+def timeout_client():
+    client = worker_client()
+    client.command.side_effect = MErrorSocketTimeout("slow")
+    return client
+
+
+def broken_client():
+    raise ConnectionError("login refused")
+
+
+def dying_client():
+    os._exit(3)
+
+
+@pytest.fixture
+def operations():
+    return ThingBulkOperations(worker_client())
+
+
+def rows(groups=3, per_group=4):
+    return [
+        {
+            "operation": "user.create",
+            "service_provider_id": "Acme",
+            "group_id": f"group{i % groups}",
+            "user_id": f"user{i}",
+        }
+        for i in range(groups * per_group)
+    ]
+
+
+def test_groups_are_balanced_without_being_split(operations):
+    data = (
+        [{"group_id": "big"}] * 6
+        + [{"group_id": "mid"}] * 4
+        + [{"group_id": "small"}] * 3
+    )
+    runner = ShardedRunner(operations, workers=2, client_factory=worker_client)
+
+    shards = runner.shards(data, lambda row: row["group_id"])
+
+    assert shards == [list(range(6)), list(range(6, 13))]
+
+
+def test_no_more_shards_than_groups(operations):
+    runner = ShardedRunner(operations, workers=8, client_factory=worker_client)
+
+    assert len(runner.shards(rows(groups=2), lambda row: row["group_id"])) == 2
+
+
+def test_invalid_runner_settings_are_rejected(operations):
+    with pytest.raises(ValueError):
+        ShardedRunner(operations, workers=0)
+    with pytest.raises(ValueError):
+        ShardedRunner(operations, workers=2, concurrency=0)
+
+
+def test_each_group_runs_in_one_worker_in_order(operations):
+    data = rows()
+    runner = ShardedRunner(operations, workers=3, client_factory=worker_client)
+
+    results = runner.execute_from_data(data)
+
+    assert [result["index"] for result in results] == list(range(len(data)))
+    assert all(result["success"] for result in results)
+    by_group = {}
+    for row, result in zip(data, results):
+        by_group.setdefault(row["group_id"], []).append(json.loads(result["response"]))
+    for answers in by_group.values():
+        assert len({answer["pid"] for answer in answers}) == 1
+        orders = [answer["order"] for answer in answers]
+        assert orders == sorted(orders)
+    pids = {answer["pid"] for answers in by_group.values() for answer in answers}
+    assert len(pids) == 3 and os.getpid() not in pids
+
+
+def test_results_stream_back_into_the_summary(operations):
+    data = rows(groups=2, per_group=2)
+    data[1]["user_id"] = "bad"
+    seen = []
+    reports = []
+    runner = ShardedRunner(operations, workers=2, client_factory=worker_client)
+
+    summary = runner.stream_from_data(data, seen.append, progress=reports.append)
+
+    assert summary.as_dict() == {
+        "total": 4,
+        "succeeded": 3,
+        "failed": 1,
+        "skipped": 0,
+        "retried": 0,
+    }
+    assert sorted(result["index"] for result in seen) == [0, 1, 2, 3]
+    assert reports[-1].done and reports[-1].completed == 4 and reports[-1].total == 4
+
+
+def test_csv_rows_are_built_in_the_workers(operations, tmp_path):
+    sheet = tmp_path / "users.csv"
+    sheet.write_text(
+        "operation,serviceProviderId,groupId,userId,firstName\n"
+        "user.create,Acme,Sales,a,Ada\n"
+        "user.create,Acme,Support,b,Bob\n"
+        "user.create,Acme,Sales,c,Cy\n"
+    )
+    runner = ShardedRunner(operations, workers=2, client_factory=worker_client)
+
+    results = runner.execute_from_csv(str(sheet))
+
+    assert [result["data"]["user_id"] for result in results] == ["a", "b", "c"]
+    assert results[0]["data"]["first_name"] == "Ada"
+    assert isinstance(results[0]["command"], UserAddRequest)
+    sales = [json.loads(results[i]["response"]) for i in (0, 2)]
+    assert sales[0]["pid"] == sales[1]["pid"]
+
+
+def test_a_worker_that_cannot_start_fails_its_rows(operations):
+    runner = ShardedRunner(operations, workers=2, client_factory=broken_client)
+
+    results = runner.execute_from_data(rows(groups=2, per_group=2))
+
+    assert [result["success"] for result in results] == [False] * 4
+    assert all("login refused" in result["error"] for result in results)
+
+
+def test_rows_of_a_worker_that_dies_are_failed(operations):
+    runner = ShardedRunner(operations, workers=1, client_factory=dying_client)
+
+    results = runner.execute_from_data(rows(groups=1, per_group=2))
+
+    assert [result["error"] for result in results] == ["Worker failed: exit code 3"] * 2
+
+
+def test_retry_budget_is_split_between_workers(operations):
+    runner = ShardedRunner(operations, workers=2, client_factory=timeout_client)
+
+    summary = runner.stream_from_data(
+        rows(groups=2, per_group=3),
+        lambda result: None,
+        retry=RetryPolicy(retries=5, budget=2, base_delay=0, max_delay=0),
+    )
+
+    assert summary.failed == 6
+    assert summary.retried == 2
@@ -0,0 +1,151 @@
+import asyncio
+import io
+import json
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+
+from mercury_ocip.bulk.base_operation import BaseBulkOperations
+from mercury_ocip.bulk.streaming import BulkSummary, JsonLinesSink
+from mercury_ocip.client import Client
+from mercury_ocip.commands.base_command import ErrorResponse
+from mercury_ocip.pool import BasePool
+from mercury_ocip.utils.file_handler import FileHandler
+
+
+@dataclass
+class UserAddRequest:
+    user_id: str
+    first_name: Optional[str] = None
+
+
+class ThingBulkOperations(BaseBulkOperations):
+    operation_mapping = {"user.create": {"command": "UserAddRequest"}}
+
+
+class SlowPool(BasePool):
+    def __init__(self):
+        self.sent = 0
+
+    @property
+    def size(self):
+        return 4
+
+    async def command(self, command, lane="normal"):
+        await asyncio.sleep(0.001)
+        self.sent += 1
+        if command.first_name == "error":
+            return ErrorResponse(summary="User already exists", detail="dup")
+        return f"ok:{command.user_id}"
+
+    async def authenticate(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def operations():
+    client = Mock(spec=Client)
+    client._dispatch_table = {"UserAddRequest": UserAddRequest}
+    client.command.side_effect = lambda command: f"ok:{command.user_id}"
+    return ThingBulkOperations(client)
+
+
+@pytest.fixture
+def sheet(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "\ufeffoperation,userId,firstName\n"
+        "user.create,user0,Ann\n"
+        ",,\n"
+        "user.create,user1\n"
+        "user.create,,Bob\n",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_iter_csv_rows_is_lazy_and_skips_blank_rows(sheet):
+    rows = FileHandler.iter_csv_rows(sheet)
+
+    assert next(rows) == {
+        "operation": "user.create",
+        "userId": "user0",
+        "firstName": "Ann",
+    }
+    assert list(rows) == [
+        {"operation": "user.create", "userId": "user1"},
+        {"operation": "user.create", "userId": "", "firstName": "Bob"},
+    ]
+
+
+def test_iter_csv_rows_checks_the_file_up_front(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        FileHandler.iter_csv_rows(str(tmp_path / "missing.csv"))
+
+
+def test_stream_from_csv_hands_each_result_to_the_sink(operations, sheet):
+    results = []
+
+    summary = operations.stream_from_csv(sheet, results.append)
+
+    assert summary.as_dict() == {
+        "total": 3,
+        "succeeded": 2,
+        "failed": 1,
+        "skipped": 0,
+        "retried": 0,
+    }
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert results[0]["response"] == "ok:user0"
+    assert results[1]["data"] == {"user_id": "user1"}
+    assert "Error creating command" in results[2]["error"]
+
+
+def test_stream_from_data_reads_no_further_than_it_sends(operations):
+    pool = SlowPool()
+    read = []
+
+    def rows():
+        for i in range(200):
+            # Never more than the rows in flight ahead of those answered
+            assert i - pool.sent <= 4
+            read.append(i)
+            yield {"operation": "user.create", "user_id": f"user{i}"}
+
+    summary = operations.stream_from_data(rows(), lambda result: None, pool=pool)
+
+    assert summary.succeeded == 200 and len(read) == 200
+
+
+def test_stream_from_data_async_counts_failures(operations):
+    pool = SlowPool()
+    data = [
+        {"operation": "user.create", "user_id": "user0"},
+        {"operation": "user.create", "user_id": "user1", "first_name": "error"},
+        {"operation": "user.create"},
+    ]
+    results = []
+
+    summary = asyncio.run(
+        operations.stream_from_data_async(data, results.append, pool=pool)
+    )
+
+    assert summary == BulkSummary(total=3, succeeded=1, failed=2)
+    assert sorted(result["index"] for result in results) == [0, 1, 2]
+
+
+def test_json_lines_sink_leaves_out_the_command(operations, sheet):
+    handle = io.StringIO()
+
+    with JsonLinesSink(handle) as sink:
+        operations.stream_from_csv(sheet, sink)
+
+    lines = [json.loads(line) for line in handle.getvalue().splitlines()]
+    assert sink.written == 3
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert "command" not in lines[0] and lines[0]["success"]
@@ -0,0 +1,308 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+
+from mercury_ocip.bulk.base_operation import SKIPPED_UNCHANGED, BaseBulkOperations
+from mercury_ocip.client import Client
+from mercury_ocip.commands.base_command import ErrorResponse, OCITable, OCITableRow
+from mercury_ocip.pool import BasePool
+
+
+@dataclass
+class UserAddRequest:
+    service_provider_id: str
+    group_id: str
+    user_id: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    password: Optional[str] = None
+
+
+@dataclass
+class UserModifyRequest:
+    user_id: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    department: Optional[str] = None
+
+
+@dataclass
+class UserListRequest:
+    service_provider_id: str
+    group_id: str
+
+
+@dataclass
+class UserGetRequest:
+    user_id: str
+
+
+@dataclass
+class AgentListGetRequest:
+    service_user_id: str
+
+
+@dataclass
+class AgentListModifyRequest:
+    service_user_id: str
+    agent_user_id_list: Optional[dict] = None
+
+
+class UserList:
+    def __init__(self, *users):
+        self.user_table = OCITable(
+            ["User Id", "First Name", "Last Name"],
+            [OCITableRow(list(user)) for user in users],
+        )
+
+
+class User:
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def to_dict(self):
+        return self.fields
+
+
+class AgentList:
+    def __init__(self, *agents):
+        self.agent_table = OCITable(
+            ["User Id", "Last Name"], [OCITableRow([agent, "x"]) for agent in agents]
+        )
+
+
+USER_STATE = {
+    "command": "UserListRequest",
+    "scope": ["service_provider_id", "group_id"],
+    "table": "user_table",
+    "key": "user_id",
+}
+
+
+class ThingBulkOperations(BaseBulkOperations):
+    operation_mapping = {
+        "user.create": {
+            "command": "UserAddRequest",
+            "upsert": {"state": USER_STATE, "modify": "user.modify"},
+        },
+        "user.modify": {
+            "command": "UserModifyRequest",
+            "upsert": {"state": {"command": "UserGetRequest", "scope": ["user_id"]}},
+        },
+        "user.update": {
+            "command": "UserModifyRequest",
+            "lookup": ["service_provider_id", "group_id"],
+            "upsert": {
+                "state": [
+                    {**USER_STATE, "fields": ["first_name", "last_name"]},
+                    {"command": "UserGetRequest", "scope": ["user_id"]},
+                ]
+            },
+        },
+        "agents.update": {
+            "command": "AgentListModifyRequest",
+            "upsert": {
+                "state": {
+                    "command": "AgentListGetRequest",
+                    "scope": ["service_user_id"],
+                    "table": "agent_table",
+                    "collect": {"user_id": "agent_user_id_list.user_id"},
+                }
+            },
+        },
+    }
+
+
+def server(command):
+    if isinstance(command, UserListRequest):
+        if command.group_id == "Gone":
+            return ErrorResponse(summary="Group not found", detail="")
+        return UserList(("ann", "Ann", "Lee"), ("bob", "Bob", "Ray"))
+    if isinstance(command, UserGetRequest):
+        return User(user_id=command.user_id, first_name="Ann", last_name="Lee")
+    if isinstance(command, AgentListGetRequest):
+        return AgentList("ann", "bob")
+    return "ok"
+
+
+@pytest.fixture
+def client():
+    client = Mock(spec=Client)
+    client._dispatch_table = {
+        cls.__name__: cls
+        for cls in (
+            UserAddRequest,
+            UserModifyRequest,
+            UserListRequest,
+            UserGetRequest,
+            AgentListGetRequest,
+            AgentListModifyRequest,
+        )
+    }
+    client.command.side_effect = server
+    return client
+
+
+def sent(client, kind):
+    return [
+        call.args[0]
+        for call in client.command.call_args_list
+        if isinstance(call.args[0], kind)
+    ]
+
+
+def create(user_id, first_name, last_name, group_id="Sales"):
+    return {
+        "operation": "user.create",
+        "service_provider_id": "Acme",
+        "group_id": group_id,
+        "user_id": user_id,
+        "first_name": first_name,
+        "last_name": last_name,
+        "password": "secret",
+    }
+
+
+def test_creates_of_existing_users_become_modifies(client):
+    operations = ThingBulkOperations(client)
+    data = [
+        create("ann", "Ann", "Lee"),
+        create("bob", "Robert", "Ray"),
+        create("cat", "Cat", "Fox"),
+    ]
+
+    results = operations.execute_from_data(data, upsert=True)
+
+    assert len(sent(client, UserListRequest)) == 1
+    assert results[0]["skipped"] and results[0]["response"] == SKIPPED_UNCHANGED
+    assert results[1]["command"] == UserModifyRequest(
+        user_id="bob", first_name="Robert"
+    )
+    assert isinstance(results[2]["command"], UserAddRequest)
+    assert [command.user_id for command in sent(client, UserAddRequest)] == ["cat"]
+
+
+def test_modifies_send_only_changed_fields(client):
+    operations = ThingBulkOperations(client)
+    data = [
+        {"operation": "user.modify", "user_id": "ann", "first_name": "Ann"},
+        {
+            "operation": "user.modify",
+            "user_id": "ann",
+            "first_name": "Ann",
+            "last_name": "Smith",
+        },
+    ]
+
+    results = operations.execute_from_data(data, upsert=True)
+
+    assert len(sent(client, UserGetRequest)) == 1
+    assert results[0]["skipped"]
+    assert results[1]["command"] == UserModifyRequest(user_id="ann", last_name="Smith")
+
+
+def test_modifies_read_each_group_once(client):
+    operations = ThingBulkOperations(client)
+    group = {"operation": "user.update", "service_provider_id": "Acme"}
+    data = [
+        {**group, "group_id": "Sales", "user_id": "ann", "first_name": "Ann"},
+        {**group, "group_id": "Sales", "user_id": "bob", "first_name": "Robert"},
+        {**group, "group_id": "Sales", "user_id": "ann", "department": "Ops"},
+        {"operation": "user.update", "user_id": "bob", "last_name": "Ray"},
+    ]
+
+    results = operations.execute_from_data(data, upsert=True)
+
+    assert len(sent(client, UserListRequest)) == 1
+    # Departments are not in the list, the third row reads its user
+    assert [command.user_id for command in sent(client, UserGetRequest)] == [
+        "ann",
+        "bob",
+    ]
+    assert results[0]["skipped"]
+    assert results[1]["command"] == UserModifyRequest(
+        user_id="bob", first_name="Robert"
+    )
+    assert results[2]["command"] == UserModifyRequest(user_id="ann", department="Ops")
+
+
+def test_agent_lists_compare_whole_lists(client):
+    operations = ThingBulkOperations(client)
+    data = [
+        {
+            "operation": "agents.update",
+            "service_user_id": "cc1",
+            "agent_user_id_list": {"user_id": ["ann", "bob"]},
+        },
+        {
+            "operation": "agents.update",
+            "service_user_id": "cc2",
+            "agent_user_id_list": {"user_id": ["bob", "ann"]},
+        },
+    ]
+
+    results = operations.execute_from_data(data, upsert=True)
+
+    assert results[0]["skipped"]
+    assert results[1]["command"].agent_user_id_list == {"user_id": ["bob", "ann"]}
+
+
+def test_rows_with_unknown_state_are_sent_as_they_are(client):
+    operations = ThingBulkOperations(client)
+
+    results = operations.execute_from_data(
+        [create("ann", "Ann", "Lee", group_id="Gone")], upsert=True
+    )
+
+    assert isinstance(results[0]["command"], UserAddRequest)
+    assert results[0]["command"].password == "secret"
+
+
+def test_dry_run_reads_but_does_not_write(client):
+    operations = ThingBulkOperations(client)
+
+    results = operations.execute_from_data(
+        [create("ann", "Ann", "Lee"), create("bob", "Robert", "Ray")],
+        dry_run=True,
+        upsert=True,
+    )
+
+    assert results[0]["skipped"] and not results[1].get("skipped")
+    assert sent(client, UserModifyRequest) == []
+
+
+def test_concurrent_runs_read_through_the_pool(client):
+    class Pool(BasePool):
+        def __init__(self):
+            self.sent = []
+
+        @property
+        def size(self):
+            return 4
+
+        async def command(self, command, lane="normal"):
+            await asyncio.sleep(0)
+            self.sent.append(command)
+            return server(command)
+
+        async def authenticate(self):
+            pass
+
+        async def close(self):
+            pass
+
+    operations = ThingBulkOperations(client)
+    pool = Pool()
+    data = [create(f"user{i}", "New", "User") for i in range(3)] + [
+        create("ann", "Ann", "Lee")
+    ]
+
+    results = operations.execute_from_data(data, pool=pool, upsert=True)
+
+    assert sum(isinstance(command, UserListRequest) for command in pool.sent) == 1
+    assert sum(isinstance(command, UserAddRequest) for command in pool.sent) == 3
+    assert results[3]["skipped"]
+    client.command.assert_not_called()
@@ -0,0 +1,146 @@
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+
+from mercury_ocip.cache import (
+    MemoryCacheBackend,
+    ResponseCache,
+    SQLiteCacheBackend,
+    command_key,
+)
+from mercury_ocip.commands.base_command import (
+    ErrorResponse,
+    OCIRequest,
+    OCIResponse,
+    SuccessResponse,
+)
+
+
+class UserGetRequest23V2(OCIRequest):
+    user_id: str
+
+
+class GroupHuntGroupGetInstanceListRequest(OCIRequest):
+    service_provider_id: str
+    group_id: str
+
+
+class UserModifyRequest22(OCIRequest):
+    user_id: str
+    last_name: Optional[str] = None
+
+
+class UserAddRequest22(OCIRequest):
+    service_provider_id: str
+    group_id: str
+    user_id: str
+
+
+class UserGetResponse23V2(OCIResponse):
+    last_name: str
+
+
+@pytest.fixture
+def cache():
+    return ResponseCache()
+
+
+def test_command_key_is_canonical():
+    first = UserGetRequest23V2(user_id="alice")
+    second = UserGetRequest23V2()
+    second.user_id = "alice"
+
+    assert command_key(first) == command_key(second)
+    assert command_key(first) != command_key(UserGetRequest23V2(user_id="bob"))
+
+
+def test_read_is_cached(cache):
+    command = UserGetRequest23V2(user_id="alice")
+    response = UserGetResponse23V2(last_name="Smith")
+
+    assert cache.get(command) is None
+    cache.update(command, response)
+
+    assert cache.get(UserGetRequest23V2(user_id="alice")) is response
+    assert cache.stats.as_dict()["hit_ratio"] == 0.5
+
+
+def test_error_responses_are_not_cached(cache):
+    command = UserGetRequest23V2(user_id="alice")
+
+    cache.update(command, ErrorResponse(summary="not found"))
+
+    assert cache.get(command) is None
+
+
+def test_write_invalidates_same_user(cache):
+    read = UserGetRequest23V2(user_id="alice")
+    other = UserGetRequest23V2(user_id="bob")
+    cache.update(read, UserGetResponse23V2(last_name="Smith"))
+    cache.update(other, UserGetResponse23V2(last_name="Jones"))
+
+    cache.update(UserModifyRequest22(user_id="alice"), SuccessResponse())
+
+    assert cache.get(read) is None
+    assert cache.get(other) is not None
+    assert cache.stats.invalidations == 1
+
+
+def test_add_invalidates_group_lists(cache):
+    listing = GroupHuntGroupGetInstanceListRequest(
+        service_provider_id="SP", group_id="Sales"
+    )
+    cache.update(listing, SuccessResponse())
+
+    cache.update(
+        UserAddRequest22(service_provider_id="SP", group_id="Sales", user_id="new"),
+        SuccessResponse(),
+    )
+
+    assert cache.get(listing) is None
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", 1, [], ttl=60)
+    backend.set("b", 2, [], ttl=60)
+    backend.get("a")
+    backend.set("c", 3, [], ttl=60)
+
+    assert backend.get("a") == 1
+    assert backend.get("b") is None
+    assert len(backend) == 2
+
+
+def test_memory_backend_expires_entries():
+    backend = MemoryCacheBackend()
+    with patch("mercury_ocip.cache.time.monotonic", return_value=100.0):
+        backend.set("a", 1, ["user_id=alice"], ttl=5)
+    with patch("mercury_ocip.cache.time.monotonic", return_value=106.0):
+        assert backend.get("a") is None
+    assert len(backend) == 0
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    writer = ResponseCache(backend=SQLiteCacheBackend(path))
+    reader = ResponseCache(backend=SQLiteCacheBackend(path))
+    command = UserGetRequest23V2(user_id="alice")
+
+    writer.update(command, UserGetResponse23V2(last_name="Smith"))
+
+    assert reader.get(command).last_name == "Smith"
+
+    reader.update(UserModifyRequest22(user_id="alice"), SuccessResponse())
+
+    assert writer.get(command) is None
+
+
+def test_sqlite_backend_evicts_beyond_limit(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=1)
+    backend.set("a", 1, [], ttl=60)
+    backend.set("b", 2, [], ttl=60)
+
+    assert len(backend) == 1
+    assert backend.get("b") == 2
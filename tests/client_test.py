@@ -3,6 +3,9 @@ import logging
 from unittest.mock import Mock, patch
 
 from mercury_ocip.client import Client
+from mercury_ocip.cache import ResponseCache
+from mercury_ocip.exceptions import MErrorDeadlineExceeded, MErrorSocketTimeout
+from mercury_ocip.timeouts import TimeoutPolicy, deadline
 from mercury_ocip.requester import SyncTCPRequester
 from mercury_ocip.commands.commands import (
     UserGetRegistrationListRequest,
@@ -40,7 +43,11 @@ def mock_requester():
         else:
             return "SuccessResponse"
 
+    def mock_send_request_bytes(command):
+        return mock_send_request(command.decode("ISO-8859-1"))
+
     mock_req.send_request.side_effect = mock_send_request
+    mock_req.send_request_bytes.side_effect = mock_send_request_bytes
     mock_req.disconnect = Mock()
     return mock_req
 
@@ -59,11 +66,11 @@ def mock_parser():
     """Mock parser that behaves like the real thing"""
     with (
         patch("mercury_ocip.client.Parser.to_dict_from_xml") as mock_dict,
-        patch("mercury_ocip.client.Parser.to_class_from_xml") as mock_class,
-        patch("mercury_ocip.client.Parser.to_xml_from_class") as mock_cls_to_xml,
+        patch("mercury_ocip.client.Parser.to_class_from_dict") as mock_class,
+        patch("mercury_ocip.client.Parser.to_xml_bytes_from_class") as mock_cls_to_xml,
     ):
 
-        def mock_to_dict_from_xml(xml_string):
+        def mock_to_dict_from_xml(xml_string, **kwargs):
             if "LoginResponse22V5" in xml_string:
                 return {
                     "command": {
@@ -89,12 +96,12 @@ def mock_parser():
                     }
                 }
 
-        def mock_to_class_from_xml(xml_string, cls):
-            if "LoginResponse22V5" in xml_string:
+        def mock_to_class_from_dict(data, cls, **kwargs):
+            if cls.__name__ == "LoginResponse22V5":
                 return LoginResponse22V5
-            if "LoginResponse14sp4" in xml_string:
+            if cls.__name__ == "LoginResponse14sp4":
                 return LoginResponse14sp4
-            if "AuthenticationResponse" in xml_string:
+            if cls.__name__ == "AuthenticationResponse":
                 return AuthenticationResponse(
                     nonce="12345678910",
                     user_id="user",
@@ -102,20 +109,20 @@ def mock_parser():
                 )
             return ErrorResponse
 
-        def mock_to_xml_from_class(cls):
+        def mock_to_xml_bytes_from_class(cls):
             if isinstance(cls, LoginRequest22V5):
-                return "LoginRequest22V5"
+                return b"LoginRequest22V5"
             if isinstance(cls, LoginRequest14sp4):
-                return "LoginRequest14sp4"
+                return b"LoginRequest14sp4"
             if isinstance(cls, AuthenticationRequest):
-                return "AuthenticationRequest"
+                return b"AuthenticationRequest"
             if isinstance(cls, UserGetRegistrationListRequest):
-                return "UserGetRegistrationListRequest"
-            return "SuccessResponse"
+                return b"UserGetRegistrationListRequest"
+            return b"SuccessResponse"
 
         mock_dict.side_effect = mock_to_dict_from_xml
-        mock_class.side_effect = mock_to_class_from_xml
-        mock_cls_to_xml.side_effect = mock_to_xml_from_class
+        mock_class.side_effect = mock_to_class_from_dict
+        mock_cls_to_xml.side_effect = mock_to_xml_bytes_from_class
         yield mock_dict, mock_class, mock_cls_to_xml
 
 
@@ -133,6 +140,7 @@ def mock_receive_response():
     Used to simulate auth failure
     """
     with patch("mercury_ocip.client.Client._receive_response") as mock_receive:
+
         def mock_receive_response(response):
             if "UserGetRegistrationListResponse" in response:
                 return "UserGetRegistrationListResponse"
@@ -192,9 +200,9 @@ class TestClient:
         assert client.session_id is not None
 
         mock_requester = mock_create_requester.return_value
-        mock_requester.send_request.assert_called_once()
+        mock_requester.send_request_bytes.assert_called_once()
 
-        call_args = mock_requester.send_request.call_args[0][0]
+        call_args = mock_requester.send_request_bytes.call_args[0][0]
         assert "LoginRequest22V5" in str(call_args)
 
     def test_authentication_success_without_tls(
@@ -208,7 +216,7 @@ class TestClient:
 
         mock_requester = mock_create_requester.return_value
 
-        call_args = mock_requester.send_request.call_args[0][0]
+        call_args = mock_requester.send_request_bytes.call_args[0][0]
         assert "LoginRequest14sp4" in str(call_args)
 
     @pytest.mark.skip(reason="pytest/attrs compatibility issue with frozen objects")
@@ -280,6 +288,249 @@ class TestClient:
         with pytest.raises(ValueError):
             client.raw_command("ThisCommandDoesntExist", userId="example_user")
 
+    def test_resolve_picks_version_for_release(
+        self,
+        mock_create_requester,
+        mock_parser,
+        mock_authenticate,
+        mock_receive_response,
+    ):
+        """Test a base command name resolves to the newest version a release supports"""
+
+        client = Client(host="localhost", username="user", password="pass")
+
+        assert client.resolve("LoginRequest") is LoginRequest22V5
+        assert client.resolve("LoginRequest", max_release="21sp1") is LoginRequest14sp4
+
+        with pytest.raises(ValueError):
+            client.resolve("LoginRequest", max_release="13")
+
+    def test_command_latest_sends_newest_version(
+        self,
+        mock_create_requester,
+        mock_parser,
+        mock_authenticate,
+    ):
+        """Test command_latest builds the newest version of a command"""
+
+        client = Client(host="localhost", username="user", password="pass")
+        client.authenticated = True
+
+        with patch.object(Client, "_receive_response", return_value=None):
+            client.command_latest("LoginRequest", user_id="user")
+
+        mock_create_requester.return_value.send_request_bytes.assert_called_with(
+            b"LoginRequest22V5"
+        )
+
+    def test_middleware_wraps_command(
+        self,
+        mock_create_requester,
+        mock_dispatch_table,
+        mock_parser,
+        mock_authenticate,
+        mock_receive_response,
+    ):
+        """Test middleware receives the command and its serialized request"""
+
+        seen = []
+
+        def middleware(command, payload, call_next):
+            seen.append((command.__class__.__name__, payload))
+            return call_next(command, payload)
+
+        client = Client(
+            host="localhost", username="user", password="pass", middleware=[middleware]
+        )
+        client.authenticated = True
+
+        response = client.command(
+            UserGetRegistrationListRequest(user_id="example_user")
+        )
+
+        assert response == "UserGetRegistrationListResponse"
+        assert seen == [
+            ("UserGetRegistrationListRequest", b"UserGetRegistrationListRequest")
+        ]
+
+    def test_async_middleware_rejected(
+        self,
+        mock_create_requester,
+        mock_dispatch_table,
+        mock_parser,
+        mock_authenticate,
+    ):
+        """Test a sync client refuses coroutine middleware"""
+
+        async def middleware(command, payload, call_next):
+            return await call_next(command, payload)
+
+        client = Client(host="localhost", username="user", password="pass")
+
+        with pytest.raises(TypeError):
+            client.use(middleware)
+
+    def test_timeout_policy_sets_request_timeout(
+        self,
+        mock_create_requester,
+        mock_dispatch_table,
+        mock_parser,
+        mock_authenticate,
+    ):
+        """Test an override reaches the requester and deadlines cut it"""
+
+        client = Client(
+            host="localhost",
+            username="user",
+            password="pass",
+            timeouts=TimeoutPolicy(overrides={"UserGetRegistrationListRequest": 120}),
+        )
+        client.authenticated = True
+        mock_requester = mock_create_requester.return_value
+        mock_requester.send_request_bytes.side_effect = None
+        mock_requester.send_request_bytes.return_value = b"response"
+        command = UserGetRegistrationListRequest(user_id="example_user")
+
+        with patch.object(Client, "_receive_response", return_value=None):
+            client.command(command)
+            assert mock_requester.send_request_bytes.call_args.args[1] == 120
+
+            with deadline(5):
+                client.command(command)
+            assert mock_requester.send_request_bytes.call_args.args[1] <= 5
+
+    def test_spent_deadline_is_not_sent(
+        self,
+        mock_create_requester,
+        mock_dispatch_table,
+        mock_parser,
+        mock_authenticate,
+    ):
+        """Test nothing is sent once the deadline has passed"""
+
+        client = Client(host="localhost", username="user", password="pass")
+        client.authenticated = True
+        mock_requester = mock_create_requester.return_value
+
+        with deadline(0), pytest.raises(MErrorDeadlineExceeded):
+            client.command(UserGetRegistrationListRequest(user_id="example_user"))
+
+        mock_requester.send_request_bytes.assert_not_called()
+
+    def test_timeout_drops_the_session(
+        self,
+        mock_create_requester,
+        mock_dispatch_table,
+        mock_parser,
+        mock_authenticate,
+    ):
+        """Test a timed out request leaves the client to log in again"""
+
+        client = Client(host="localhost", username="user", password="pass")
+        client.authenticated = True
+        mock_requester = mock_create_requester.return_value
+        mock_requester.send_request_bytes.side_effect = None
+        mock_requester.send_request_bytes.return_value = MErrorSocketTimeout("slow")
+
+        with patch.object(Client, "_receive_response", return_value=None):
+            client.command(UserGetRegistrationListRequest(user_id="example_user"))
+
+        assert client.authenticated is False
+
+    def test_command_served_from_cache(
+        self,
+        mock_create_requester,
+        mock_dispatch_table,
+        mock_parser,
+        mock_authenticate,
+        mock_receive_response,
+    ):
+        """Test a repeated Get request is answered by the cache"""
+
+        client = Client(
+            host="localhost", username="user", password="pass", cache=ResponseCache()
+        )
+        client.authenticated = True
+        mock_requester = mock_create_requester.return_value
+
+        first = client.command(UserGetRegistrationListRequest(user_id="example_user"))
+        second = client.command(UserGetRegistrationListRequest(user_id="example_user"))
+
+        assert first == second == "UserGetRegistrationListResponse"
+        assert mock_requester.send_request_bytes.call_count == 1
+        assert client.cache.stats.hits == 1
+
+    def test_raw_xml_skips_parser(
+        self, mock_create_requester, mock_dispatch_table, mock_parser, mock_authenticate
+    ):
+        """Test raw XML is relayed without being decoded"""
+
+        client = Client(host="localhost", username="user", password="pass")
+        client.authenticated = True
+        mock_dict, mock_class, _ = mock_parser
+
+        response = client.raw_xml(b"<command>UserGetRegistrationListRequest</command>")
+
+        assert response == b"UserGetRegistrationListResponse"
+        mock_dict.assert_not_called()
+        mock_class.assert_not_called()
+
+    def test_raw_xml_view_exposes_error_summary(
+        self, mock_create_requester, mock_dispatch_table, mock_parser, mock_authenticate
+    ):
+        """Test the raw XML view reads the type name and summary"""
+
+        client = Client(host="localhost", username="user", password="pass")
+        client.authenticated = True
+        mock_requester = mock_create_requester.return_value
+        mock_requester.send_request_bytes.side_effect = None
+        mock_requester.send_request_bytes.return_value = (
+            '<?xml version="1.0" encoding="ISO-8859-1"?>'
+            '<BroadsoftDocument protocol="OCI" xmlns="C" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+            '<sessionId xmlns="">1</sessionId>'
+            '<command type="Error" echo="" xsi:type="c:ErrorResponse" xmlns:c="C" xmlns="">'
+            "<summary>[Error 4008] User not found: &quot;jdoe&quot;</summary>"
+            "</command></BroadsoftDocument>"
+        )
+
+        response = client.raw_xml(b"<command/>", view=True)
+
+        assert response.type_name == "ErrorResponse"
+        assert response.is_error is True
+        assert response.summary == '[Error 4008] User not found: "jdoe"'
+        assert bytes(response) == response.xml
+
+    def test_raw_xml_is_sent_like_any_command(
+        self, mock_create_requester, mock_dispatch_table, mock_parser, mock_authenticate
+    ):
+        """Test raw XML gets its command's timeout and a timeout drops the session"""
+
+        client = Client(
+            host="localhost",
+            username="user",
+            password="pass",
+            timeouts=TimeoutPolicy(overrides={"UserGetRequest23V2": 2.5}),
+        )
+        client.authenticated = True
+        mock_requester = mock_create_requester.return_value
+        mock_requester.send_request_bytes.side_effect = None
+        mock_requester.send_request_bytes.return_value = MErrorSocketTimeout("slow")
+        command_xml = (
+            '<command xmlns="" xmlns:C="http://www.w3.org/2001/XMLSchema-instance"'
+            ' C:type="UserGetRequest23V2"><userId>jdoe</userId></command>'
+        )
+
+        with pytest.raises(MErrorSocketTimeout):
+            client.raw_xml(command_xml)
+
+        mock_requester.send_request_bytes.assert_called_once_with(
+            command_xml.encode(), 2.5
+        )
+        assert client.authenticated is False
+
+        with deadline(0), pytest.raises(MErrorDeadlineExceeded):
+            client.raw_xml(command_xml)
+
     def test_disconnect_method(
         self,
         mock_create_requester,
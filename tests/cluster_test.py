@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from mercury_ocip.cluster import ClusterRouter, route_key
+from mercury_ocip.exceptions import MErrorNoRoute
+from mercury_ocip.pool import BasePool, FailoverPool, SessionPool
+
+
+class FakePool(BasePool):
+    """Records what it was sent, answers after a short delay"""
+
+    def __init__(self, name, size=2):
+        self.name = name
+        self._size = size
+        self.sent = []
+        self.active = 0
+        self.closed = False
+
+    @property
+    def size(self):
+        return self._size
+
+    async def command(self, command, lane="normal"):
+        self.sent.append(command)
+        self.active += 1
+        try:
+            await asyncio.sleep(0.001)
+            return f"{self.name}:{command.__class__.__name__}"
+        finally:
+            self.active -= 1
+
+    async def authenticate(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class GroupGetRequest22V5:
+    def __init__(self, service_provider_id):
+        self.service_provider_id = service_provider_id
+        self.group_id = "Sales"
+
+
+class UserGetRequest23V2:
+    def __init__(self, user_id):
+        self.user_id = user_id
+
+
+class ServiceProviderGetListRequest:
+    pass
+
+
+@pytest.fixture
+def router():
+    return ClusterRouter(
+        {"east": FakePool("east"), "west": FakePool("west")},
+        routes={
+            "Acme": "east",
+            "Globex*": "west",
+            "*.globex.example.com": "west",
+        },
+    )
+
+
+def test_route_key_uses_provider_then_user_domain():
+    assert route_key(GroupGetRequest22V5("Acme")) == "Acme"
+    assert route_key(UserGetRequest23V2("jdoe@acme.example.com")) == "acme.example.com"
+    assert route_key(UserGetRequest23V2("jdoe")) is None
+    assert route_key(ServiceProviderGetListRequest()) is None
+
+
+def test_exact_ids_and_patterns(router):
+    assert router.route(GroupGetRequest22V5("Acme")) == "east"
+    assert router.route(GroupGetRequest22V5("Globex-UK")) == "west"
+    assert router.route(UserGetRequest23V2("jdoe@sales.globex.example.com")) == "west"
+
+
+def test_unrouted_commands_need_a_default(router):
+    with pytest.raises(MErrorNoRoute):
+        router.route(GroupGetRequest22V5("Initech"))
+
+    router.default = "east"
+    assert router.route(ServiceProviderGetListRequest()) == "east"
+
+
+def test_routes_must_name_known_clusters():
+    with pytest.raises(ValueError):
+        ClusterRouter({"east": FakePool("east")}, routes={"Acme": "north"})
+
+
+@pytest.mark.asyncio
+async def test_command_many_runs_clusters_in_parallel(router):
+    commands = [GroupGetRequest22V5("Acme" if i % 2 else "Globex") for i in range(20)]
+
+    results = await router.command_many(commands)
+
+    assert results == [
+        "east:GroupGetRequest22V5" if i % 2 else "west:GroupGetRequest22V5"
+        for i in range(20)
+    ]
+    assert len(router.clusters["east"].sent) == len(router.clusters["west"].sent) == 10
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_every_cluster(router):
+    async with router:
+        results = await router.broadcast(ServiceProviderGetListRequest())
+
+    assert results == {
+        "east": "east:ServiceProviderGetListRequest",
+        "west": "west:ServiceProviderGetListRequest",
+    }
+    assert all(pool.closed for pool in router.clusters.values())
+
+
+class Session:
+    def __init__(self, **kwargs):
+        self.coalescing = object()
+
+
+def test_from_hosts_builds_a_pool_per_cluster():
+    router = ClusterRouter.from_hosts(
+        {"east": ["as1", "as2"], "west": "as3"},
+        routes={"Acme": "east"},
+        size=1,
+        client_factory=Session,
+    )
+
+    assert isinstance(router.clusters["east"], FailoverPool)
+    assert isinstance(router.clusters["west"], SessionPool)
+    assert router.size == 3
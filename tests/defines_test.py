@@ -0,0 +1,77 @@
+import pytest
+
+from mercury_ocip.utils.defines import (
+    VersionIndex,
+    highest_version_for,
+    is_read_command,
+    parse_release,
+)
+
+NAMES = {
+    "UserGetRequest",
+    "UserGetRequest21",
+    "UserGetRequest22",
+    "UserGetRequest22V5",
+    "UserGetRequest23V2",
+    "LoginRequest14sp4",
+    "LoginRequest22V5",
+    "GroupGetListInSystemRequest",
+    "not_a_command",
+}
+
+
+@pytest.fixture
+def index():
+    return VersionIndex(NAMES)
+
+
+def test_latest_matches_highest_version_for(index):
+    for name in ("UserGetRequest", "LoginRequest", "GroupGetListInSystemRequest"):
+        assert index.latest(name) == highest_version_for(name, NAMES)
+
+
+def test_versions_are_newest_first(index):
+    assert index.versions("UserGetRequest22") == [
+        "UserGetRequest23V2",
+        "UserGetRequest22V5",
+        "UserGetRequest22",
+        "UserGetRequest21",
+        "UserGetRequest",
+    ]
+
+
+@pytest.mark.parametrize(
+    "release, expected",
+    [
+        ("22", "UserGetRequest22V5"),
+        (21, "UserGetRequest21"),
+        ("R23", "UserGetRequest23V2"),
+        ("17sp4", "UserGetRequest"),
+        ("2023.10", "UserGetRequest23V2"),
+    ],
+)
+def test_resolve_respects_release(index, release, expected):
+    assert index.resolve("UserGetRequest", max_release=release) == expected
+
+
+def test_resolve_service_pack(index):
+    assert index.resolve("LoginRequest", max_release="14sp3") is None
+    assert index.resolve("LoginRequest", max_release="14sp4") == "LoginRequest14sp4"
+
+
+def test_unknown_commands(index):
+    assert index.latest("UserDeleteRequest") is None
+    assert "UserDeleteRequest" not in index
+    assert "not_a_command" not in index
+
+
+def test_parse_release_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_release("latest")
+
+
+def test_is_read_command():
+    assert is_read_command("GroupHuntGroupGetInstanceListRequest")
+    assert is_read_command("UserGetRequest23V2")
+    assert not is_read_command("UserModifyRequest22")
+    assert not is_read_command("UserGetResponse23V2")
@@ -0,0 +1,192 @@
+import csv
+import json
+from typing import Optional
+
+import pytest
+
+from mercury_ocip.commands.base_command import OCIResponse, OCITable, OCITableRow
+from mercury_ocip.exceptions import MErrorMissingDependency
+from mercury_ocip.utils import exporters
+
+
+class UserListResponse(OCIResponse):
+    user_table: OCITable
+
+
+class TwoTableResponse(OCIResponse):
+    user_table: OCITable
+    device_table: OCITable
+
+
+class Address(OCIResponse):
+    city: Optional[str] = None
+
+
+class UserResponse(OCIResponse):
+    user_id: str
+    address: Optional[Address] = None
+    alias: Optional[list] = None
+
+
+@pytest.fixture
+def user_table():
+    return OCITable(
+        col_heading=["User Id", "Group Id"],
+        row=[OCITableRow(["alice", "GroupA"]), OCITableRow(["bob", "GroupB"])],
+    )
+
+
+def test_table_iter_rows_matches_to_dict(user_table):
+    assert list(user_table.iter_rows()) == user_table.to_dict()
+    assert user_table.to_dict()[0] == {"user_id": "alice", "group_id": "GroupA"}
+
+
+def test_table_to_csv(user_table, tmp_path):
+    path = tmp_path / "users.csv"
+
+    written = user_table.to_csv(path)
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert written == 2
+    assert rows == [
+        {"user_id": "alice", "group_id": "GroupA"},
+        {"user_id": "bob", "group_id": "GroupB"},
+    ]
+
+
+def test_response_exports_its_table(user_table, tmp_path):
+    response = UserListResponse(user_table=user_table)
+    path = tmp_path / "users.jsonl"
+
+    written = response.to_jsonl(path)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert written == 2
+    assert json.loads(lines[1]) == {"user_id": "bob", "group_id": "GroupB"}
+
+
+def test_jsonl_without_orjson(user_table, tmp_path, monkeypatch):
+    monkeypatch.setattr(exporters, "orjson", None)
+    path = tmp_path / "users.jsonl"
+
+    user_table.to_jsonl(path, batch_size=1)
+
+    assert path.read_text(encoding="utf-8") == (
+        '{"user_id":"alice","group_id":"GroupA"}\n'
+        '{"user_id":"bob","group_id":"GroupB"}\n'
+    )
+
+
+def test_response_with_several_tables_needs_a_name(user_table, tmp_path):
+    response = TwoTableResponse(user_table=user_table, device_table=user_table)
+
+    with pytest.raises(ValueError):
+        response.to_csv(tmp_path / "out.csv")
+
+    assert response.to_csv(tmp_path / "out.csv", table="device_table") == 2
+
+
+def test_csv_flattens_nested_types_with_bulk_headers(tmp_path):
+    users = (
+        UserResponse(user_id=f"user{i}", address=Address(city="Leeds"), alias=["a"])
+        for i in range(3)
+    )
+    path = tmp_path / "users.csv"
+
+    written = exporters.export_csv(users, path)
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert written == 3
+    assert rows[2] == {"user_id": "user2", "address.city": "Leeds", "alias[0]": "a"}
+
+
+def test_parquet_requires_pyarrow(user_table, tmp_path, monkeypatch):
+    monkeypatch.setattr(exporters, "pyarrow", None)
+
+    with pytest.raises(MErrorMissingDependency):
+        user_table.to_parquet(tmp_path / "users.parquet")
+
+
+def test_parquet_written_in_batches(user_table, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "users.parquet"
+
+    written = user_table.to_parquet(path, batch_size=1)
+
+    assert written == 2
+    assert pq.read_table(path).to_pylist() == user_table.to_dict()
+
+
+def test_arrow_schema_comes_from_the_first_batch():
+    pa = pytest.importorskip("pyarrow")
+    rows = [{"user_id": "alice", "phone": None}, {"user_id": "bob", "phone": "100"}]
+    rows += [{"user_id": "carol"}]
+
+    batches = list(exporters.iter_record_batches(rows, batch_size=1))
+
+    assert {batch.schema for batch in batches} == {batches[0].schema}
+    assert batches[0].schema == pa.schema(
+        [("user_id", pa.string()), ("phone", pa.string())]
+    )
+    assert batches[1].to_pylist() == [{"user_id": "bob", "phone": "100"}]
+    assert batches[2].to_pylist() == [{"user_id": "carol", "phone": None}]
+
+
+def test_arrow_rejects_columns_added_after_the_first_batch():
+    pytest.importorskip("pyarrow")
+    rows = [{"user_id": "alice"}, {"user_id": "bob", "extension": 7}]
+
+    batches = exporters.iter_record_batches(rows, batch_size=1)
+    next(batches)
+
+    with pytest.raises(ValueError, match="extension"):
+        next(batches)
+
+
+def test_csv_rejects_columns_missing_from_the_header(tmp_path):
+    rows = [{"user_id": "alice"}, {"user_id": "bob", "extension": "7"}]
+
+    with pytest.raises(ValueError, match="fieldnames"):
+        exporters.export_csv(rows, tmp_path / "users.csv")
+
+    written = exporters.export_csv(
+        rows, tmp_path / "users.csv", fieldnames=["user_id", "extension"]
+    )
+
+    with open(tmp_path / "users.csv", newline="", encoding="utf-8") as f:
+        assert list(csv.DictReader(f))[1] == {"user_id": "bob", "extension": "7"}
+    assert written == 2
+
+
+def test_explicit_schema_is_streamed(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    ipc = pytest.importorskip("pyarrow.ipc")
+    schema = pa.schema([("user_id", pa.string()), ("extension", pa.int32())])
+    path = tmp_path / "users.arrow"
+
+    written = exporters.export_arrow(
+        [{"user_id": "alice", "other": 1}, {"user_id": "bob", "extension": 7}],
+        path,
+        schema=schema,
+    )
+
+    table = ipc.open_file(path).read_all()
+    assert written == 2
+    assert table.schema == schema
+    assert table.to_pylist()[1] == {"user_id": "bob", "extension": 7}
+
+
+def test_empty_source_still_writes_a_file(user_table, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    empty = OCITable(col_heading=user_table.col_heading, row=[])
+
+    assert exporters.export_parquet([], tmp_path / "rows.parquet") == 0
+    assert empty.to_parquet(tmp_path / "table.parquet") == 0
+
+    assert pq.read_table(tmp_path / "rows.parquet").num_rows == 0
+    assert pq.read_table(tmp_path / "table.parquet").column_names == [
+        "user_id",
+        "group_id",
+    ]
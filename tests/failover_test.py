@@ -0,0 +1,181 @@
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mercury_ocip.client import AsyncClient
+from mercury_ocip.exceptions import (
+    MError,
+    MErrorDeadlineExceeded,
+    MErrorSocketInitialisation,
+    MErrorSocketTimeout,
+)
+from mercury_ocip.failover import (
+    BreakerState,
+    CircuitBreaker,
+    HostSelector,
+    is_retryable,
+)
+from mercury_ocip.limiter import Outcome
+from mercury_ocip.requester import AsyncTCPRequester
+
+
+def test_connection_failures_are_always_retryable():
+    error = MErrorSocketInitialisation("refused")
+
+    assert is_retryable(error, read=True)
+    assert is_retryable(error, read=False)
+
+
+def test_timeouts_only_retry_reads():
+    error = MErrorSocketTimeout("timed out")
+
+    assert is_retryable(error, read=True)
+    assert not is_retryable(error, read=False)
+    assert not is_retryable(MError("Failed to authenticate"), read=True)
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state is BreakerState.CLOSED
+
+    breaker.record_failure()
+
+    assert breaker.state is BreakerState.OPEN
+    assert not breaker.available()
+
+
+def test_breaker_lets_one_probe_through_after_the_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+
+    later = time.monotonic() + 31
+    with patch("mercury_ocip.failover.time.monotonic", return_value=later):
+        assert breaker.state is BreakerState.HALF_OPEN
+        breaker.attempt()
+        assert not breaker.available()
+
+        breaker.record_failure()
+        assert breaker.state is BreakerState.OPEN
+
+    with patch("mercury_ocip.failover.time.monotonic", return_value=later + 31):
+        breaker.attempt()
+        breaker.record_success()
+        assert breaker.state is BreakerState.CLOSED
+
+
+def test_selector_routes_reads_by_expected_latency():
+    selector = HostSelector(["as1", "as2"])
+    selector.record("as1", Outcome.SUCCESS, 0.05)
+    selector.record("as2", Outcome.SUCCESS, 0.02)
+
+    assert selector.choose() == "as2"
+
+    # Enough queued on the faster host tips the balance
+    selector.health["as2"].in_flight = 3
+    assert selector.choose() == "as1"
+
+
+def test_selector_pins_writes_and_skips_open_hosts():
+    selector = HostSelector(["as1", "as2"], pin_writes=True, failure_threshold=1)
+    selector.record("as1", Outcome.SUCCESS, 0.05)
+    selector.record("as2", Outcome.SUCCESS, 0.02)
+
+    assert selector.choose(write=True) == "as1"
+
+    selector.record("as1", Outcome.TIMEOUT)
+
+    assert selector.choose(write=True) == "as2"
+    assert selector.choose(exclude=["as2"]) is None
+    assert selector.as_dict()["as1"]["state"] == "open"
+
+
+class UserGetRequest23V2:
+    pass
+
+
+def async_client(log):
+    requesters = {}
+
+    def create_requester(host, **kwargs):
+        log.append(f"create {host}")
+        requester = requesters[host] = AsyncMock(spec=AsyncTCPRequester)
+        requester.disconnect.side_effect = lambda: log.append(f"disconnect {host}")
+        return requester
+
+    with patch("mercury_ocip.client.create_requester", side_effect=create_requester):
+        return AsyncClient(hosts=["as1", "as2"], username="admin", password="secret")
+
+
+def test_client_starts_on_host_and_keeps_every_host():
+    with patch(
+        "mercury_ocip.client.create_requester",
+        return_value=AsyncMock(spec=AsyncTCPRequester),
+    ):
+        client = AsyncClient(host="as2", hosts=["as1"], username="a", password="b")
+
+    assert client.host == "as2"
+    assert client.hosts == ["as2", "as1"]
+    with pytest.raises(ValueError):
+        AsyncClient(username="a", password="b")
+
+
+@pytest.mark.asyncio
+async def test_client_disconnects_before_moving_host():
+    log = []
+    client = async_client(log)
+
+    with patch(
+        "mercury_ocip.client.create_requester",
+        return_value=AsyncMock(spec=AsyncTCPRequester),
+    ):
+        moved = await client._next_host(
+            MErrorSocketInitialisation("down"), True, {"as1"}
+        )
+
+    assert moved and client.host == "as2"
+    assert log == ["create as1", "disconnect as1"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_neither_moves_nor_counts_against_the_host():
+    log = []
+    client = async_client(log)
+    breaker = client._host_selector.health["as1"].breaker
+    breaker.failures = 2
+    breaker._probing = True
+
+    moved = await client._next_host(
+        MErrorDeadlineExceeded("Deadline passed"), True, {"as1"}
+    )
+
+    assert not moved and client.host == "as1"
+    assert breaker.failures == 2 and not breaker._probing
+    assert log == ["create as1"]
+
+
+@pytest.mark.asyncio
+async def test_failed_fail_over_frees_the_probe():
+    client = async_client([])
+    breaker = client._host_selector.health["as2"].breaker
+    breaker.failures = 3
+    breaker._opened_at = time.monotonic() - breaker.reset_timeout
+
+    with (
+        patch(
+            "mercury_ocip.client.create_requester",
+            return_value=AsyncMock(spec=AsyncTCPRequester),
+        ),
+        patch.object(AsyncClient, "_login", side_effect=RuntimeError("boom")),
+        pytest.raises(RuntimeError),
+    ):
+        await client._fail_over(
+            "UserGetRequest23V2", b"", MErrorSocketInitialisation("down")
+        )
+
+    assert client.host == "as2"
+    assert breaker.state is BreakerState.HALF_OPEN and breaker.available()
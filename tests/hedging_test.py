@@ -0,0 +1,41 @@
+from mercury_ocip.hedging import HedgePolicy
+
+
+def test_no_hedging_until_enough_samples():
+    policy = HedgePolicy(min_samples=5)
+    for _ in range(4):
+        policy.observe("UserGetRequest23V2", 0.03)
+
+    assert policy.delay_for("UserGetRequest23V2") is None
+
+    policy.observe("UserGetRequest23V2", 0.03)
+    assert policy.delay_for("UserGetRequest23V2") == 0.03
+
+
+def test_delay_is_the_percentile_per_command_type():
+    policy = HedgePolicy(percentile=0.9, min_samples=1)
+    for latency in range(1, 101):
+        policy.observe("UserGetRequest23V2", latency / 1000)
+    policy.observe("GroupGetRequest22V5", 2.0)
+
+    assert policy.delay_for("UserGetRequest23V2") == 0.091
+    assert policy.delay_for("GroupGetRequest22V5") == 2.0
+
+
+def test_min_delay_floor():
+    policy = HedgePolicy(min_samples=1, min_delay=0.05)
+    policy.observe("UserGetRequest23V2", 0.001)
+
+    assert policy.delay_for("UserGetRequest23V2") == 0.05
+
+
+def test_budget_caps_hedges():
+    policy = HedgePolicy(budget=0.1)
+    for _ in range(30):
+        policy.delay_for("UserGetRequest23V2")
+
+    allowed = sum(policy.allow() for _ in range(10))
+
+    assert allowed == 3
+    assert policy.stats.as_dict()["hedge_rate"] == 0.1
+    assert policy.stats.over_budget == 7
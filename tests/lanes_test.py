@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from mercury_ocip.lanes import Lane, LaneScheduler
+from mercury_ocip.limiter import AdaptiveLimiter
+
+
+async def queue_up(scheduler, lanes):
+    """Queue one waiter per lane entry behind a held resource, return grant order"""
+    order = []
+
+    async def waiter(index, lane):
+        resource = await scheduler.acquire(lane)
+        order.append((index, lane))
+        scheduler.release(resource)
+
+    tasks = [asyncio.ensure_future(waiter(i, lane)) for i, lane in enumerate(lanes)]
+    await asyncio.sleep(0)
+    return order, tasks
+
+
+@pytest.mark.asyncio
+async def test_strict_priority_serves_highest_lane_first():
+    scheduler = LaneScheduler(["session"], strict=True)
+    held = await scheduler.acquire(Lane.NORMAL)
+
+    order, tasks = await queue_up(
+        scheduler, [Lane.BULK, Lane.BULK, Lane.INTERACTIVE, Lane.NORMAL]
+    )
+    scheduler.release(held)
+    await asyncio.gather(*tasks)
+
+    assert order == [
+        (2, Lane.INTERACTIVE),
+        (3, Lane.NORMAL),
+        (0, Lane.BULK),
+        (1, Lane.BULK),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_weighted_lanes_share_without_starving_bulk():
+    scheduler = LaneScheduler(["session"], weights={Lane.INTERACTIVE: 3, Lane.BULK: 1})
+    held = await scheduler.acquire()
+
+    order, tasks = await queue_up(scheduler, [Lane.BULK] * 4 + [Lane.INTERACTIVE] * 6)
+    scheduler.release(held)
+    await asyncio.gather(*tasks)
+
+    lanes = [lane for _, lane in order]
+    assert lanes[:4].count(Lane.INTERACTIVE) == 3
+    assert Lane.BULK in lanes[:4]
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_is_recorded_per_lane():
+    scheduler = LaneScheduler(["session"])
+    held = await scheduler.acquire(Lane.INTERACTIVE)
+
+    order, tasks = await queue_up(scheduler, [Lane.BULK])
+    await asyncio.sleep(0.01)
+    scheduler.release(held)
+    await asyncio.gather(*tasks)
+
+    stats = scheduler.as_dict()
+    assert stats["interactive"]["queued"] == 0
+    assert stats["bulk"]["queued"] == 1
+    assert stats["bulk"]["max_wait"] >= 0.01
+    assert stats["bulk"]["waiting"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_are_skipped():
+    scheduler = LaneScheduler(["session"])
+    held = await scheduler.acquire()
+    cancelled = asyncio.ensure_future(scheduler.acquire(Lane.INTERACTIVE))
+    waiting = asyncio.ensure_future(scheduler.acquire(Lane.BULK))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    scheduler.release(held)
+
+    assert await waiting == "session"
+
+
+@pytest.mark.asyncio
+async def test_limiter_gates_idle_resources():
+    limiter = AdaptiveLimiter(initial=1)
+    scheduler = LaneScheduler(["a", "b"], limiter=limiter)
+
+    first = await scheduler.acquire()
+    second = asyncio.ensure_future(scheduler.acquire())
+    await asyncio.sleep(0)
+
+    assert not second.done()
+
+    limiter.release(0.01)
+    scheduler.release(first)
+
+    assert await second in ("a", "b")
@@ -0,0 +1,119 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from mercury_ocip.commands.base_command import ErrorResponse, SuccessResponse
+from mercury_ocip.exceptions import MErrorSendRequestFailed, MErrorSocketTimeout
+from mercury_ocip.limiter import AdaptiveLimiter, Outcome, TokenBucket, classify
+
+
+def error(summary):
+    response = ErrorResponse.__new__(ErrorResponse)
+    object.__setattr__(response, "summary", summary)
+    return response
+
+
+def test_classify():
+    assert classify(SuccessResponse()) is Outcome.SUCCESS
+    assert classify(error("[Error 4008] User not found")) is Outcome.ERROR
+    assert classify(error("Server is busy, try again later")) is Outcome.OVERLOAD
+    assert classify(error=MErrorSocketTimeout("timed out")) is Outcome.TIMEOUT
+    assert classify(error=MErrorSendRequestFailed("reset")) is Outcome.FAILURE
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_while_saturated():
+    limiter = AdaptiveLimiter(initial=2, max_limit=4)
+
+    for _ in range(20):
+        await asyncio.gather(*(limiter.acquire() for _ in range(limiter.limit)))
+        for _ in range(limiter.in_flight):
+            limiter.release(0.03)
+
+    assert limiter.limit == 4
+    assert limiter.stats.increases > 0
+
+
+@pytest.mark.asyncio
+async def test_limit_does_not_grow_when_idle():
+    limiter = AdaptiveLimiter(initial=2)
+
+    for _ in range(50):
+        await limiter.acquire()
+        limiter.release(0.03)
+
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_congestion_halves_limit_once_per_round():
+    limiter = AdaptiveLimiter(initial=8)
+    for _ in range(8):
+        await limiter.acquire()
+
+    for _ in range(8):
+        limiter.release(5.0, Outcome.TIMEOUT)
+
+    assert limiter.limit == 4
+    assert limiter.stats.decreases == 1
+    assert limiter.stats.timeouts == 8
+
+
+@pytest.mark.asyncio
+async def test_rising_latency_counts_as_congestion():
+    limiter = AdaptiveLimiter(initial=4, tolerance=2.0)
+
+    for latency in [0.03] * 20 + [0.5]:
+        await limiter.acquire()
+        limiter.release(latency)
+
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_woken_in_order():
+    limiter = AdaptiveLimiter(initial=1)
+    order = []
+    await limiter.acquire()
+
+    async def waiter(name):
+        await limiter.acquire()
+        order.append(name)
+        limiter.release(0.01)
+
+    tasks = [asyncio.ensure_future(waiter(i)) for i in range(3)]
+    await asyncio.sleep(0)
+    limiter.release(0.01)
+    await asyncio.gather(*tasks)
+
+    assert order == [0, 1, 2]
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_up_its_place():
+    limiter = AdaptiveLimiter(initial=1)
+    await limiter.acquire()
+    task = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    limiter.release(0.01)
+
+    assert limiter.in_flight == 0
+    await limiter.acquire()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_for_tokens():
+    bucket = TokenBucket(rate=10, burst=2)
+
+    with patch("mercury_ocip.limiter.asyncio.sleep") as sleep:
+        for _ in range(3):
+            await bucket.acquire()
+
+    assert sleep.call_count == 1
+    assert sleep.call_args.args[0] == pytest.approx(0.1, rel=0.05)
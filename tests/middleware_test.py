@@ -0,0 +1,87 @@
+import pytest
+
+from mercury_ocip.middleware import is_async_middleware, run_chain, run_chain_async
+
+
+def recorder(name, calls):
+    def middleware(command, payload, call_next):
+        calls.append(f"{name}:before")
+        result = call_next(command, payload)
+        calls.append(f"{name}:after")
+        return result
+
+    return middleware
+
+
+def test_empty_chain_calls_send():
+    assert run_chain([], "command", b"<xml/>", lambda c, p: p) == b"<xml/>"
+
+
+def test_middleware_runs_in_order():
+    calls = []
+
+    result = run_chain(
+        [recorder("outer", calls), recorder("inner", calls)],
+        "command",
+        b"<xml/>",
+        lambda c, p: calls.append("send") or "response",
+    )
+
+    assert result == "response"
+    assert calls == [
+        "outer:before",
+        "inner:before",
+        "send",
+        "inner:after",
+        "outer:after",
+    ]
+
+
+def test_middleware_can_rewrite_payload_and_short_circuit():
+    def rewrite(command, payload, call_next):
+        return call_next(command, payload.upper())
+
+    def short_circuit(command, payload, call_next):
+        return "cached"
+
+    assert run_chain([rewrite], "command", b"abc", lambda c, p: p) == b"ABC"
+    assert run_chain([short_circuit], "command", b"abc", lambda c, p: p) == "cached"
+
+
+def test_middleware_can_retry():
+    attempts = []
+
+    def retry(command, payload, call_next):
+        result = call_next(command, payload)
+        return call_next(command, payload) if result == "error" else result
+
+    def send(command, payload):
+        attempts.append(payload)
+        return "error" if len(attempts) == 1 else "response"
+
+    assert run_chain([retry], "command", b"abc", send) == "response"
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_chain():
+    calls = []
+
+    async def middleware(command, payload, call_next):
+        calls.append(command)
+        return await call_next(command, payload + b"!")
+
+    async def send(command, payload):
+        return payload
+
+    assert await run_chain_async([middleware, middleware], "cmd", b"a", send) == b"a!!"
+    assert calls == ["cmd", "cmd"]
+
+
+def test_is_async_middleware():
+    class Async:
+        async def __call__(self, command, payload, call_next):
+            return await call_next(command, payload)
+
+    assert is_async_middleware(Async())
+    assert not is_async_middleware(recorder("sync", []))
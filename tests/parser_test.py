@@ -1,4 +1,10 @@
-from mercury_ocip.utils.parser import Parser
+import pickle
+import sys
+
+import pytest
+
+from mercury_ocip.utils.parser import Parser, AsyncParser, ParsePolicy
+from mercury_ocip.utils.interning import InternTable
 from mercury_ocip.commands.commands import (
    UserConsolidatedModifyRequest22, 
    ReplacementConsolidatedServicePackAssignmentList,
@@ -11,7 +17,7 @@ from mercury_ocip.commands.commands import (
    ServiceInstanceAddProfile,
    GroupGetListInSystemResponse
 )
-from mercury_ocip.commands.base_command import OCITable, OCITableRow
+from mercury_ocip.commands.base_command import ErrorResponse, OCITable, OCITableRow
 
 def test_parser_to_xml_from_class():
     command = UserConsolidatedModifyRequest22(user_id="testuser")
@@ -212,3 +218,198 @@ def test_parser_to_dict_from_class_with_oci_table():
     assert dict_output["group_table"][1]["column2"] == "Column2_Row2"
     
     
+
+
+@pytest.fixture
+def reset_async_parser():
+    original = AsyncParser.policy
+    AsyncParser.policy = ParsePolicy()
+    AsyncParser.reset_metrics()
+    yield AsyncParser
+    AsyncParser.shutdown()
+    AsyncParser.policy = original
+    AsyncParser.reset_metrics()
+
+
+@pytest.mark.asyncio
+async def test_async_parser_parses_small_payloads_inline(reset_async_parser):
+    xml = '<command xmlns="" xmlns:C="http://www.w3.org/2001/XMLSchema-instance" C:type="UserConsolidatedModifyRequest22"><userId>testuser</userId></command>'
+
+    result = await AsyncParser.to_dict_from_xml(xml)
+
+    assert result["userId"] == "testuser"
+    assert AsyncParser.metrics.calls["inline"] == 1
+    assert AsyncParser.metrics.calls["thread"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_parser_offloads_large_payloads_to_threads(reset_async_parser):
+    AsyncParser.configure(inline_threshold=10)
+    xml = '<command xmlns="" xmlns:C="http://www.w3.org/2001/XMLSchema-instance" C:type="UserConsolidatedModifyRequest22"><userId>testuser</userId></command>'
+
+    result = await AsyncParser.to_dict_from_xml(xml)
+
+    assert result["userId"] == "testuser"
+    assert AsyncParser.metrics.calls["thread"] == 1
+    assert AsyncParser.metrics.as_dict()["thread"]["bytes"] == len(xml)
+
+
+def test_async_parser_routes_to_processes_when_enabled(reset_async_parser):
+    AsyncParser.configure(inline_threshold=10, process_threshold=100, process_workers=1)
+
+    assert AsyncParser._route(5) == "inline"
+    assert AsyncParser._route(50) == "thread"
+    assert AsyncParser._route(500) in ("process", "thread")  # threads on free-threaded builds
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    not getattr(sys, "_is_gil_enabled", lambda: True)(),
+    reason="free-threaded builds parse on threads",
+)
+async def test_async_parser_parses_large_payloads_in_a_process(reset_async_parser):
+    AsyncParser.configure(
+        inline_threshold=10, process_threshold=4096, process_workers=1
+    )
+    rows = "".join(
+        f"<row><col>Group{i}</col><col>ServiceProvider</col></row>" for i in range(200)
+    )
+    xml = (
+        '<command xmlns="" xmlns:C="http://www.w3.org/2001/XMLSchema-instance" C:type="GroupGetListInSystemResponse">'
+        "<groupTable><colHeading>Group Id</colHeading><colHeading>Service Provider Id</colHeading>"
+        f"{rows}</groupTable></command>"
+    )
+    assert len(xml) > 4096
+
+    result = await AsyncParser.to_dict_from_xml(xml)
+
+    assert AsyncParser.metrics.calls["process"] == 1
+    assert AsyncParser.metrics.as_dict()["process"]["bytes"] == len(xml)
+    table = result["groupTable"]
+    assert len(table.row) == 200
+    assert table.row[199].col == ["Group199", "ServiceProvider"]
+
+    from_view = await AsyncParser.to_dict_from_xml(memoryview(xml.encode()))
+
+    assert AsyncParser.metrics.calls["process"] == 2
+    assert from_view["groupTable"].row[199].col == ["Group199", "ServiceProvider"]
+
+
+@pytest.mark.asyncio
+async def test_async_parser_keeps_shared_intern_tables_in_process(reset_async_parser):
+    AsyncParser.configure(
+        inline_threshold=10, process_threshold=4096, process_workers=1
+    )
+    rows = "".join(
+        f"<row><col>Group{i}</col><col>ServiceProvider</col></row>" for i in range(200)
+    )
+    xml = (
+        '<command xmlns="" xmlns:C="http://www.w3.org/2001/XMLSchema-instance" C:type="GroupGetListInSystemResponse">'
+        "<groupTable><colHeading>Group Id</colHeading><colHeading>Service Provider Id</colHeading>"
+        f"{rows}</groupTable></command>"
+    )
+    table = InternTable()
+
+    await AsyncParser.to_dict_from_xml(xml, table)
+
+    assert AsyncParser.metrics.calls == {"inline": 0, "thread": 1, "process": 0}
+    assert len(table) > 0
+    assert table.stats.hits > 0
+
+
+@pytest.mark.asyncio
+async def test_async_parser_builds_classes_from_dicts_in_this_process(
+    reset_async_parser,
+):
+    AsyncParser.configure(inline_threshold=10, process_threshold=100, process_workers=1)
+    xml = (
+        '<command xmlns="" xmlns:C="http://www.w3.org/2001/XMLSchema-instance" C:type="ErrorResponse">'
+        "<summary>[Error 4008] User not found</summary></command>"
+    )
+    data = Parser.to_dict_from_xml(xml)
+
+    result = await AsyncParser.to_class_from_dict(data, ErrorResponse, source=xml)
+
+    assert result.summary == "[Error 4008] User not found"
+    assert AsyncParser.metrics.calls == {"inline": 0, "thread": 1, "process": 0}
+
+
+@pytest.mark.asyncio
+async def test_async_parser_parses_objects_inline(reset_async_parser):
+    AsyncParser.configure(inline_threshold=0, process_threshold=0, process_workers=1)
+    table = OCITable(col_heading=["Column1"], row=[OCITableRow(["Value"])] * 1000)
+
+    result = await AsyncParser.to_dict_from_class(table)
+
+    assert len(result["OCITable"]["row"]) == 1000
+    assert AsyncParser.metrics.calls == {"inline": 1, "thread": 0, "process": 0}
+
+
+def test_async_parser_rejects_unknown_policy_field(reset_async_parser):
+    with pytest.raises(ValueError):
+        AsyncParser.configure(not_a_field=1)
+
+
+def test_oci_table_is_picklable():
+    table = OCITable(col_heading=["Column1"], row=[OCITableRow(["Value"])])
+
+    restored = pickle.loads(pickle.dumps(table))
+
+    assert restored.to_dict() == [{"column1": "Value"}]
+
+
+def test_parser_shares_repeated_table_values():
+    xml = """
+    <command xmlns="" xmlns:C="http://www.w3.org/2001/XMLSchema-instance" C:type="GroupGetListInSystemResponse">
+        <groupTable>
+            <colHeading>Group Id</colHeading>
+            <colHeading>Service Provider Id</colHeading>
+            <row><col>GroupA</col><col>ServiceProvider</col></row>
+            <row><col>GroupB</col><col>ServiceProvider</col></row>
+        </groupTable>
+    </command>
+    """
+    result = Parser.to_dict_from_xml(xml)
+
+    rows = result["groupTable"].row
+    assert rows[0].col[1] == "ServiceProvider"
+    assert rows[0].col[1] is rows[1].col[1]
+
+
+def test_parser_shared_intern_table_collects_stats():
+    xml = '<command xmlns="" xmlns:C="http://www.w3.org/2001/XMLSchema-instance" C:type="UserConsolidatedModifyRequest22"><userId>testuser</userId></command>'
+    table = InternTable()
+
+    first = Parser.to_dict_from_xml(xml, table)
+    second = Parser.to_dict_from_xml(xml, table)
+
+    assert first["userId"] is second["userId"]
+    assert table.stats.hits >= 1
+    assert table.stats.as_dict()["dedup_ratio"] > 0
+
+
+def test_intern_table_skips_long_values():
+    table = InternTable(max_length=4)
+    value = "".join(["long", "value"])
+
+    assert table.intern(value) is value
+    assert len(table) == 0
+
+
+def test_parser_to_xml_bytes_matches_to_xml():
+    command = UserConsolidatedModifyRequest22(user_id="café")
+
+    xml_bytes = Parser.to_xml_bytes_from_class(command)
+
+    assert isinstance(xml_bytes, bytes)
+    assert xml_bytes.decode("ISO-8859-1") == Parser.to_xml_from_class(command)
+
+
+def test_parser_to_class_from_xml_bytes():
+    xml = '<command xmlns="" xmlns:C="http://www.w3.org/2001/XMLSchema-instance" C:type="UserConsolidatedModifyRequest22"><userId>café</userId></command>'
+
+    command_instance = Parser.to_class_from_xml(
+        xml.encode("ISO-8859-1"), UserConsolidatedModifyRequest22
+    )
+
+    assert command_instance.user_id == "café"
@@ -0,0 +1,319 @@
+import asyncio
+
+import pytest
+
+from mercury_ocip.exceptions import (
+    MErrorNoHealthyHost,
+    MErrorSocketInitialisation,
+    MErrorSocketTimeout,
+)
+from mercury_ocip.hedging import HedgePolicy
+from mercury_ocip.limiter import AdaptiveLimiter
+from mercury_ocip.pool import FailoverPool, SessionPool
+
+
+class FakeSession:
+    """Stands in for AsyncClient, one request at a time like a real connection"""
+
+    active = 0
+    peak = 0
+
+    def __init__(self, session_id, delay=0.001, host="localhost", **kwargs):
+        self.session_id = session_id
+        self.host = host
+        self.delay = delay
+        self.coalescing = object()
+        self.busy = False
+        self.disconnected = False
+
+    async def command(self, command):
+        assert not self.busy, "session used concurrently"
+        self.busy = True
+        FakeSession.active += 1
+        FakeSession.peak = max(FakeSession.peak, FakeSession.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if isinstance(command, Exception):
+                raise command
+            return f"response:{command}"
+        finally:
+            FakeSession.active -= 1
+            self.busy = False
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    FakeSession.active = FakeSession.peak = 0
+
+
+@pytest.mark.asyncio
+async def test_sessions_get_their_own_ids():
+    pool = SessionPool(size=3, client_factory=FakeSession, host="localhost")
+
+    assert len({session.session_id for session in pool.sessions}) == 3
+    assert all(session.coalescing is None for session in pool.sessions)
+
+
+@pytest.mark.asyncio
+async def test_command_many_keeps_input_order():
+    pool = SessionPool(size=4, client_factory=FakeSession)
+
+    results = await pool.command_many(f"cmd{i}" for i in range(50))
+
+    assert results == [f"response:cmd{i}" for i in range(50)]
+    assert FakeSession.peak == 4
+
+
+@pytest.mark.asyncio
+async def test_command_many_returns_exceptions_in_place():
+    pool = SessionPool(size=2, client_factory=FakeSession)
+    failure = MErrorSocketTimeout("timed out")
+
+    results = await pool.command_many(["a", failure, "c"])
+
+    assert results == ["response:a", failure, "response:c"]
+
+    with pytest.raises(MErrorSocketTimeout):
+        await pool.command_many(["a", failure, "c"], return_exceptions=False)
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_concurrency():
+    # Sleep jitter must not read as congestion, the limit then only grows
+    limiter = AdaptiveLimiter(initial=2, max_limit=16, tolerance=1000)
+    pool = SessionPool(size=8, limiter=limiter, client_factory=FakeSession)
+
+    await pool.command_many(f"cmd{i}" for i in range(40))
+
+    assert limiter.max_limit == 8
+    assert limiter.in_flight == 0
+    assert FakeSession.peak <= limiter.limit
+
+
+@pytest.mark.asyncio
+async def test_limiter_backs_off_on_timeouts():
+    limiter = AdaptiveLimiter(initial=4)
+    pool = SessionPool(size=4, limiter=limiter, client_factory=FakeSession)
+
+    await pool.command_many([MErrorSocketTimeout("timed out")] * 4)
+
+    assert limiter.limit == 2
+    assert limiter.stats.timeouts == 4
+
+
+class UserGetListInSystemRequest:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_interactive_commands_skip_the_bulk_queue():
+    pool = SessionPool(size=2, client_factory=FakeSession)
+    bulk = asyncio.ensure_future(
+        pool.command_many((f"bulk{i}" for i in range(20)), lane="bulk")
+    )
+    await asyncio.sleep(0.002)
+
+    await pool.command("interactive", lane="interactive")
+
+    assert not bulk.done()
+    await bulk
+    stats = pool.lane_stats()
+    assert stats["interactive"]["requests"] == 1
+    assert stats["bulk"]["requests"] == 20
+
+
+@pytest.mark.asyncio
+async def test_list_scans_use_dedicated_sessions():
+    pool = SessionPool(size=3, list_sessions=1, client_factory=FakeSession)
+    list_session = pool.sessions[0]
+    list_session.delay = 0.05
+
+    scan = asyncio.ensure_future(pool.command(UserGetListInSystemRequest()))
+    await asyncio.sleep(0)
+    results = await pool.command_many(f"cmd{i}" for i in range(10))
+
+    assert not scan.done()
+    assert results == [f"response:cmd{i}" for i in range(10)]
+    await scan
+    assert pool.lane_stats()["list"]["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_command_resets_its_session():
+    pool = SessionPool(size=1, client_factory=FakeSession)
+    pool.sessions[0].delay = 1
+    task = asyncio.ensure_future(pool.command("slow"))
+    await asyncio.sleep(0.01)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert pool.sessions[0].disconnected
+    pool.sessions[0].delay = 0
+    assert await pool.command("next") == "response:next"
+
+
+class UserGetRequest23V2:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_slow_read_is_hedged_on_another_session():
+    policy = HedgePolicy(min_samples=1, budget=1.0)
+    policy.observe("UserGetRequest23V2", 0.005)
+    pool = SessionPool(size=2, hedging=policy, client_factory=FakeSession)
+    pool.sessions[0].delay = 0.5
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    result = await pool.command(UserGetRequest23V2())
+
+    assert result.startswith("response:")
+    assert loop.time() - started < 0.25
+    assert policy.stats.hedged == policy.stats.hedge_wins == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_fast_reads_and_writes_are_not_hedged():
+    policy = HedgePolicy(min_samples=1, budget=1.0)
+    policy.observe("UserGetRequest23V2", 0.5)
+    pool = SessionPool(size=2, hedging=policy, client_factory=FakeSession)
+
+    await pool.command(UserGetRequest23V2())
+    await pool.command("UserModifyRequest22")
+
+    assert policy.stats.requests == 1
+    assert policy.stats.hedged == 0
+
+
+@pytest.mark.asyncio
+async def test_close_disconnects_every_session():
+    async with SessionPool(size=2, client_factory=FakeSession) as pool:
+        await pool.command("cmd")
+
+    assert all(session.disconnected for session in pool.sessions)
+
+
+class HostSession(FakeSession):
+    """A session whose host can be taken down or slowed"""
+
+    down = set()
+    delays = {}
+
+    def __init__(self, session_id, host="localhost", **kwargs):
+        super().__init__(
+            session_id, delay=HostSession.delays.get(host, 0.001), host=host
+        )
+
+    async def command(self, command):
+        if self.host in HostSession.down:
+            raise MErrorSocketInitialisation(f"{self.host} refused the connection")
+        return f"{self.host}:" + await super().command(command)
+
+
+@pytest.fixture
+def hosts():
+    HostSession.down = set()
+    HostSession.delays = {}
+    return HostSession
+
+
+@pytest.mark.asyncio
+async def test_failover_moves_to_the_next_host(hosts):
+    hosts.down = {"as1"}
+    pool = FailoverPool(["as1", "as2"], size=1, client_factory=HostSession)
+
+    assert (
+        await pool.command("UserModifyRequest22") == "as2:response:UserModifyRequest22"
+    )
+    assert pool.host_stats()["as1"]["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failover_opens_the_breaker_of_a_dead_host(hosts):
+    hosts.down = {"as1"}
+    pool = FailoverPool(
+        ["as1", "as2"], size=1, failure_threshold=2, client_factory=HostSession
+    )
+
+    for _ in range(5):
+        await pool.command(UserGetRequest23V2())
+
+    stats = pool.host_stats()
+    assert stats["as1"]["state"] == "open"
+    assert stats["as1"]["requests"] == 2
+    assert stats["as2"]["requests"] == 5
+
+
+@pytest.mark.asyncio
+async def test_failover_prefers_the_faster_host(hosts):
+    hosts.delays = {"as1": 0.02}
+    pool = FailoverPool(["as1", "as2"], size=1, client_factory=HostSession)
+
+    for _ in range(10):
+        await pool.command(UserGetRequest23V2())
+
+    stats = pool.host_stats()
+    assert stats["as2"]["requests"] > stats["as1"]["requests"]
+
+
+@pytest.mark.asyncio
+async def test_failover_pins_writes_to_the_primary(hosts):
+    hosts.delays = {"as1": 0.02}
+    pool = FailoverPool(
+        ["as1", "as2"], size=1, pin_writes=True, client_factory=HostSession
+    )
+
+    for _ in range(3):
+        result = await pool.command("UserModifyRequest22")
+        assert result.startswith("as1:")
+
+
+@pytest.mark.asyncio
+async def test_failover_raises_when_every_host_is_down(hosts):
+    hosts.down = {"as1", "as2"}
+    pool = FailoverPool(
+        ["as1", "as2"], size=1, failure_threshold=1, client_factory=HostSession
+    )
+
+    with pytest.raises(MErrorSocketInitialisation):
+        await pool.command("UserModifyRequest22")
+    with pytest.raises(MErrorNoHealthyHost):
+        await pool.command("UserModifyRequest22")
+
+
+def test_from_client_copies_connection_settings():
+    client = type(
+        "Settings",
+        (),
+        {
+            "hosts": ["as1", "as2"],
+            "username": "admin",
+            "password": "secret",
+            "port": 2209,
+            "conn_type": "TCP",
+            "user_agent": "Broadworks SDK",
+            "timeout": 30,
+            "logger": None,
+            "tls": True,
+            "timeouts": None,
+        },
+    )()
+    seen = []
+
+    def factory(**kwargs):
+        seen.append(kwargs)
+        return FakeSession(**kwargs)
+
+    pool = SessionPool.from_client(client, size=2, client_factory=factory, timeout=5)
+
+    assert pool.size == 2
+    assert seen[0]["hosts"] == ["as1", "as2"]
+    assert seen[0]["username"] == "admin"
+    assert seen[0]["timeout"] == 5
+    assert seen[0]["session_id"] != seen[1]["session_id"]
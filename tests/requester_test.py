@@ -1,9 +1,12 @@
+import asyncio
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 import sys
 import os
 from lxml import etree
 import socket
+import threading
+import time
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -22,6 +25,34 @@ from mercury_ocip.exceptions import (
 from mercury_ocip.commands import base_command as BroadworksCommand
 
 
+def slow_first_reply_server():
+    """Serves one document per line, answering the first command late."""
+    listener = socket.create_server(("127.0.0.1", 0))
+    answered = []
+
+    def serve(conn):
+        with conn, conn.makefile("rb") as lines:
+            for line in lines:
+                if not answered:
+                    time.sleep(0.3)
+                answered.append(line)
+                conn.sendall(
+                    b"<BroadsoftDocument>" + line.strip() + b"</BroadsoftDocument>\n"
+                )
+
+    def accept():
+        with listener:
+            while True:
+                try:
+                    conn, _ = listener.accept()
+                except OSError:
+                    return
+                threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    return listener
+
+
 @pytest.fixture
 def mock_logger():
     return Mock()
@@ -44,13 +75,12 @@ def test_build_oci_xml_creates_correct_structure(mock_logger):
     requester.logger = mock_logger
     requester.session_id = "123214235235235"
 
-    mock_command = Mock()
-    mock_command.encode.return_value = """
+    command = """
     <command xmlns="" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:type="AuthenticationRequest">
     <userId>vinny</userId>
     </command>"""
 
-    result = requester.build_oci_xml(mock_command)
+    result = requester.build_oci_xml(command)
     root = etree.fromstring(result)
 
     assert root.tag == "{C}BroadsoftDocument"
@@ -71,6 +101,22 @@ def test_build_oci_xml_creates_correct_structure(mock_logger):
     assert user_id_el.text == "vinny"
 
 
+def test_build_oci_xml_accepts_bytes_and_escapes_session_id(mock_logger):
+    requester = SyncSOAPRequester.__new__(SyncSOAPRequester)
+    requester.client = None
+    requester.logger = mock_logger
+    requester.session_id = "a&b<c>"
+
+    command = '<command xmlns=""><userId>caf\u00e9</userId></command>'.encode(
+        "ISO-8859-1"
+    )
+
+    root = etree.fromstring(requester.build_oci_xml(command))
+
+    assert root.find("sessionId").text == "a&b<c>"
+    assert root.find("command").find("userId").text == "caf\u00e9"
+
+
 class TestSyncTCPRequester:
     @patch("socket.create_connection")
     @patch("ssl.create_default_context")
@@ -122,7 +168,9 @@ class TestSyncTCPRequester:
         requester.session_id = ""
         fake_sock = Mock()
         fake_sock.sendall = Mock()
-        fake_sock.recv = Mock(side_effect=[b"<BroadsoftDocument>", b"<command/>", b"</BroadsoftDocument>"])
+        fake_sock.recv = Mock(
+            side_effect=[b"<BroadsoftDocument>", b"<command/>", b"</BroadsoftDocument>"]
+        )
         requester.sock = fake_sock
 
         mock_command = Mock()
@@ -152,6 +200,48 @@ class TestSyncTCPRequester:
 
         assert isinstance(result, MErrorSocketTimeout)
 
+    def test_late_reply_is_not_read_as_the_next_response(self, mock_logger):
+        listener = slow_first_reply_server()
+        requester = SyncTCPRequester(
+            logger=mock_logger,
+            host="127.0.0.1",
+            port=listener.getsockname()[1],
+            tls=False,
+        )
+
+        try:
+            with patch.object(requester, "build_oci_xml", side_effect=lambda c: c):
+                first = requester.send_request_bytes(b"<first/>", timeout=0.1)
+                assert requester.sock is None
+                second = requester.send_request_bytes(b"<second/>", timeout=1)
+        finally:
+            requester.disconnect()
+            listener.close()
+
+        assert isinstance(first, MErrorSocketTimeout)
+        assert second == b"<BroadsoftDocument><second/></BroadsoftDocument>"
+
+    def test_sync_tcp_send_request_bytes_terminator_split_across_reads(
+        self, mock_logger
+    ):
+        requester = SyncTCPRequester.__new__(SyncTCPRequester)
+        requester.logger = mock_logger
+        requester.host = "localhost"
+        requester.port = 2209
+        requester.timeout = 30
+        requester.session_id = ""
+        fake_sock = Mock()
+        fake_sock.recv = Mock(
+            side_effect=[b"<BroadsoftDocument><command/></Broadsoft", b"Document>\n"]
+        )
+        requester.sock = fake_sock
+
+        with patch.object(requester, "build_oci_xml", return_value=b"<mock-xml>"):
+            result = requester.send_request_bytes(b"<command/>")
+
+        assert result == b"<BroadsoftDocument><command/></BroadsoftDocument>"
+        assert fake_sock.recv.call_count == 2
+
 
 class TestSyncSOAPRequester:
     @patch("mercury_ocip.requester.requests.sessions.Session")
@@ -282,6 +372,49 @@ class TestAsyncTCPRequester:
             requester.writer.write.assert_called_once()
             requester.writer.drain.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_timeout_bounds_the_whole_request(self):
+        requester = AsyncTCPRequester.__new__(AsyncTCPRequester)
+        requester.logger = Mock()
+        requester.host = "localhost"
+        requester.port = 2209
+        requester.timeout = 10
+        requester.session_id = None
+
+        async def trickle(size):
+            await asyncio.sleep(0.03)
+            return b"<data>"
+
+        requester.reader = AsyncMock()
+        requester.writer = AsyncMock()
+        requester.reader.read = trickle
+
+        result = await requester.send_request_bytes(b"<command/>", timeout=0.1)
+
+        assert isinstance(result, MErrorSocketTimeout)
+
+    @pytest.mark.asyncio
+    async def test_late_reply_is_not_read_as_the_next_response(self):
+        listener = slow_first_reply_server()
+        requester = AsyncTCPRequester(
+            logger=Mock(),
+            host="127.0.0.1",
+            port=listener.getsockname()[1],
+            tls=False,
+        )
+
+        try:
+            with patch.object(requester, "build_oci_xml", side_effect=lambda c: c):
+                first = await requester.send_request_bytes(b"<first/>", timeout=0.1)
+                assert requester.writer is None
+                second = await requester.send_request_bytes(b"<second/>", timeout=1)
+        finally:
+            await requester.disconnect()
+            listener.close()
+
+        assert isinstance(first, MErrorSocketTimeout)
+        assert second == b"<BroadsoftDocument><second/></BroadsoftDocument>"
+
 
 class TestAsyncSOAPRequester:
     @pytest.mark.asyncio
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from mercury_ocip.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_share_one_flight():
+    group = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "response"
+
+    results = await asyncio.gather(*(group.do("key", fetch) for _ in range(50)))
+
+    assert results == ["response"] * 50
+    assert calls == 1
+    assert group.stats.as_dict()["coalesce_rate"] == 49 / 50
+    assert group.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_coalesced():
+    group = SingleFlight()
+
+    async def fetch(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        group.do("a", lambda: fetch("a")), group.do("b", lambda: fetch("b"))
+    )
+
+    assert results == ["a", "b"]
+    assert group.stats.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_every_waiter_and_is_not_kept():
+    group = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        group.do("key", fail), group.do("key", fail), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert group.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    group = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "response"
+
+    first = asyncio.create_task(group.do("key", fetch))
+    second = asyncio.create_task(group.do("key", fetch))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    release.set()
+
+    assert await second == "response"
+    with pytest.raises(asyncio.CancelledError):
+        await first
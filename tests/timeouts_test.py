@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import pytest
+
+from mercury_ocip.timeouts import TimeoutPolicy, deadline, remaining
+
+
+def test_default_until_enough_samples():
+    policy = TimeoutPolicy(min_samples=5)
+    for _ in range(4):
+        policy.observe("UserDoNotDisturbGetRequest", 0.02)
+
+    assert policy.timeout_for("UserDoNotDisturbGetRequest", 30) == 30
+
+    policy.observe("UserDoNotDisturbGetRequest", 0.02)
+    assert policy.timeout_for("UserDoNotDisturbGetRequest", 30) == 1.0  # min_timeout
+
+
+def test_learned_per_command_class():
+    policy = TimeoutPolicy(min_samples=1, percentile=0.9, multiplier=2.0)
+    for latency in range(1, 101):
+        policy.observe("UserGetListInSystemRequest", latency)
+    policy.observe("UserDoNotDisturbGetRequest", 0.8)
+
+    assert policy.timeout_for("UserGetListInSystemRequest", 30) == 182
+    assert policy.timeout_for("UserDoNotDisturbGetRequest", 30) == 1.6
+    assert policy.as_dict() == {
+        "UserGetListInSystemRequest": 182,
+        "UserDoNotDisturbGetRequest": 1.6,
+    }
+
+
+def test_max_timeout_caps_learned_value():
+    policy = TimeoutPolicy(min_samples=1, max_timeout=60)
+    policy.observe("UserGetListInSystemRequest", 100)
+
+    assert policy.timeout_for("UserGetListInSystemRequest", 30) == 60
+
+
+def test_overrides_by_name_base_name_and_pattern():
+    policy = TimeoutPolicy(
+        overrides={"UserGetRequest": 5, "*GetListInSystemRequest": 600},
+        min_samples=1,
+    )
+    policy.observe("UserGetRequest23V2", 0.01)
+
+    assert policy.timeout_for("UserGetRequest23V2", 30) == 5
+    assert policy.timeout_for("GroupGetListInSystemRequest", 30) == 600
+    assert policy.timeout_for("GroupGetRequest22V5", 30) == 30
+
+    policy.override("GroupGetRequest22V5", 8)
+    assert policy.timeout_for("GroupGetRequest22V5", 30) == 8
+    assert policy.stats.overridden == 3
+
+
+def test_timeouts_raise_the_learned_value():
+    policy = TimeoutPolicy(min_samples=1, percentile=0.5, multiplier=1.0)
+    for _ in range(10):
+        policy.observe("UserGetRequest23V2", 2.0)
+    assert policy.timeout_for("UserGetRequest23V2", 30) == 2.0
+
+    for _ in range(10):
+        policy.observe("UserGetRequest23V2", 2.0 * 3, timed_out=True)
+
+    assert policy.timeout_for("UserGetRequest23V2", 30) == 6.0
+    assert policy.stats.timeouts == 10
+
+
+def test_nested_deadlines_keep_the_earlier_one():
+    assert remaining() is None
+
+    with deadline(10):
+        with deadline(60):
+            assert remaining() <= 10
+        with deadline(1):
+            assert remaining() <= 1
+        with deadline(None):
+            assert 1 < remaining() <= 10
+
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_tasks_inherit_the_deadline():
+    with deadline(5):
+        started = time.monotonic()
+        left = await asyncio.create_task(asyncio.sleep(0, result=remaining()))
+
+    assert left <= 5 - (time.monotonic() - started) + 0.1